@@ -0,0 +1,58 @@
+"""
+Debug API Routes
+Operator-only introspection endpoints
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+
+from app.core.config import settings
+from app.core.tracing import trace_buffer
+
+# Create router
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+def _require_debug_token(authorization: Optional[str]):
+    """Allow only holders of TRACE_DEBUG_TOKEN; hide the endpoint when unset"""
+    if not settings.TRACE_DEBUG_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.TRACE_DEBUG_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing debug token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+@router.get("/traces")
+async def get_traces(
+    limit: int = Query(20, ge=1, le=1000, description="Max traces to return"),
+    clear: bool = Query(False, description="Empty the buffer after reading"),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Slowest sampled request traces
+
+    Requires `Authorization: Bearer <TRACE_DEBUG_TOKEN>`.
+
+    Returns:
+        Sampling settings and the kept traces, slowest first, each with its
+        spans (rate limiting, validation, optimizer phases, serialization)
+    """
+    _require_debug_token(authorization)
+
+    traces = trace_buffer.snapshot(limit)
+    if clear:
+        trace_buffer.clear()
+
+    return {
+        "sample_rate": settings.TRACE_SAMPLE_RATE,
+        "buffer_size": trace_buffer.size,
+        "recorded": trace_buffer.recorded,
+        "traces": traces,
+    }
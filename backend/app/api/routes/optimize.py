@@ -3,39 +3,190 @@ Optimization API Routes
 Handles classroom seating optimization requests
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import Dict
+from fastapi import APIRouter, Header, HTTPException, Path, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import math
+import time
 import uuid
 import logging
 
-from app.models.request import OptimizeClassroomRequest, OptimizeClassroomResponse
-from app.models.classroom import OptimizationObjectives, SeatingConstraints
-from app.services.genetic_algorithm import ClassroomOptimizer
+from app.models.request import (
+    BulkScoreRequest,
+    BulkScoreResponse,
+    OptimizeClassroomRequest,
+    OptimizeClassroomResponse,
+    OptimizeSchoolRequest,
+    OptimizeSchoolResponse,
+    ClassroomAssignment,
+    RerankParetoRequest,
+    RerankParetoResponse,
+    SchedulingInfo,
+    ScoreArrangementRequest,
+    ScoreArrangementResponse
+)
+from app.models.classroom import OptimizationMode, OptimizationObjectives, SeatingConstraints
+from app.core.config import settings
+from app.core.tracing import TracedRoute, span
+from app.services.cancellation import CancellationToken
+from app.services.feasibility import analyze_feasibility
+from app.services.ga_params import constraint_density, resolve_parameters
+from app.services.memory import MemoryBudgetExceeded
+from app.services.result_store import StoredResult, get_result_store
+from app.services.scheduler import QueueAbandoned, TenantQueueFull, scheduler
+from app.services.single_flight import IdempotencyKeyReused, SingleFlight
+from app.utils.fingerprint import roster_fingerprint
+from app.utils.tenant import get_tenant_id
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 # Create router
-router = APIRouter(prefix="/api/v1/optimize", tags=["optimization"])
+router = APIRouter(prefix="/api/v1/optimize", tags=["optimization"], route_class=TracedRoute)
+
+# Format of generated optimization IDs
+OPTIMIZATION_ID_PATTERN = r"^opt_[0-9a-f]{12}$"
+
+# Concurrent identical classroom optimizations of a tenant run once
+classroom_flights = SingleFlight(
+    cost=lambda outcome: outcome[0].scheduling.cpu_seconds
+    if isinstance(outcome[0], OptimizeClassroomResponse) and outcome[0].scheduling else 0.0
+)
+
+
+def _stored_result_response(stored: StoredResult, request: Request) -> Response:
+    """Serve a stored result, honoring If-None-Match"""
+    headers = {"ETag": stored.etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or stored.etag in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=stored.payload, media_type="application/json", headers=headers)
+
+
+def _memory_budget_error(exc: MemoryBudgetExceeded) -> HTTPException:
+    """413 for a run that could never fit in MEMORY_BUDGET_MB"""
+    return HTTPException(
+        status_code=413,  # Content Too Large (constant name differs across Starlette versions)
+        detail=f"Optimization too large for this server: {exc}"
+    )
+
+
+def _queue_full_error(exc: TenantQueueFull) -> HTTPException:
+    """429 for a tenant whose queue is full, with a Retry-After estimate"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Too many optimizations queued; estimated wait {exc.retry_after:.0f}s",
+        headers={"Retry-After": str(max(1, int(exc.retry_after + 0.999)))}
+    )
+
+
+async def _run_until_disconnected(
+    is_disconnected: Callable[[], Awaitable[bool]],
+    token: CancellationToken,
+    func: Callable,
+    *args,
+    **kwargs
+):
+    """
+    Run a blocking optimizer call in the threadpool while watching the client
+
+    Trips `token` when the client disconnects (or the request task
+    is cancelled) so the optimizer stops at its next generation boundary.
+    """
+    task = asyncio.ensure_future(run_in_threadpool(func, *args, **kwargs))
+    try:
+        if settings.CANCEL_ON_DISCONNECT:
+            while not task.done():
+                done, _ = await asyncio.wait({task}, timeout=settings.CANCEL_POLL_INTERVAL)
+                if not done and await is_disconnected():
+                    token.cancel("client disconnected")
+                    break
+        return await task
+    except asyncio.CancelledError:
+        token.cancel("request cancelled")
+        raise
 
 
 @router.post("/classroom", response_model=OptimizeClassroomResponse)
-async def optimize_classroom(request: OptimizeClassroomRequest):
+async def optimize_classroom(
+    request: OptimizeClassroomRequest,
+    response: Response,
+    http_request: Request,
+    idempotency_key: Optional[str] = Header(
+        None, max_length=255, description="Requests sharing a key while one is running get its response"
+    )
+):
     """
     Optimize classroom seating arrangement using genetic algorithm
 
     This endpoint accepts student data and optimization parameters,
     then returns an optimized seating arrangement.
 
+    The optimizer runs in the threadpool; if the client disconnects it is
+    stopped at the next generation and its partial result is discarded or
+    stored according to CANCELLED_RESULT_POLICY.
+
+    With COALESCE_REQUESTS, a request identical to one of the same tenant
+    that is still running (or carrying the same Idempotency-Key header)
+    waits for that optimization and receives the same response and
+    optimization_id. The optimization is only stopped once all of its
+    waiting clients have disconnected.
+
     Args:
         request: OptimizeClassroomRequest with students and parameters
+        idempotency_key: Optional Idempotency-Key header
 
     Returns:
         OptimizeClassroomResponse with optimized arrangement
 
     Raises:
-        HTTPException: If optimization fails
+        HTTPException: If optimization fails, or the Idempotency-Key is
+            running for a different request (422)
     """
+    tenant = get_tenant_id(http_request)
+    if not settings.COALESCE_REQUESTS:
+        outcome, headers = await _optimize_classroom(request, tenant, http_request.is_disconnected)
+    else:
+        digest = hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+        key = f"{tenant}|key|{idempotency_key}" if idempotency_key else f"{tenant}|request|{digest}"
+        try:
+            outcome, headers = await classroom_flights.run(
+                key,
+                digest,
+                lambda is_disconnected: _optimize_classroom(request, tenant, is_disconnected),
+                http_request.is_disconnected
+            )
+        except IdempotencyKeyReused:
+            raise HTTPException(
+                status_code=422,  # Unprocessable Content (constant name differs across Starlette versions)
+                detail="Idempotency-Key is already in use by a different running request"
+            )
+
+    response.headers.update(headers)
+    return outcome
+
+
+async def _optimize_classroom(
+    request: OptimizeClassroomRequest,
+    tenant: str,
+    is_disconnected: Callable[[], Awaitable[bool]]
+) -> Tuple[Union[OptimizeClassroomResponse, Response], Dict[str, str]]:
+    """
+    Run one classroom optimization (see optimize_classroom)
+
+    Returns:
+        The response (or a bare 499 response once the client is gone) and
+        headers to add to it
+    """
+    headers = {}
     try:
         # Generate unique optimization ID
         optimization_id = f"opt_{uuid.uuid4().hex[:12]}"
@@ -62,22 +213,138 @@ async def optimize_classroom(request: OptimizeClassroomRequest):
                 detail=f"Too many students ({len(request.students)}) for available seats ({total_seats})"
             )
 
+        if request.adaptive and request.mode != OptimizationMode.WEIGHTED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Adaptive control is only supported in weighted mode"
+            )
+
+        if request.target_gap is not None and request.mode != OptimizationMode.WEIGHTED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Optimality-gap stopping is only supported in weighted mode"
+            )
+
+        if request.rotations > 1 and request.mode != OptimizationMode.WEIGHTED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Rotation planning is only supported in weighted mode"
+            )
+
         # Use default objectives if not provided
         objectives = request.objectives or OptimizationObjectives()
         constraints = request.constraints or SeatingConstraints()
 
+        # Preflight: catch unsatisfiable constraints before spending GA time
+        preflight = None
+        if settings.PREFLIGHT_MODE != "off":
+            with span("preflight"):
+                preflight = analyze_feasibility(request.students, request.rows, request.cols, constraints)
+            if preflight.errors and settings.PREFLIGHT_MODE == "reject":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Seating constraints cannot be satisfied: {'; '.join(preflight.errors)}"
+                )
+
+        # Imported lazily: DEAP/NumPy are kept off the cold-start path
+        # (see app.core.startup for the background preload)
+        with span("optimizer.import"):
+            from app.services.genetic_algorithm import ClassroomOptimizer
+            from app.services.elite_archive import elite_archive
+            from app.services.rotation import period_generations, plan_rotations
+
+        fingerprint = roster_fingerprint(
+            request.students, request.layout_type, request.rows, request.cols, constraints
+        )
+        params = resolve_parameters(
+            request.parameters,
+            len(request.students),
+            constraint_density(request.students, constraints),
+            request.mode
+        )
+
+        # Start from earlier elites of this roster, re-ranked under the new weights
+        seeds = []
+        if settings.ELITE_ARCHIVE_ENABLED and request.reuse_elites:
+            seeds = elite_archive.seeds(
+                fingerprint, objectives, int(params.population_size * settings.ELITE_SEED_FRACTION)
+            )
+
         # Create optimizer
-        optimizer = ClassroomOptimizer(
-            students=request.students,
-            layout_type=request.layout_type,
-            rows=request.rows,
-            cols=request.cols,
-            objectives=objectives,
-            constraints=constraints
+        with span("optimizer.construct", students=len(request.students)):
+            optimizer = ClassroomOptimizer(
+                students=request.students,
+                layout_type=request.layout_type,
+                rows=request.rows,
+                cols=request.cols,
+                objectives=objectives,
+                constraints=constraints,
+                mode=request.mode,
+                seed=request.seed,
+                params=params
+            )
+
+        # Wait for this tenant's turn, then run off the event loop; stops
+        # early if the client goes away
+        work_units = (
+            len(request.students)
+            * sum(period_generations(request.max_generations or params.generations, request.rotations))
+            * params.population_size
         )
+        cancel_token = CancellationToken()
+        try:
+            async with scheduler.slot(
+                tenant,
+                work_units,
+                is_disconnected,
+                memory=optimizer.estimate_memory(settings.GA_WORKERS),
+                workers=optimizer.parallel_workers(settings.GA_WORKERS)
+            ) as ticket:
+                with span(
+                    "optimizer.run", mode=request.mode.value, adaptive=request.adaptive, rotations=request.rotations
+                ):
+                    if request.rotations > 1:
+                        run, args = plan_rotations, (optimizer, request.rotations)
+                    else:
+                        run, args = optimizer.optimize, ()
+                    outcome = await _run_until_disconnected(
+                        is_disconnected,
+                        cancel_token,
+                        ticket.measure(run),
+                        *args,
+                        max_generations=request.max_generations,
+                        adaptive=request.adaptive,
+                        cancel_token=cancel_token,
+                        seed_arrangements=seeds,
+                        target_gap=request.target_gap
+                    )
+                    rotations = outcome if request.rotations > 1 else [outcome]
+                    result = rotations[0]
+        except MemoryBudgetExceeded as e:
+            raise _memory_budget_error(e)
+        except TenantQueueFull as e:
+            raise _queue_full_error(e)
+        except QueueAbandoned:
+            logger.info(f"Optimization {optimization_id} abandoned while queued")
+            return Response(status_code=499), headers
 
-        # Run optimization
-        result = optimizer.optimize(max_generations=request.max_generations)
+        if settings.ELITE_ARCHIVE_ENABLED:
+            with span("elite_archive.add"):
+                elite_archive.add(fingerprint, optimizer.elite_arrangements(), objectives)
+
+        if cancel_token.cancelled:
+            logger.info(
+                f"Optimization {optimization_id} cancelled after {result.generation_count} "
+                f"generations ({cancel_token.reason})"
+            )
+            if settings.CANCELLED_RESULT_POLICY != "store_partial":
+                # Nobody is listening; 499 is the conventional "client closed request"
+                return Response(status_code=499), headers
+
+        if preflight is not None:
+            for arrangement in rotations:
+                arrangement.warnings[:0] = [f"Infeasible: {error}" for error in preflight.errors] + preflight.warnings
+                arrangement.diagnostics["preflight"] = preflight.summary()
 
         logger.info(
             f"Optimization {optimization_id} completed: "
@@ -85,13 +352,30 @@ async def optimize_classroom(request: OptimizeClassroomRequest):
             f"time={result.computation_time:.2f}s"
         )
 
-        return OptimizeClassroomResponse(
+        optimize_response = OptimizeClassroomResponse(
             success=True,
             optimization_id=optimization_id,
+            roster_fingerprint=fingerprint,
             result=result,
-            error=None
+            rotations=rotations if request.rotations > 1 else None,
+            error=None,
+            scheduling=SchedulingInfo(**ticket.info())
         )
 
+        # Persist so the dashboard can reload the result without re-running
+        # (scheduling included, so GET /{id} and the ETag match this response)
+        store = get_result_store()
+        if store is not None:
+            try:
+                with span("result_store.put"):
+                    headers["ETag"] = await run_in_threadpool(
+                        store.put, optimization_id, fingerprint, optimize_response.model_dump_json()
+                    )
+            except Exception as e:
+                logger.warning(f"Could not store optimization {optimization_id}: {str(e)}")
+
+        return optimize_response, headers
+
     except HTTPException:
         raise
     except Exception as e:
@@ -102,6 +386,269 @@ async def optimize_classroom(request: OptimizeClassroomRequest):
         )
 
 
+@router.post("/school", response_model=OptimizeSchoolResponse)
+async def optimize_school(request: OptimizeSchoolRequest, http_request: Request):
+    """
+    Split a whole grade into classrooms and seat each classroom
+
+    First partitions students into `num_classrooms` balanced sections
+    (academic, behavior, diversity, special needs and relationships), then
+    runs the seating optimizer for every classroom in parallel.
+
+    Args:
+        request: OptimizeSchoolRequest with all students and the room layout
+
+    Returns:
+        OptimizeSchoolResponse with students and seating per classroom
+
+    Raises:
+        HTTPException: If the classrooms can't fit the students or optimization fails
+    """
+    optimization_id = f"opt_{uuid.uuid4().hex[:12]}"
+    start_time = time.perf_counter()
+
+    logger.info(
+        f"Starting school optimization {optimization_id} for {len(request.students)} students "
+        f"in {request.num_classrooms} classrooms"
+    )
+
+    # Imported lazily: DEAP/NumPy are kept off the cold-start path
+    from app.services import school_optimizer
+
+    # Every classroom runs with the parameters of an average-sized one
+    params = resolve_parameters(
+        request.parameters,
+        math.ceil(len(request.students) / request.num_classrooms),
+        constraint_density(request.students, request.constraints)
+    )
+
+    # Classrooms are seated in worker processes: the run holds a slot per
+    # process and is charged wall time x processes
+    workers = school_optimizer.seating_workers(None, request.num_classrooms)
+    work_units = (
+        len(request.students)
+        * (request.max_generations or params.generations)
+        * params.population_size
+    )
+    try:
+        async with scheduler.slot(
+            get_tenant_id(http_request),
+            work_units,
+            http_request.is_disconnected,
+            memory=school_optimizer.estimate_memory(
+                len(request.students), request.num_classrooms, request.rows, request.cols,
+                population_size=params.population_size
+            ),
+            workers=workers
+        ) as ticket:
+            groups, arrangements, metrics = await run_in_threadpool(
+                ticket.measure(school_optimizer.optimize_school),
+                students=request.students,
+                num_classrooms=request.num_classrooms,
+                layout_type=request.layout_type,
+                rows=request.rows,
+                cols=request.cols,
+                objectives=request.objectives,
+                constraints=request.constraints,
+                max_generations=request.max_generations,
+                params=params
+            )
+    except MemoryBudgetExceeded as e:
+        raise _memory_budget_error(e)
+    except TenantQueueFull as e:
+        raise _queue_full_error(e)
+    except QueueAbandoned:
+        logger.info(f"School optimization {optimization_id} abandoned while queued")
+        return Response(status_code=499)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"School optimization failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Optimization failed: {str(e)}"
+        )
+
+    computation_time = time.perf_counter() - start_time
+    logger.info(f"School optimization {optimization_id} completed: time={computation_time:.2f}s")
+
+    return OptimizeSchoolResponse(
+        success=True,
+        optimization_id=optimization_id,
+        classrooms=[
+            ClassroomAssignment(
+                classroom_index=index,
+                student_ids=[s.id for s in group],
+                arrangement=arrangement
+            )
+            for index, (group, arrangement) in enumerate(zip(groups, arrangements))
+        ],
+        partition_metrics=metrics,
+        computation_time=computation_time,
+        scheduling=SchedulingInfo(**ticket.info())
+    )
+
+
+@router.post("/pareto/rerank", response_model=RerankParetoResponse)
+async def rerank_pareto_front(request: RerankParetoRequest):
+    """
+    Re-rank a Pareto front under new objective weights
+
+    Picks the best arrangement from the front returned by a previous
+    `mode=pareto` run without re-running the genetic algorithm.
+
+    Args:
+        request: RerankParetoRequest with the front and new weights
+
+    Returns:
+        RerankParetoResponse with the best arrangement and the sorted front
+    """
+    rescored = [
+        solution.model_copy(update={
+            "fitness_score": request.objectives.score(
+                solution.objective_scores,
+                penalty=solution.constraint_penalty
+            )
+        })
+        for solution in request.front
+    ]
+
+    best_index = max(range(len(rescored)), key=lambda i: rescored[i].fitness_score)
+
+    return RerankParetoResponse(
+        best=rescored[best_index],
+        best_index=best_index,
+        front=sorted(rescored, key=lambda solution: solution.fitness_score, reverse=True)
+    )
+
+
+@router.post("/score", response_model=ScoreArrangementResponse)
+async def score_arrangement(request: ScoreArrangementRequest):
+    """
+    Score an explicit seating arrangement
+
+    Uses the optimizer's objective functions, so scores are comparable to
+    optimization results. Meant for manual edits in the dashboard: the
+    compiled roster is cached and a follow-up swap is rescored incrementally.
+
+    Args:
+        request: ScoreArrangementRequest with students and their seats
+
+    Returns:
+        ScoreArrangementResponse with fitness, objective scores and violations
+
+    Raises:
+        HTTPException: If the arrangement is invalid for the layout
+    """
+    start_time = time.perf_counter()
+
+    # Imported lazily: NumPy is kept off the cold-start path
+    from app.services import scoring
+
+    try:
+        fitness, state, violations = scoring.score_arrangement(
+            students=request.students,
+            layout_type=request.layout_type,
+            rows=request.rows,
+            cols=request.cols,
+            student_seats=request.student_seats,
+            objectives=request.objectives,
+            constraints=request.constraints
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return ScoreArrangementResponse(
+        fitness_score=fitness,
+        objective_scores=state.objective_scores,
+        constraint_penalty=state.penalty,
+        violations=violations,
+        computation_time=time.perf_counter() - start_time
+    )
+
+
+@router.post("/score/bulk", response_model=BulkScoreResponse)
+async def score_arrangements_bulk(request: BulkScoreRequest):
+    """
+    Score many arrangements of one roster in a single call
+
+    The roster is compiled once and all arrangements are scored in
+    vectorized chunks. With `stream=true` (or above
+    BULK_SCORING_STREAM_THRESHOLD arrangements) results are streamed as
+    NDJSON, one line per arrangement, as chunks complete.
+
+    Args:
+        request: BulkScoreRequest with the roster and the arrangements
+
+    Returns:
+        BulkScoreResponse, or an NDJSON stream of per-arrangement scores
+
+    Raises:
+        HTTPException: If an arrangement is invalid for the layout
+    """
+    start_time = time.perf_counter()
+
+    # Imported lazily: NumPy is kept off the cold-start path
+    from app.services import scoring
+    from app.services.problem import OBJECTIVE_NAMES
+
+    def prepare():
+        problem = scoring.compile_roster(
+            request.students, request.layout_type, request.rows, request.cols, request.constraints
+        )
+        if request.seat_matrix is not None:
+            seats = scoring.seat_matrix_from_indices(problem, request.students, request.seat_matrix)
+        else:
+            seats = scoring.seat_matrix_from_positions(problem, request.arrangements)
+        return problem, seats
+
+    try:
+        problem, seats = await run_in_threadpool(prepare)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if request.stream or len(seats) > settings.BULK_SCORING_STREAM_THRESHOLD:
+        def ndjson_lines():
+            index = 0
+            for chunk in scoring.iter_bulk_scores(problem, seats, request.objectives):
+                for k in range(len(chunk["fitness_score"])):
+                    yield json.dumps({
+                        "index": index,
+                        "fitness_score": float(chunk["fitness_score"][k]),
+                        "objective_scores": {name: float(chunk[name][k]) for name in OBJECTIVE_NAMES},
+                        "constraint_penalty": float(chunk["penalty"][k])
+                    }) + "\n"
+                    index += 1
+
+        # Sync iterators are run in the threadpool by StreamingResponse
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    def score_all():
+        chunks = list(scoring.iter_bulk_scores(problem, seats, request.objectives))
+        return {
+            name: [float(value) for chunk in chunks for value in chunk[name]]
+            for name in OBJECTIVE_NAMES + ("penalty", "fitness_score")
+        }
+
+    scores = await run_in_threadpool(score_all)
+    return BulkScoreResponse(
+        count=len(seats),
+        fitness_scores=scores["fitness_score"],
+        objective_scores={name: scores[name] for name in OBJECTIVE_NAMES},
+        constraint_penalties=scores["penalty"],
+        computation_time=time.perf_counter() - start_time
+    )
+
+
 @router.get("/status")
 async def get_optimization_status():
     """
@@ -117,6 +664,8 @@ async def get_optimization_status():
         "capabilities": {
             "max_students": 100,
             "layouts": ["rows", "pairs", "clusters", "u-shape", "circle", "flexible"],
+            "modes": ["weighted", "pareto"],
+            "max_school_students": 2000,
             "features": [
                 "academic balance",
                 "behavioral compatibility",
@@ -125,3 +674,66 @@ async def get_optimization_status():
             ]
         }
     }
+
+
+@router.get("/queue")
+async def get_queue_status(http_request: Request):
+    """
+    Scheduler view for the calling tenant
+
+    Returns:
+        The caller's running and queued optimizations (with queue positions
+        and estimated start times), CPU seconds used, global load and
+        request coalescing counters
+    """
+    return {
+        **scheduler.tenant_status(get_tenant_id(http_request)),
+        "scheduler": scheduler.get_stats(),
+        "coalescing": classroom_flights.get_stats(),
+    }
+
+
+@router.get("/roster/{fingerprint}", response_model=OptimizeClassroomResponse)
+async def get_latest_roster_result(
+    request: Request,
+    fingerprint: str = Path(..., pattern=r"^[0-9a-f]{32}$")
+):
+    """
+    Get the most recent stored optimization for a roster fingerprint
+
+    Supports conditional requests via ETag / If-None-Match.
+
+    Raises:
+        HTTPException: If no result is stored for the roster
+    """
+    store = get_result_store()
+    stored = await run_in_threadpool(store.latest_for_fingerprint, fingerprint) if store else None
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No stored optimization for this roster"
+        )
+    return _stored_result_response(stored, request)
+
+
+@router.get("/{optimization_id}", response_model=OptimizeClassroomResponse)
+async def get_optimization_result(
+    request: Request,
+    optimization_id: str = Path(..., pattern=OPTIMIZATION_ID_PATTERN)
+):
+    """
+    Get a stored optimization result by ID
+
+    Supports conditional requests via ETag / If-None-Match.
+
+    Raises:
+        HTTPException: If the result is unknown or has been compacted away
+    """
+    store = get_result_store()
+    stored = await run_in_threadpool(store.get, optimization_id) if store else None
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Optimization {optimization_id} not found"
+        )
+    return _stored_result_response(stored, request)
@@ -0,0 +1,410 @@
+"""
+Command-Line Interface
+Offline batch optimization of roster files, bypassing the HTTP API
+
+Usage (from the backend directory):
+    python -m app.cli optimize rosters/ --out results/
+
+    # Half the cores, pareto mode, 200 generations, reproducible seeds
+    python -m app.cli optimize rosters/ --out results/ --jobs 4 --mode pareto --generations 200 --seed 1
+
+Rosters are *.json files in the POST /api/v1/optimize/classroom body
+format, or *.csv files with one student per row and Student fields as
+columns (list fields such as friends_ids separated by ";"). Each roster
+is optimized in its own process with the settings of app/core/config.py
+(.env applies), and its SeatingArrangement is written to
+<out>/<name>.seating.json. With rotations > 1 (--rotations, or in the
+body) the file holds a JSON list of the arrangements of every period.
+
+Progress is appended to <out>/manifest.jsonl as rosters finish, so an
+interrupted batch resumes where it stopped: rosters already done with
+the same file contents and options are skipped (--force redoes them).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+MANIFEST_NAME = "manifest.jsonl"
+ROSTER_EXTENSIONS = (".json", ".csv")
+# CSV columns holding lists, and the separator of their items
+CSV_LIST_FIELDS = ("friends_ids", "incompatible_ids", "special_needs")
+CSV_LIST_SEPARATOR = ";"
+CSV_TRUE = {"1", "true", "yes", "y", "x"}
+
+
+def _read_csv_students(path: str) -> List[Dict]:
+    """Student dicts from a CSV roster (header row of Student field names)"""
+    from app.models.student import Student
+
+    boolean_fields = {name for name, field in Student.model_fields.items() if field.annotation is bool}
+    students = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            student = {}
+            for column, value in row.items():
+                column, value = (column or "").strip(), (value or "").strip()
+                if not column or not value:
+                    continue
+                if column in CSV_LIST_FIELDS:
+                    items = [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+                    student[column] = [{"type": item} for item in items] if column == "special_needs" else items
+                elif column in boolean_fields:
+                    student[column] = value.lower() in CSV_TRUE
+                else:
+                    student[column] = value
+            if student:
+                students.append(student)
+    return students
+
+
+def load_roster(path: str, options: Dict):
+    """
+    Read a roster file into an OptimizeClassroomRequest
+
+    CLI options fill in what the file doesn't specify: JSON bodies keep
+    their own layout and parameters, CSV rosters take everything from the
+    options (layout defaults to the smallest that fits).
+
+    Raises:
+        ValueError: If the roster is invalid or can't be optimized
+    """
+    from pydantic import ValidationError
+
+    from app.models.request import OptimizeClassroomRequest
+    from app.utils.synthetic import layout_for
+
+    if path.endswith(".csv"):
+        body = {"students": _read_csv_students(path)}
+    else:
+        with open(path, encoding="utf-8") as f:
+            body = json.load(f)
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object with a 'students' list")
+
+    for key in ("mode", "adaptive", "max_generations", "seed", "layout_type", "parameters", "target_gap", "rotations"):
+        if options.get(key) is not None:
+            body.setdefault(key, options[key])
+    students = body.get("students") or []
+    if "rows" not in body or "cols" not in body:
+        layout = layout_for(len(students), cols=options.get("cols") or 6)
+        body.setdefault("rows", options.get("rows") or layout["rows"])
+        body.setdefault("cols", options.get("cols") or layout["cols"])
+
+    try:
+        request = OptimizeClassroomRequest(**body)
+    except ValidationError as e:
+        raise ValueError(f"Invalid roster: {e.error_count()} errors, first: {e.errors()[0]['msg']} "
+                         f"at {'.'.join(str(part) for part in e.errors()[0]['loc'])}")
+
+    # Same checks as the API
+    if len(request.students) < 2:
+        raise ValueError("Genetic algorithm requires at least 2 students for optimization")
+    if len(request.students) > request.rows * request.cols:
+        raise ValueError(
+            f"Too many students ({len(request.students)}) for available seats ({request.rows * request.cols})"
+        )
+    if request.adaptive and request.mode.value != "weighted":
+        raise ValueError("Adaptive control is only supported in weighted mode")
+    if request.target_gap is not None and request.mode.value != "weighted":
+        raise ValueError("Optimality-gap stopping is only supported in weighted mode")
+    if request.rotations > 1 and request.mode.value != "weighted":
+        raise ValueError("Rotation planning is only supported in weighted mode")
+    return request
+
+
+def optimize_file(task) -> Dict:
+    """
+    Process pool worker: optimize one roster file and write its result
+
+    Returns a manifest entry; failures are reported in it rather than
+    raised, so one bad file doesn't stop the batch.
+    """
+    path, output_path, options = task
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    entry = {"file": os.path.basename(path), "output": os.path.basename(output_path)}
+
+    try:
+        from app.services.feasibility import analyze_feasibility
+        from app.services.ga_params import constraint_density, resolve_parameters
+        from app.services.genetic_algorithm import ClassroomOptimizer
+        from app.services.rotation import plan_rotations
+        from app.models.classroom import OptimizationObjectives, SeatingConstraints
+
+        request = load_roster(path, options)
+        constraints = request.constraints or SeatingConstraints()
+
+        preflight = None
+        if settings.PREFLIGHT_MODE != "off":
+            preflight = analyze_feasibility(request.students, request.rows, request.cols, constraints)
+            if preflight.errors and settings.PREFLIGHT_MODE == "reject":
+                raise ValueError(f"Seating constraints cannot be satisfied: {'; '.join(preflight.errors)}")
+
+        optimizer = ClassroomOptimizer(
+            students=request.students,
+            layout_type=request.layout_type,
+            rows=request.rows,
+            cols=request.cols,
+            objectives=request.objectives or OptimizationObjectives(),
+            constraints=constraints,
+            mode=request.mode,
+            seed=request.seed,
+            params=resolve_parameters(
+                request.parameters,
+                len(request.students),
+                constraint_density(request.students, constraints),
+                request.mode
+            )
+        )
+        # Rosters are already spread over processes; evaluate in-process
+        run_options = {
+            "max_generations": request.max_generations,
+            "adaptive": request.adaptive,
+            "workers": 1,
+            "target_gap": request.target_gap,
+        }
+        if request.rotations > 1:
+            rotations = plan_rotations(optimizer, request.rotations, **run_options)
+        else:
+            rotations = [optimizer.optimize(**run_options)]
+        result = rotations[0]
+        if preflight is not None:
+            for arrangement in rotations:
+                arrangement.warnings[:0] = [f"Infeasible: {error}" for error in preflight.errors] + preflight.warnings
+                arrangement.diagnostics["preflight"] = preflight.summary()
+
+        # Write then rename, so an interrupted run never leaves a partial output
+        partial = output_path + ".partial"
+        with open(partial, "w", encoding="utf-8") as f:
+            if request.rotations > 1:
+                json.dump([arrangement.model_dump(mode="json") for arrangement in rotations], f, indent=2)
+            else:
+                f.write(result.model_dump_json(indent=2))
+        os.replace(partial, output_path)
+
+        entry.update({
+            "status": "done",
+            "students": len(request.students),
+            "fitness": round(result.fitness_score, 6),
+            "optimality_gap": round(result.optimality_gap, 6),
+            "generations": sum(arrangement.generation_count for arrangement in rotations),
+            "evaluations": sum(arrangement.diagnostics.get("evaluations", 0) for arrangement in rotations),
+            "seed": result.diagnostics.get("seed"),
+        })
+        if request.rotations > 1:
+            entry["rotations"] = len(rotations)
+    except Exception as e:
+        entry.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    entry["cpu_seconds"] = round(time.process_time() - cpu_started, 3)
+    return entry
+
+
+def _ignore_interrupts():
+    """Process pool initializer: leave Ctrl-C to the parent, which lets running rosters finish"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _file_digest(path: str, options: Dict) -> str:
+    """Identity of a roster file's contents and the options it is run with"""
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def _load_manifest(path: str) -> Dict[str, Dict]:
+    """Latest manifest entry per roster file"""
+    entries = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    entries[entry["file"]] = entry
+                except (ValueError, KeyError):
+                    continue  # Torn last line of an interrupted run
+    return entries
+
+
+def _throughput(entries: List[Dict], wall_seconds: float, jobs: int) -> Dict:
+    """Throughput of the rosters processed in this invocation"""
+    done = [entry for entry in entries if entry["status"] == "done"]
+    cpu_seconds = sum(entry["cpu_seconds"] for entry in entries)
+    wall_seconds = max(wall_seconds, 1e-9)
+    return {
+        "processed": len(entries),
+        "done": len(done),
+        "failed": len(entries) - len(done),
+        "wall_seconds": round(wall_seconds, 2),
+        "rosters_per_minute": round(60 * len(done) / wall_seconds, 2),
+        "students_per_second": round(sum(entry["students"] for entry in done) / wall_seconds, 2),
+        "evaluations_per_second": round(sum(entry["evaluations"] for entry in done) / wall_seconds, 1),
+        "cpu_seconds": round(cpu_seconds, 2),
+        # Share of the pool's cores kept busy
+        "cpu_utilization": round(cpu_seconds / (wall_seconds * jobs), 3),
+    }
+
+
+def cmd_optimize(args) -> int:
+    """Optimize every roster file in a directory"""
+    inputs = sorted(
+        name for name in os.listdir(args.rosters)
+        if name.lower().endswith(ROSTER_EXTENSIONS) and os.path.isfile(os.path.join(args.rosters, name))
+    )
+    if not inputs:
+        print(f"No *.json or *.csv rosters in {args.rosters}", file=sys.stderr)
+        return 1
+
+    outputs = {}
+    for name in inputs:
+        output = os.path.splitext(name)[0] + ".seating.json"
+        if output in outputs.values():
+            print(f"Rosters {name} and {next(k for k, v in outputs.items() if v == output)} would both write "
+                  f"{output}; rename one", file=sys.stderr)
+            return 1
+        outputs[name] = output
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest_path = os.path.join(args.out, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+
+    options = {
+        "mode": args.mode,
+        "adaptive": args.adaptive or None,
+        "max_generations": args.generations,
+        "seed": args.seed,
+        "rows": args.rows,
+        "cols": args.cols,
+        "layout_type": args.layout,
+        "parameters": args.parameters,
+        "target_gap": args.target_gap,
+        "rotations": args.rotations,
+    }
+    tasks, digests, skipped = [], {}, 0
+    for name in inputs:
+        path = os.path.join(args.rosters, name)
+        digests[name] = _file_digest(path, options)
+        previous = manifest.get(name)
+        if (
+            not args.force
+            and previous is not None
+            and previous.get("status") == "done"
+            and previous.get("digest") == digests[name]
+            and os.path.exists(os.path.join(args.out, outputs[name]))
+        ):
+            skipped += 1
+            continue
+        tasks.append((path, os.path.join(args.out, outputs[name]), options))
+
+    if not tasks:
+        print(f"All {skipped} rosters already done (--force to redo)", file=sys.stderr)
+        return 0
+
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(tasks) or 1))
+    print(f"{len(tasks)} rosters to optimize ({skipped} already done) with {jobs} processes", file=sys.stderr)
+
+    entries = []
+    started = time.perf_counter()
+    with open(manifest_path, "a", encoding="utf-8") as manifest_file:
+        def record(entry: Dict):
+            entry["digest"] = digests[entry["file"]]
+            entry["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            manifest_file.write(json.dumps(entry) + "\n")
+            manifest_file.flush()
+            entries.append(entry)
+
+            status = (
+                f"fitness={entry['fitness']:.3f}" if entry["status"] == "done"
+                else f"FAILED {entry['error']}"
+            )
+            print(f"[{len(entries)}/{len(tasks)}] {entry['file']} {status} ({entry['seconds']:.1f}s)",
+                  file=sys.stderr)
+
+        if jobs <= 1:
+            for task in tasks:
+                record(optimize_file(task))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_ignore_interrupts) as pool:
+                # Submit as workers free up, so an interrupt leaves little to cancel
+                queue = iter(tasks)
+                pending = {pool.submit(optimize_file, task) for _, task in zip(range(jobs * 2), queue)}
+                try:
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(future.result())
+                            task = next(queue, None)
+                            if task is not None:
+                                pending.add(pool.submit(optimize_file, task))
+                except KeyboardInterrupt:
+                    running = [future for future in pending if not future.cancel()]
+                    print(f"Interrupted; finishing {len(running)} running rosters (Ctrl-C again to abort)",
+                          file=sys.stderr)
+                    for future in running:
+                        record(future.result())
+                    raise
+
+    report = _throughput(entries, time.perf_counter() - started, jobs)
+    report["skipped"] = skipped
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['done']} done, {report['failed']} failed, {skipped} skipped in {report['wall_seconds']}s: "
+            f"{report['rosters_per_minute']} rosters/min, {report['students_per_second']} students/s, "
+            f"{report['evaluations_per_second']} evaluations/s, "
+            f"CPU utilization {report['cpu_utilization']:.0%} of {jobs} processes"
+        )
+    return 1 if report["failed"] else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Classroom seating optimizer")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    optimize = commands.add_parser("optimize", help="Optimize a directory of roster files")
+    optimize.add_argument("rosters", help="Directory of *.json (request bodies) and *.csv roster files")
+    optimize.add_argument("--out", required=True, help="Directory for results and the resumable manifest")
+    optimize.add_argument("--jobs", type=int, help="Rosters optimized in parallel (default: all cores)")
+    optimize.add_argument("--mode", choices=["weighted", "pareto"], help="Optimization mode (default: weighted)")
+    optimize.add_argument("--adaptive", action="store_true", help="Adaptive operator control (weighted mode)")
+    optimize.add_argument("--generations", type=int, help="Max generations (default: from the GA parameters)")
+    optimize.add_argument("--parameters", choices=["settings", "auto"],
+                          help="GA parameters: server settings or picked by roster size (default: GA_PARAMETER_MODE)")
+    optimize.add_argument("--target-gap", type=float,
+                          help="Stop a roster once within this share of its fitness upper bound (weighted mode)")
+    optimize.add_argument("--rotations", type=int,
+                          help="Plan this many consecutive seating charts per roster (weighted mode)")
+    optimize.add_argument("--seed", type=int, help="Random seed for every roster (default: random, reported)")
+    optimize.add_argument("--rows", type=int, help="Rows for rosters that don't specify a layout")
+    optimize.add_argument("--cols", type=int, help="Seats per row for rosters that don't specify a layout")
+    optimize.add_argument("--layout", help="Layout type for rosters that don't specify one (default: rows)")
+    optimize.add_argument("--force", action="store_true", help="Redo rosters the manifest marks as done")
+    optimize.add_argument("--json", action="store_true", help="Print the throughput report as JSON")
+    optimize.set_defaults(handler=cmd_optimize)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        print("Stopped; finished rosters are in the manifest, rerun to resume", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -71,6 +71,83 @@ class Settings(BaseSettings):
     GA_GENERATIONS: int = 100
     GA_MUTATION_RATE: float = 0.1
     GA_CROSSOVER_RATE: float = 0.8
+    GA_MUTATION_INDPB: float = 0.2  # Per-gene swap probability of a mutation
+    PARETO_MAX_FRONT_SIZE: int = 20  # Max arrangements returned in pareto mode
+    GA_WORKERS: int = 1  # Fitness evaluation processes per run (1 = in-process), from a pool shared by runs
+    GA_PARALLEL_MIN_CHUNK: int = 16  # Min arrangements per worker task (smaller batches stay in-process)
+    GA_DEDUPLICATE: bool = True  # Cache fitness by symmetry class and replace duplicate offspring
+    GA_PARAMETER_MODE: str = "settings"  # Default request parameters: "settings" (GA_* above) or "auto"
+
+    # Elite Archive
+    # Best arrangements per roster seed later runs on the same roster
+    ELITE_ARCHIVE_ENABLED: bool = True
+    ELITE_ARCHIVE_ROSTERS: int = 128  # Rosters kept (least recently used evicted)
+    ELITE_ARCHIVE_SIZE: int = 20  # Arrangements kept per roster
+    ELITE_SEED_FRACTION: float = 0.2  # Max share of the initial population seeded
+
+    # Rotation Planning
+    # Requests with rotations > 1 plan consecutive seating charts of one roster
+    ROTATION_REPEAT_PENALTY: float = 0.02  # Fitness deducted per earlier period a neighbor pair already sat together
+    ROTATION_GENERATION_FRACTION: float = 0.4  # Generations of later periods, warm-started from the previous one
+
+    # Feasibility Preflight
+    # "off", "warn" (diagnoses go to result warnings) or "reject" (400 on proven infeasibility)
+    PREFLIGHT_MODE: str = "warn"
+
+    # Cancellation
+    # Stop optimizations whose client disconnected; CANCELLED_RESULT_POLICY is
+    # "discard" (drop the partial result) or "store_partial" (persist it)
+    CANCEL_ON_DISCONNECT: bool = True
+    CANCEL_POLL_INTERVAL: float = 0.5  # Seconds between client disconnect checks
+    CANCELLED_RESULT_POLICY: str = "discard"
+
+    # Scheduler
+    # Optimizations are queued fairly across tenants (API key, Origin, else client IP)
+    SCHEDULER_MAX_CONCURRENT: int = 2  # Worker slots busy at once (a multi-process run holds one per process)
+    SCHEDULER_TENANT_MAX_CONCURRENT: int = 1  # Optimizations running at once per tenant (assumes trusted keys)
+    SCHEDULER_TENANT_MAX_QUEUED: int = 20  # Queued optimizations per tenant before 429 (assumes trusted keys)
+    SCHEDULER_TENANT_WEIGHTS: str = ""  # Shares as "tenant=weight,..." (default weight 1)
+
+    # Request Coalescing
+    # A tenant's classroom optimization identical to a running one (same body,
+    # or same Idempotency-Key header) waits for it and shares its response
+    COALESCE_REQUESTS: bool = True
+
+    # Memory
+    # Optimizations start only while their estimated memory fits the budget
+    MEMORY_BUDGET_MB: int = 0  # Memory for running optimizations (0 = unlimited); larger runs get 413
+    MEMORY_PROFILER: str = "rss"  # Per-run peak measurement: "off", "rss" (sampled) or "tracemalloc" (exact, several times slower)
+    MEMORY_SAMPLE_INTERVAL: float = 0.05  # Seconds between RSS samples
+
+    # Startup
+    # Import the optimizer stack in the background once /health is served
+    OPTIMIZER_PRELOAD: bool = True
+    OPTIMIZER_PRELOAD_MAX_DELAY: float = 2.0  # Seconds to wait for the first health check
+
+    # School-Wide Assignment
+    SCHOOL_MAX_WORKERS: int = 0  # Processes of the shared classroom seating pool (0 = CPU count - 1)
+    SCHOOL_PARTITION_ITERATIONS_PER_STUDENT: int = 50  # Swap attempts per student when partitioning
+
+    # Arrangement Scoring
+    SCORING_CACHE_SIZE: int = 256  # Compiled rosters kept for /optimize/score
+    SCORING_INCREMENTAL_MAX_CHANGES: int = 4  # Changed seats still rescored incrementally
+    BULK_SCORING_CHUNK_SIZE: int = 2048  # Arrangements per vectorized pass
+    BULK_SCORING_STREAM_THRESHOLD: int = 10000  # Stream NDJSON above this many arrangements
+
+    # Result Store
+    # Optimization results are persisted to SQLite for GET /api/v1/optimize/{id}
+    RESULT_STORE_ENABLED: bool = True
+    RESULT_STORE_PATH: str = "data/results.sqlite3"
+    RESULT_STORE_MAX_MB: int = 50  # Compaction drops oldest results above this size
+    RESULT_STORE_MAX_AGE_DAYS: int = 30  # Compaction drops results older than this
+
+    # Tracing
+    # Share of requests traced (0 = off, near-zero overhead); the slowest
+    # traces are served at /debug/traces to holders of TRACE_DEBUG_TOKEN
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_BUFFER_SIZE: int = 50  # Slowest traces kept in memory
+    TRACE_EXPORT_PATH: str = ""  # Also append every trace as a JSON line here ("" = off)
+    TRACE_DEBUG_TOKEN: str = ""  # Bearer token for /debug/traces ("" = endpoint disabled)
 
     # Security
     # CRITICAL: SECRET_KEY must be set in production - no default for security
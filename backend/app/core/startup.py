@@ -0,0 +1,93 @@
+"""
+Startup Timing
+Tracks cold-start phases and preloads the optimizer stack in the background
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modules that make up the optimizer stack (DEAP, NumPy, GA service)
+OPTIMIZER_MODULES = ["numpy", "deap", "app.services.genetic_algorithm", "app.services.scoring"]
+
+
+class StartupTimer:
+    """
+    Records named startup phases relative to the first import of this module.
+
+    Phases: app import, lifespan startup, first healthy response and the
+    background optimizer preload.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: List[Dict[str, float]] = []
+        self.first_health_at: Optional[float] = None
+        self.first_health_served = asyncio.Event()
+        self.optimizer_loaded = False
+
+    def elapsed(self) -> float:
+        """Seconds since the application started importing"""
+        return time.perf_counter() - self.origin
+
+    def mark(self, name: str, started_at: Optional[float] = None):
+        """Record the end of a phase (and its duration if start is known)"""
+        now = self.elapsed()
+        phase = {"phase": name, "at": round(now, 4)}
+        if started_at is not None:
+            phase["duration"] = round(now - started_at, 4)
+        self.phases.append(phase)
+        logger.info(f"Startup phase '{name}' at {now:.3f}s")
+
+    def health_served(self):
+        """Record the first healthy response"""
+        if self.first_health_at is None:
+            self.first_health_at = self.elapsed()
+            self.mark("first_health_response")
+            self.first_health_served.set()
+
+    def report(self) -> Dict:
+        """Startup timing report"""
+        return {
+            "phases": self.phases,
+            "time_to_first_health": (
+                round(self.first_health_at, 4) if self.first_health_at is not None else None
+            ),
+            "optimizer_loaded": self.optimizer_loaded,
+        }
+
+
+startup_timer = StartupTimer()
+
+
+def preload_optimizer():
+    """Import the optimizer stack so the first optimization doesn't pay for it"""
+    started_at = startup_timer.elapsed()
+    for module in OPTIMIZER_MODULES:
+        importlib.import_module(module)
+    startup_timer.optimizer_loaded = True
+    startup_timer.mark("optimizer_preload", started_at=started_at)
+
+
+async def preload_optimizer_in_background(max_delay: float):
+    """
+    Preload the optimizer stack once the server is serving.
+
+    Waits for the first healthy response (or `max_delay` seconds, whichever
+    comes first) so imports don't compete with the server coming up, then
+    imports in a worker thread to keep the event loop responsive.
+    """
+    try:
+        await asyncio.wait_for(startup_timer.first_health_served.wait(), timeout=max_delay)
+    except asyncio.TimeoutError:
+        pass
+
+    try:
+        await asyncio.to_thread(preload_optimizer)
+    except Exception as e:
+        # The route imports lazily anyway, so a failed preload is not fatal
+        logger.warning(f"Optimizer preload failed: {str(e)}")
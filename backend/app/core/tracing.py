@@ -0,0 +1,298 @@
+"""
+Request Tracing
+Lightweight in-process spans, a slowest-traces buffer and JSON-lines export
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+
+class Trace:
+    """Spans recorded for one sampled request"""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.status_code: Optional[int] = None
+        # [name, start, end, parent index, attributes]; appended from the
+        # event loop and threadpool workers (list.append is atomic)
+        self.spans: List[list] = []
+
+    def add_span(self, name: str, start: float, end: float, parent: Optional[int], **attrs) -> int:
+        """Record an already finished span; returns its index"""
+        self.spans.append([name, start, end, parent, attrs])
+        return len(self.spans) - 1
+
+    def finish(self, status_code: Optional[int]):
+        self.duration = time.perf_counter() - self.start
+        self.status_code = status_code
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "status_code": self.status_code,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "spans": [
+                {
+                    "name": name,
+                    "start_ms": round((start - self.start) * 1000, 3),
+                    "duration_ms": round(((end or start) - start) * 1000, 3),
+                    "parent": parent,
+                    **({"attrs": attrs} if attrs else {}),
+                }
+                for name, start, end, parent, attrs in self.spans
+            ],
+        }
+
+
+class Span:
+    """Context manager timing one step of a traced request"""
+
+    __slots__ = ("trace", "index", "_token")
+
+    def __init__(self, trace: Trace, name: str, attrs: Dict[str, Any]):
+        self.trace = trace
+        self.index = trace.add_span(name, time.perf_counter(), None, _current_span.get(), **attrs)
+
+    def set(self, key: str, value: Any):
+        """Attach an attribute to the span"""
+        self.trace.spans[self.index][4][key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self.index)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.trace.spans[self.index][2] = time.perf_counter()
+        if exc_type is not None:
+            self.set("error", exc_type.__name__)
+        _current_span.reset(self._token)
+
+
+class _NoopSpan:
+    """Span used when the request isn't sampled"""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attrs):
+    """
+    Time a block as a span of the current trace
+
+    Costs one context variable lookup when the request isn't sampled.
+
+    Usage:
+        with span("optimizer.run", students=30) as s:
+            ...
+            s.set("generations", 100)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return Span(trace, name, attrs)
+
+
+def tracing_active() -> bool:
+    """Whether the current request is being traced"""
+    return _current_trace.get() is not None
+
+
+class SlowTraceBuffer:
+    """Fixed-size buffer keeping the slowest finished traces"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._heap: List[tuple] = []  # (duration, sequence, trace); fastest at the top
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def add(self, trace: Trace):
+        with self._lock:
+            self.recorded += 1
+            entry = (trace.duration, next(self._sequence), trace)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, entry)
+            elif trace.duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Kept traces, slowest first"""
+        with self._lock:
+            entries = sorted(self._heap, reverse=True)
+        return [trace.to_dict() for _, _, trace in entries[:limit]]
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+
+trace_buffer = SlowTraceBuffer(size=settings.TRACE_BUFFER_SIZE)
+
+_export_logger: Optional[logging.Logger] = None
+_export_lock = threading.Lock()
+
+
+def _get_export_logger() -> Optional[logging.Logger]:
+    """JSON-lines trace logger writing to TRACE_EXPORT_PATH (None if disabled)"""
+    global _export_logger
+    if not settings.TRACE_EXPORT_PATH:
+        return None
+    if _export_logger is None:
+        with _export_lock:
+            if _export_logger is None:
+                from pythonjsonlogger import jsonlogger
+
+                handler = logging.FileHandler(settings.TRACE_EXPORT_PATH, encoding="utf-8")
+                handler.setFormatter(jsonlogger.JsonFormatter("%(message)s"))
+                export_logger = logging.getLogger("app.traces")
+                export_logger.setLevel(logging.INFO)
+                export_logger.propagate = False
+                export_logger.addHandler(handler)
+                _export_logger = export_logger
+    return _export_logger
+
+
+def record_trace(trace: Trace):
+    """Keep a finished trace and export it if configured"""
+    trace_buffer.add(trace)
+    export_logger = _get_export_logger()
+    if export_logger is not None:
+        try:
+            export_logger.info("trace", extra={"trace": trace.to_dict()})
+        except Exception as e:
+            logger.warning(f"Could not export trace {trace.trace_id}: {str(e)}")
+
+
+class TraceMiddleware:
+    """
+    Samples HTTP requests (TRACE_SAMPLE_RATE) and traces them end to end.
+
+    Add it last so it wraps every other middleware, including the rate
+    limiter. Sampled responses carry an X-Trace-Id header.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(f"{scope['method']} {scope['path']}")
+        status_code = None
+
+        async def send_with_trace_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", trace.trace_id.encode())]
+            await send(message)
+
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(None)
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            trace.finish(status_code)
+            record_trace(trace)
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute that splits a traced request into validation, handler and
+    serialization spans
+
+    FastAPI parses and validates the body, calls the endpoint and
+    serializes the response model inside one handler; wrapping the
+    endpoint separately lets the gaps before and after it be attributed.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _traced_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            trace = _current_trace.get()
+            if trace is None:
+                return await handler(request)
+
+            with span("route", path=self.path) as route_span:
+                first_span = len(trace.spans)
+                try:
+                    return await handler(request)
+                finally:
+                    _attribute_route_phases(trace, route_span.index, first_span)
+
+        return traced_handler
+
+
+def _traced_endpoint(endpoint: Callable) -> Callable:
+    """Wrap an endpoint in a "handler" span (signature preserved for FastAPI)"""
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def traced(*args, **kwargs):
+            with span("handler"):
+                return await endpoint(*args, **kwargs)
+    else:
+        @functools.wraps(endpoint)
+        def traced(*args, **kwargs):
+            with span("handler"):
+                return endpoint(*args, **kwargs)
+    return traced
+
+
+def _attribute_route_phases(trace: Trace, route_index: int, first_span: int):
+    """Add validation/serialization spans around the route's handler span"""
+    route_start = trace.spans[route_index][1]
+    now = time.perf_counter()
+    for name, start, end, parent, _ in trace.spans[first_span:]:
+        if name == "handler" and parent == route_index:
+            trace.add_span("validation", route_start, start, route_index)
+            trace.add_span("serialization", end or now, now, route_index)
+            return
+    # Rejected before the endpoint ran (e.g. a 422)
+    trace.add_span("validation", route_start, now, route_index)
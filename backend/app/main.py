@@ -3,14 +3,18 @@ ISHEBOT Optimization API
 FastAPI application for classroom seating optimization
 """
 
+from app.core.startup import startup_timer, preload_optimizer_in_background
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.api.routes import optimize
+from app.api.routes import debug, optimize
+from app.core.tracing import TraceMiddleware
 from app.models.request import HealthCheckResponse
 from app.middleware import RateLimiter
 
@@ -26,6 +30,7 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
+    lifespan_started_at = startup_timer.elapsed()
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
@@ -44,9 +49,21 @@ async def lifespan(app: FastAPI):
     if not settings.is_production_ready:
         logger.warning("⚠️ Application configuration incomplete for production")
 
+    # Heavy optimizer imports (DEAP, NumPy) are deferred until the server is
+    # answering health checks, then warmed in the background
+    preload_task = None
+    if settings.OPTIMIZER_PRELOAD:
+        preload_task = asyncio.create_task(
+            preload_optimizer_in_background(settings.OPTIMIZER_PRELOAD_MAX_DELAY)
+        )
+
+    startup_timer.mark("lifespan_startup", started_at=lifespan_started_at)
+
     yield
     # Shutdown
     logger.info("Shutting down application")
+    if preload_task and not preload_task.done():
+        preload_task.cancel()
 
 
 # Create FastAPI app
@@ -89,12 +106,15 @@ app.add_middleware(
         "Accept",
         "Origin",
         "X-Requested-With",
+        "X-API-Key",  # Tenant identity for the optimization scheduler
+        "Idempotency-Key",  # Coalesces retries of a running optimization
     ],  # Specific headers only
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
 # Include routers
 app.include_router(optimize.router)
+app.include_router(debug.router)
 
 # Add rate limiter middleware
 # Must be added after CORS but before routes
@@ -102,9 +122,12 @@ app.add_middleware(
     RateLimiter,
     requests_per_minute=settings.RATE_LIMIT_REQUESTS_PER_MINUTE,
     burst_size=settings.RATE_LIMIT_BURST,
-    exclude_paths=["/", "/health", "/docs", "/redoc", "/openapi.json"]
+    exclude_paths=["/", "/health", "/health/startup", "/docs", "/redoc", "/openapi.json"]
 )
 
+# Request tracing (sampled); added last so it wraps the rate limiter and CORS
+app.add_middleware(TraceMiddleware, sample_rate=settings.TRACE_SAMPLE_RATE)
+
 
 # Root endpoint
 @app.get("/", response_model=HealthCheckResponse)
@@ -131,6 +154,7 @@ async def health_check():
     Returns:
         Service health status
     """
+    startup_timer.health_served()
     return HealthCheckResponse(
         status="healthy",
         version=settings.APP_VERSION,
@@ -138,6 +162,19 @@ async def health_check():
     )
 
 
+# Startup timing endpoint
+@app.get("/health/startup")
+async def startup_report():
+    """
+    Cold-start timing report
+
+    Returns:
+        Startup phases (import, lifespan, first healthy response,
+        optimizer preload) in seconds since the app started importing
+    """
+    return startup_timer.report()
+
+
 # Error handlers
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
@@ -162,6 +199,9 @@ async def general_exception_handler(request, exc):
     )
 
 
+startup_timer.mark("app_import")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
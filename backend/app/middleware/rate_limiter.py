@@ -6,8 +6,12 @@ Uses in-memory storage with client IP as the key.
 """
 
 from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import span
+from app.utils.tenant import get_client_ip
 from typing import Dict, Tuple
 import time
 import logging
@@ -16,16 +20,20 @@ from collections import defaultdict
 logger = logging.getLogger(__name__)
 
 
-class RateLimiter(BaseHTTPMiddleware):
+class RateLimiter:
     """
     Rate limiter middleware using token bucket algorithm.
 
     Limits requests per IP address to prevent abuse and DDoS attacks.
+
+    Implemented as plain ASGI middleware rather than BaseHTTPMiddleware so
+    the downstream `receive` channel is untouched and routes can detect
+    client disconnects (Request.is_disconnected) during long optimizations.
     """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         requests_per_minute: int = 60,
         burst_size: int = 10,
         exclude_paths: list = None
@@ -39,7 +47,7 @@ class RateLimiter(BaseHTTPMiddleware):
             burst_size: Maximum burst size (requests allowed instantly)
             exclude_paths: Paths to exclude from rate limiting (e.g., /health)
         """
-        super().__init__(app)
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.burst_size = burst_size
         self.exclude_paths = exclude_paths or ["/", "/health", "/docs", "/redoc", "/openapi.json"]
@@ -52,30 +60,31 @@ class RateLimiter(BaseHTTPMiddleware):
             f"burst={burst_size}, excluded_paths={exclude_paths}"
         )
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Process request through rate limiter.
 
         Args:
-            request: Incoming request
-            call_next: Next middleware/route handler
-
-        Returns:
-            Response or rate limit error
+            scope: ASGI connection scope
+            receive: ASGI receive channel (passed through unchanged)
+            send: ASGI send channel
         """
-        # Skip rate limiting for excluded paths
-        if request.url.path in self.exclude_paths:
-            return await call_next(request)
+        # Skip rate limiting for non-HTTP traffic and excluded paths
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
 
-        # Get client IP
-        client_ip = self._get_client_ip(request)
+        with span("rate_limit") as rate_span:
+            # Get client IP
+            client_ip = self._get_client_ip(Request(scope))
 
-        # Check rate limit
-        allowed, retry_after = self._check_rate_limit(client_ip)
+            # Check rate limit
+            allowed, retry_after = self._check_rate_limit(client_ip)
+            rate_span.set("allowed", allowed)
 
         if not allowed:
             logger.warning(f"Rate limit exceeded for {client_ip}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "detail": "Rate limit exceeded",
@@ -89,40 +98,26 @@ class RateLimiter(BaseHTTPMiddleware):
                     "X-RateLimit-Reset": str(int(time.time() + retry_after))
                 }
             )
+            await response(scope, receive, send)
+            return
 
         # Update tokens after successful request
         self._update_tokens(client_ip)
 
         # Add rate limit headers to response
-        response = await call_next(request)
-        tokens, _ = self.buckets[client_ip]
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(int(tokens))
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                tokens, _ = self.buckets[client_ip]
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
+                headers["X-RateLimit-Remaining"] = str(int(tokens))
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
 
     def _get_client_ip(self, request: Request) -> str:
-        """
-        Get client IP address from request.
-
-        Handles proxy headers (X-Forwarded-For, X-Real-IP)
-        """
-        # Check for forwarded IP (behind proxy/load balancer)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            # Take the first IP (original client)
-            return forwarded_for.split(",")[0].strip()
-
-        # Check for real IP header
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-
-        # Fall back to direct connection IP
-        if request.client:
-            return request.client.host
-
-        return "unknown"
+        """Get client IP address from request (see app.utils.tenant.get_client_ip)"""
+        return get_client_ip(request)
 
     def _check_rate_limit(self, client_ip: str) -> Tuple[bool, float]:
         """
@@ -18,6 +18,18 @@ class LayoutType(str, Enum):
     FLEXIBLE = "flexible"
 
 
+class OptimizationMode(str, Enum):
+    """Optimization modes"""
+    WEIGHTED = "weighted"  # Single weighted-sum objective
+    PARETO = "pareto"  # Multi-objective NSGA-II, returns a trade-off front
+
+
+class ParameterMode(str, Enum):
+    """Where GA population size, generations and rates come from"""
+    SETTINGS = "settings"  # Server GA_* settings
+    AUTO = "auto"  # Tuning table, by roster size and constraint density
+
+
 class SeatPosition(BaseModel):
     """Position of a seat in the classroom"""
     row: int = Field(..., ge=0, description="Row number (0-indexed)")
@@ -66,6 +78,16 @@ class OptimizationObjectives(BaseModel):
     diversity: float = Field(0.2, ge=0.0, le=1.0, description="Weight for diversity (gender, culture)")
     special_needs: float = Field(0.2, ge=0.0, le=1.0, description="Weight for special needs accommodation")
 
+    def score(self, objective_scores: Dict[str, float], penalty: float = 0.0) -> float:
+        """Combine per-objective scores into a single weighted fitness value"""
+        total = (
+            self.academic_balance * objective_scores.get("academic_balance", 0.0) +
+            self.behavioral_balance * objective_scores.get("behavioral_balance", 0.0) +
+            self.diversity * objective_scores.get("diversity", 0.0) +
+            self.special_needs * objective_scores.get("special_needs", 0.0)
+        )
+        return max(0.0, total - penalty)
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -86,6 +108,21 @@ class SeatingConstraints(BaseModel):
     back_row_student_ids: List[str] = Field(default_factory=list, description="Students who can sit in back")
 
 
+class ConstraintViolation(BaseModel):
+    """A constraint or need that an arrangement violates"""
+    type: str = Field(..., description="Violation type (e.g. separate_pair, front_row)")
+    student_ids: List[str] = Field(default_factory=list, description="Students involved")
+    message: str = Field(..., description="Human-readable description")
+
+
+class ParetoSolution(BaseModel):
+    """Non-dominated seating arrangement from a multi-objective (Pareto) run"""
+    student_seats: Dict[str, SeatPosition] = Field(default_factory=dict, description="Map of student_id to seat position")
+    objective_scores: Dict[str, float] = Field(default_factory=dict, description="Raw per-objective scores")
+    constraint_penalty: float = Field(0.0, ge=0.0, description="Penalty for violated constraints")
+    fitness_score: float = Field(0.0, ge=0.0, description="Weighted fitness under the request objectives")
+
+
 class SeatingArrangement(BaseModel):
     """Complete seating arrangement result"""
     layout: ClassroomLayout
@@ -95,6 +132,20 @@ class SeatingArrangement(BaseModel):
     generation_count: int = Field(0, description="Number of generations used")
     computation_time: float = Field(0.0, description="Time taken in seconds")
     warnings: List[str] = Field(default_factory=list, description="Any warnings or issues")
+    diagnostics: Dict[str, Any] = Field(
+        default_factory=dict, description="Solver diagnostics (fitness evaluations, adaptive control state)"
+    )
+    upper_bound: Optional[float] = Field(
+        None, ge=0.0, description="Fitness no arrangement of this roster and layout can exceed (per-objective "
+                                  "bounds in diagnostics.bounds)"
+    )
+    optimality_gap: Optional[float] = Field(
+        None, ge=0.0, description="(upper_bound - fitness_score) / upper_bound: the share by which the result "
+                                  "may fall short of the optimum, at most"
+    )
+    pareto_front: Optional[List[ParetoSolution]] = Field(
+        None, description="Non-dominated trade-off arrangements (pareto mode only)"
+    )
 
     class Config:
         json_schema_extra = {
@@ -2,12 +2,17 @@
 API Request/Response Models
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Dict, List, Optional
 from app.models.student import Student
 from app.models.classroom import (
+    ConstraintViolation,
     LayoutType,
+    OptimizationMode,
     OptimizationObjectives,
+    ParameterMode,
+    ParetoSolution,
+    SeatPosition,
     SeatingConstraints,
     SeatingArrangement
 )
@@ -22,6 +27,35 @@ class OptimizeClassroomRequest(BaseModel):
     objectives: Optional[OptimizationObjectives] = Field(None, description="Optimization objectives weights")
     constraints: Optional[SeatingConstraints] = Field(None, description="Seating constraints")
     max_generations: Optional[int] = Field(None, ge=10, le=500, description="Max GA generations")
+    mode: OptimizationMode = Field(
+        OptimizationMode.WEIGHTED,
+        description="'weighted' for a single best arrangement, 'pareto' for a trade-off front"
+    )
+    adaptive: bool = Field(
+        False, description="Adapt crossover/mutation rates and operators during the run (weighted mode only)"
+    )
+    reuse_elites: bool = Field(
+        True, description="Seed the population with earlier results for the same roster (elite archive)"
+    )
+    seed: Optional[int] = Field(
+        None, ge=0, description="Random seed; repeats a run exactly (with reuse_elites off). Reported in diagnostics"
+    )
+    parameters: Optional[ParameterMode] = Field(
+        None,
+        description="'auto' picks population, generations and rates by roster size and constraint density, "
+                    "'settings' uses the server defaults (default: GA_PARAMETER_MODE). "
+                    "max_generations still overrides; the values used are reported in diagnostics"
+    )
+    rotations: int = Field(
+        1, ge=1, le=12,
+        description="Consecutive seating charts to plan for this roster (weighted mode only); "
+                    "later charts avoid seating earlier neighbors together again"
+    )
+    target_gap: Optional[float] = Field(
+        None, gt=0.0, lt=1.0,
+        description="Stop once fitness is within this share of the roster's upper bound, e.g. 0.05 "
+                    "(weighted mode only); the bound and gap are returned with the result"
+    )
 
     class Config:
         json_schema_extra = {
@@ -40,12 +74,28 @@ class OptimizeClassroomRequest(BaseModel):
         }
 
 
+class SchedulingInfo(BaseModel):
+    """Where an optimization waited in the fair scheduler"""
+    tenant: str = Field(..., description="Tenant the work was charged to (API key hash, origin or IP)")
+    queue_position: int = Field(0, description="Position in the queue on arrival (0 = started immediately)")
+    estimated_wait_seconds: float = Field(0.0, description="Estimated wait on arrival")
+    queued_seconds: float = Field(0.0, description="Time actually spent queued")
+    estimated_cpu_seconds: float = Field(0.0, description="Estimated cost of the job")
+    cpu_seconds: float = Field(0.0, description="CPU time charged to the tenant")
+    estimated_memory_mb: float = Field(0.0, description="Estimated peak memory reserved for the job")
+
+
 class OptimizeClassroomResponse(BaseModel):
     """Response from classroom optimization"""
     success: bool = Field(..., description="Whether optimization succeeded")
     optimization_id: str = Field(..., description="Unique ID for this optimization")
+    roster_fingerprint: Optional[str] = Field(None, description="Hash of the roster, layout and constraints")
     result: Optional[SeatingArrangement] = Field(None, description="Optimized seating arrangement")
+    rotations: Optional[List[SeatingArrangement]] = Field(
+        None, description="Every planned chart in order, the first being `result` (rotations > 1 only)"
+    )
     error: Optional[str] = Field(None, description="Error message if failed")
+    scheduling: Optional[SchedulingInfo] = Field(None, description="Queueing details of this run")
 
     class Config:
         json_schema_extra = {
@@ -61,6 +111,107 @@ class OptimizeClassroomResponse(BaseModel):
         }
 
 
+class RerankParetoRequest(BaseModel):
+    """Request to re-rank a Pareto front under new objective weights"""
+    front: List[ParetoSolution] = Field(..., min_length=1, description="Pareto front from a previous run")
+    objectives: OptimizationObjectives = Field(..., description="New optimization objectives weights")
+
+
+class RerankParetoResponse(BaseModel):
+    """Pareto front re-ranked under new objective weights"""
+    best: ParetoSolution = Field(..., description="Best arrangement under the new weights")
+    best_index: int = Field(..., description="Index of the best arrangement in the submitted front")
+    front: List[ParetoSolution] = Field(..., description="Front sorted by fitness under the new weights")
+
+
+class ScoreArrangementRequest(BaseModel):
+    """Request to score an explicit seating arrangement"""
+    students: List[Student] = Field(..., min_length=1, description="List of students in the class")
+    layout_type: LayoutType = Field(LayoutType.ROWS, description="Classroom layout")
+    rows: int = Field(5, ge=1, le=20, description="Number of rows")
+    cols: int = Field(6, ge=1, le=20, description="Seats per row")
+    objectives: Optional[OptimizationObjectives] = Field(None, description="Optimization objectives weights")
+    constraints: Optional[SeatingConstraints] = Field(None, description="Seating constraints")
+    student_seats: Dict[str, SeatPosition] = Field(..., description="Map of student_id to seat position")
+
+
+class ScoreArrangementResponse(BaseModel):
+    """Score of an explicit seating arrangement"""
+    fitness_score: float = Field(..., description="Weighted fitness score")
+    objective_scores: Dict[str, float] = Field(..., description="Individual objective scores")
+    constraint_penalty: float = Field(0.0, description="Penalty for violated separation constraints")
+    violations: List[ConstraintViolation] = Field(default_factory=list, description="Violated constraints and needs")
+    computation_time: float = Field(0.0, description="Time taken in seconds")
+
+
+class BulkScoreRequest(BaseModel):
+    """Request to score many arrangements of one roster"""
+    students: List[Student] = Field(..., min_length=1, description="List of students in the class")
+    layout_type: LayoutType = Field(LayoutType.ROWS, description="Classroom layout")
+    rows: int = Field(5, ge=1, le=20, description="Number of rows")
+    cols: int = Field(6, ge=1, le=20, description="Seats per row")
+    objectives: Optional[OptimizationObjectives] = Field(None, description="Optimization objectives weights")
+    constraints: Optional[SeatingConstraints] = Field(None, description="Seating constraints")
+    seat_matrix: Optional[List[List[int]]] = Field(
+        None,
+        description="Per arrangement, the index (into students) of the student in each seat "
+                    "in row-major order, -1 for empty; short rows are padded with empty seats"
+    )
+    arrangements: Optional[List[Dict[str, SeatPosition]]] = Field(
+        None, description="Per arrangement, a map of student_id to seat position"
+    )
+    stream: bool = Field(False, description="Stream one NDJSON line per arrangement")
+
+    @model_validator(mode="after")
+    def check_one_arrangement_format(self):
+        if (self.seat_matrix is None) == (self.arrangements is None):
+            raise ValueError("Provide exactly one of seat_matrix or arrangements")
+        return self
+
+
+class BulkScoreResponse(BaseModel):
+    """Scores of many arrangements, one list entry per arrangement"""
+    count: int = Field(..., description="Number of arrangements scored")
+    fitness_scores: List[float] = Field(..., description="Weighted fitness scores")
+    objective_scores: Dict[str, List[float]] = Field(..., description="Individual objective scores")
+    constraint_penalties: List[float] = Field(..., description="Penalties for violated separation constraints")
+    computation_time: float = Field(0.0, description="Time taken in seconds")
+
+
+class OptimizeSchoolRequest(BaseModel):
+    """Request to split a grade into classrooms and seat each classroom"""
+    students: List[Student] = Field(..., min_length=2, max_length=2000, description="All students of the grade")
+    num_classrooms: int = Field(..., ge=1, le=60, description="Number of classrooms (sections)")
+    layout_type: LayoutType = Field(LayoutType.ROWS, description="Layout of every classroom")
+    rows: int = Field(5, ge=1, le=20, description="Number of rows per classroom")
+    cols: int = Field(6, ge=1, le=20, description="Seats per row")
+    objectives: Optional[OptimizationObjectives] = Field(None, description="Optimization objectives weights")
+    constraints: Optional[SeatingConstraints] = Field(None, description="Seating constraints (school-wide)")
+    max_generations: Optional[int] = Field(None, ge=10, le=500, description="Max GA generations per classroom")
+    parameters: Optional[ParameterMode] = Field(
+        None, description="'auto' or 'settings' GA parameters per classroom (see OptimizeClassroomRequest)"
+    )
+
+
+class ClassroomAssignment(BaseModel):
+    """One classroom of a school-wide assignment"""
+    classroom_index: int = Field(..., description="Classroom number (0-indexed)")
+    student_ids: List[str] = Field(..., description="Students assigned to this classroom")
+    arrangement: SeatingArrangement = Field(..., description="Optimized seating arrangement")
+
+
+class OptimizeSchoolResponse(BaseModel):
+    """Response from school-wide optimization"""
+    success: bool = Field(..., description="Whether optimization succeeded")
+    optimization_id: str = Field(..., description="Unique ID for this optimization")
+    classrooms: List[ClassroomAssignment] = Field(default_factory=list, description="Per-classroom results")
+    partition_metrics: Dict[str, float] = Field(
+        default_factory=dict, description="Balance of the classroom partition and phase timings"
+    )
+    computation_time: float = Field(0.0, description="Time taken in seconds")
+    scheduling: Optional[SchedulingInfo] = Field(None, description="Queueing details of this run")
+
+
 class HealthCheckResponse(BaseModel):
     """Health check response"""
     status: str = Field(..., description="Service status")
@@ -0,0 +1,171 @@
+"""
+Self-Adaptive Operator Control for the Genetic Algorithm
+Adjusts operator probabilities and mutation strength during a run
+"""
+
+import random
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.services.operators import cx_ordered, cx_partially_matched, mut_shuffle_indexes
+
+
+def mut_swap(individual: List[int], indpb: float, rng: random.Random) -> Tuple[List[int]]:
+    """Swap each position with a random other position with probability indpb"""
+    return mut_shuffle_indexes(individual, indpb, rng)
+
+
+def mut_inversion(individual: List[int], indpb: float, rng: random.Random) -> Tuple[List[int]]:
+    """
+    Reverse a random segment of the permutation
+
+    The segment length grows with indpb so that mutation strength is
+    adapted the same way as for swap mutation.
+    """
+    size = len(individual)
+    if size < 2:
+        return (individual,)
+
+    length = max(2, min(size, int(round(2 * indpb * size))))
+    start = rng.randint(0, size - length)
+    individual[start:start + length] = individual[start:start + length][::-1]
+    return (individual,)
+
+
+# Permutation operators the controller chooses between
+CROSSOVER_OPERATORS: Dict[str, Callable] = {
+    "ordered": cx_ordered,
+    "pmx": cx_partially_matched,
+}
+
+MUTATION_OPERATORS: Dict[str, Callable] = {
+    "swap": mut_swap,
+    "inversion": mut_inversion,
+}
+
+
+def population_diversity(population: Sequence[Sequence[int]]) -> float:
+    """
+    Measure population diversity as the normalized number of distinct
+    values per gene position (0 = all clones, 1 = fully diverse)
+    """
+    if len(population) < 2:
+        return 0.0
+
+    genes = np.sort(np.asarray(population), axis=0)
+    distinct = (np.diff(genes, axis=0) != 0).sum(axis=0) + 1
+    max_distinct = min(genes.shape[0], genes.shape[1])
+    if max_distinct < 2:
+        return 0.0
+
+    return float(np.mean((distinct - 1) / (max_distinct - 1)))
+
+
+class AdaptiveController:
+    """
+    Adapts crossover/mutation probabilities, mutation strength and operator
+    choice from population diversity and recent improvement.
+
+    - Improving generations shift the run towards exploitation
+      (more crossover, gentler mutation).
+    - Stagnation or a collapsing population shifts it towards exploration
+      (more and stronger mutation).
+    - Operators are picked by probability matching on their recent success
+      rate, where success means the child beats its parent(s).
+    """
+
+    # Probability bounds
+    MIN_CROSSOVER_RATE = 0.5
+    MAX_CROSSOVER_RATE = 0.95
+    MIN_MUTATION_RATE = 0.05
+    MAX_MUTATION_RATE = 0.6
+    MAX_INDPB = 0.5
+
+    # Below this diversity the population is considered converged
+    LOW_DIVERSITY = 0.2
+    # Generations without improvement before switching to exploration
+    STAGNATION_LIMIT = 3
+    # Learning rate for operator success rates
+    SUCCESS_DECAY = 0.3
+    # Minimum selection probability of every operator
+    MIN_OPERATOR_PROB = 0.1
+
+    def __init__(
+        self,
+        crossover_rate: float,
+        mutation_rate: float,
+        indpb: float,
+        num_genes: int,
+        rng: random.Random = None
+    ):
+        self.rng = rng or random.Random()
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.indpb = indpb
+        self.min_indpb = 1.0 / max(num_genes, 1)
+        self.stagnation = 0
+
+        self.success_rates: Dict[str, Dict[str, float]] = {
+            "crossover": {name: 0.5 for name in CROSSOVER_OPERATORS},
+            "mutation": {name: 0.5 for name in MUTATION_OPERATORS},
+        }
+        self.usage: Dict[str, Dict[str, int]] = {
+            "crossover": {name: 0 for name in CROSSOVER_OPERATORS},
+            "mutation": {name: 0 for name in MUTATION_OPERATORS},
+        }
+        self._outcomes: Dict[Tuple[str, str], List[int]] = {}
+
+    def choose(self, kind: str) -> Tuple[str, Callable]:
+        """Pick a crossover or mutation operator by probability matching"""
+        operators = CROSSOVER_OPERATORS if kind == "crossover" else MUTATION_OPERATORS
+        rates = self.success_rates[kind]
+
+        names = list(operators)
+        total = sum(rates[name] for name in names) or 1.0
+        free = 1.0 - self.MIN_OPERATOR_PROB * len(names)
+        probs = [self.MIN_OPERATOR_PROB + free * rates[name] / total for name in names]
+
+        name = self.rng.choices(names, weights=probs, k=1)[0]
+        self.usage[kind][name] += 1
+        return name, operators[name]
+
+    def record(self, kind: str, name: str, success: bool):
+        """Record whether an application of an operator produced a better child"""
+        outcome = self._outcomes.setdefault((kind, name), [0, 0])
+        outcome[0] += int(success)
+        outcome[1] += 1
+
+    def update(self, diversity: float, improved: bool):
+        """Adapt rates at the end of a generation"""
+        # Fold this generation's operator outcomes into the success rates
+        for (kind, name), (successes, trials) in self._outcomes.items():
+            rate = self.success_rates[kind][name]
+            self.success_rates[kind][name] = rate + self.SUCCESS_DECAY * (successes / trials - rate)
+        self._outcomes.clear()
+
+        self.stagnation = 0 if improved else self.stagnation + 1
+
+        if diversity < self.LOW_DIVERSITY or self.stagnation >= self.STAGNATION_LIMIT:
+            # Explore: more, stronger mutation
+            self.mutation_rate = min(self.MAX_MUTATION_RATE, self.mutation_rate * 1.5)
+            self.indpb = min(self.MAX_INDPB, self.indpb * 1.25)
+            self.crossover_rate = max(self.MIN_CROSSOVER_RATE, self.crossover_rate * 0.95)
+        elif improved:
+            # Exploit: more recombination, gentler mutation
+            self.mutation_rate = max(self.MIN_MUTATION_RATE, self.mutation_rate * 0.9)
+            self.indpb = max(self.min_indpb, self.indpb * 0.9)
+            self.crossover_rate = min(self.MAX_CROSSOVER_RATE, self.crossover_rate * 1.05)
+
+    def summary(self) -> Dict:
+        """Final controller state for response diagnostics"""
+        return {
+            "crossover_rate": round(self.crossover_rate, 4),
+            "mutation_rate": round(self.mutation_rate, 4),
+            "indpb": round(self.indpb, 4),
+            "operator_success": {
+                kind: {name: round(rate, 4) for name, rate in rates.items()}
+                for kind, rates in self.success_rates.items()
+            },
+            "operator_usage": self.usage,
+        }
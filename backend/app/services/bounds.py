@@ -0,0 +1,178 @@
+"""
+Objective Upper Bounds
+Cheap per-roster bounds on every objective, for optimality gaps
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from app.models.classroom import OptimizationObjectives
+from app.services.problem import (
+    FRONT_ROW_DEDUCTION,
+    GENDER_CODES,
+    OBJECTIVE_NAMES,
+    QUIET_AREA_DEDUCTION,
+    CompiledProblem
+)
+
+
+def _row_counts(problem: CompiledProblem) -> np.ndarray:
+    """Students per row: GA arrangements fill seats row-major"""
+    return np.clip(problem.num_students - np.arange(problem.rows) * problem.cols, 0, problem.cols)
+
+
+def _prefix_sums(scores: np.ndarray):
+    """Prefix sums of sorted scores and of their squares"""
+    values = np.sort(scores)
+    return np.concatenate([[0.0], np.cumsum(values)]), np.concatenate([[0.0], np.cumsum(values ** 2)])
+
+
+def _min_window_variance(sums: np.ndarray, squares: np.ndarray, size: int) -> float:
+    """Smallest variance of any `size` scores (always a run of the sorted scores)"""
+    window_sums = sums[size:] - sums[:-size]
+    window_squares = squares[size:] - squares[:-size]
+    return float(max(0.0, (window_squares / size - (window_sums / size) ** 2).min()))
+
+
+def _min_partition_sse(sums: np.ndarray, squares: np.ndarray, counts: np.ndarray) -> float:
+    """
+    Smallest total within-row sum of squares over all seatings
+
+    Splitting the sorted scores into consecutive runs is optimal for fixed
+    group sizes; rows are all full but the last, so only the position of
+    the short run varies.
+    """
+    def sse(start: int, size: int) -> float:
+        total = sums[start + size] - sums[start]
+        return squares[start + size] - squares[start] - total * total / size
+
+    full, short = int(counts.max()), int(counts.min())
+    best = np.inf
+    for position in range(len(counts) if short < full else 1):
+        start, total = 0, 0.0
+        for group in range(len(counts)):
+            size = short if group == position else full
+            total += sse(start, size)
+            start += size
+        best = min(best, total)
+    return float(max(0.0, best))
+
+
+def academic_balance_bound(problem: CompiledProblem, counts: np.ndarray) -> float:
+    """
+    Every row at least as varied as the closest-scored students of its
+    size, and the rows' total sum of squares at least the best partition's.
+    Row scores are convex in variance, so the bound piles all the excess
+    variance on one row, taking the best such row.
+    """
+    filled = counts[counts > 0]
+    if len(filled) == 0:
+        return 0.5
+    sums, squares = _prefix_sums(problem.academic)
+    floors = np.array([_min_window_variance(sums, squares, k) for k in filled])
+    excess = _min_partition_sse(sums, squares, filled) - float((filled * floors).sum())
+
+    scores = 1.0 / (1.0 + floors / 100.0)
+    if excess <= 0.0:
+        return float(scores.mean())
+    piled = 1.0 / (1.0 + (floors + excess / filled) / 100.0)
+    return float((scores.sum() - (scores - piled).min()) / len(filled))
+
+
+def behavioral_balance_bound(problem: CompiledProblem, counts: np.ndarray) -> float:
+    """
+    The best pair scores the neighbor pairs could take: each student is
+    the left (and the right) member of at most one pair
+    """
+    pairs = int(np.maximum(counts - 1, 0).sum())
+    if pairs == 0:
+        return 0.5
+    scores = problem.pair_score.copy()
+    np.fill_diagonal(scores, -np.inf)
+    best_right = np.sort(scores.max(axis=1))[::-1][:pairs]
+    best_left = np.sort(scores.max(axis=0))[::-1][:pairs]
+    return float(min(best_right.sum(), best_left.sum()) / pairs)
+
+
+def diversity_bound(problem: CompiledProblem, counts: np.ndarray) -> float:
+    """
+    Gender: a row with two genders holds a student outside the largest
+    gender group, so at most that many rows score 1 (the rest 0.5).
+
+    Language: a row scores distinct languages per speaker. If everyone
+    speaks one, languages are shared out to the smallest rows first, each
+    language reaching at most one row per speaker.
+    """
+    diverse = np.sort(counts[counts >= 2])
+    if len(diverse) == 0:
+        return 0.5
+
+    gender_counts = np.bincount(problem.gender, minlength=len(GENDER_CODES))
+    mixed_rows = min(len(diverse), problem.num_students - int(gender_counts.max()))
+    gender = 0.5 * len(diverse) + 0.5 * mixed_rows
+
+    speakers = problem.language[problem.language >= 0]
+    if len(speakers) == 0:
+        language = 0.5 * len(diverse)
+    elif len(speakers) < problem.num_students:
+        # Students without a language can be seated to suit: any row may reach 1
+        language = float(len(diverse))
+    else:
+        available = int(np.minimum(np.bincount(speakers), len(diverse)).sum())
+        language = 0.0
+        for size in diverse:
+            distinct = min(size, problem.num_languages, available)
+            language += distinct / size
+            available -= distinct
+    return float((gender + language) / 2.0 / len(diverse))
+
+
+def special_needs_bound(problem: CompiledProblem, counts: np.ndarray) -> float:
+    """Deductions the seat counts of the front row and quiet half force on special students"""
+    special = problem.special
+    if not special.any():
+        return 1.0
+
+    front = int(problem.front_required.sum())
+    quiet = int((problem.quiet_required & special).sum())
+    both = int((problem.front_required & problem.quiet_required).sum())
+    front_seats = int(counts[0])
+    quiet_seats = int(counts[problem.rows // 2:].sum())
+
+    deduction = max(
+        FRONT_ROW_DEDUCTION * max(0, front - front_seats) + QUIET_AREA_DEDUCTION * max(0, quiet - quiet_seats),
+        # Row 0 is outside the quiet half unless there is a single row
+        min(FRONT_ROW_DEDUCTION, QUIET_AREA_DEDUCTION) * both if problem.rows > 1 else 0.0
+    )
+    return float(1.0 - deduction / int(special.sum()))
+
+
+def objective_upper_bounds(problem: CompiledProblem) -> Dict[str, float]:
+    """
+    Upper bound on every objective score of any arrangement of the roster
+
+    Each bound relaxes the seating to what the roster and row sizes allow
+    (e.g. neighbor pairs need not chain into rows), so it is cheap and
+    never below the optimum, but not always reachable.
+    """
+    counts = _row_counts(problem)
+    bounds = {
+        "academic_balance": academic_balance_bound(problem, counts),
+        "behavioral_balance": behavioral_balance_bound(problem, counts),
+        "diversity": diversity_bound(problem, counts),
+        "special_needs": special_needs_bound(problem, counts),
+    }
+    return {name: bounds[name] for name in OBJECTIVE_NAMES}
+
+
+def fitness_upper_bound(bounds: Dict[str, float], objectives: OptimizationObjectives) -> float:
+    """Upper bound on weighted fitness (constraint penalties are at least 0)"""
+    return objectives.score(bounds)
+
+
+def optimality_gap(fitness: float, upper_bound: float) -> float:
+    """Share of the upper bound a fitness falls short of (0 = provably optimal)"""
+    if upper_bound <= 0.0:
+        return 0.0
+    return max(0.0, (upper_bound - fitness) / upper_bound)
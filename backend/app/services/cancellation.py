@@ -0,0 +1,31 @@
+"""
+Cooperative Cancellation
+Lets a request stop a running optimization between generations
+"""
+
+import threading
+from typing import Optional
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag shared by a route and an optimizer.
+
+    The route trips it (e.g. when the client disconnects); the optimizer
+    checks it between generations and stops with the best result so far.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled"):
+        """Request cancellation (idempotent; the first reason wins)"""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested"""
+        return self._event.is_set()
@@ -0,0 +1,131 @@
+"""
+Elite Archive
+Best arrangements per roster, reused to seed later optimizations
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.classroom import OptimizationObjectives
+from app.services.problem import OBJECTIVE_NAMES
+
+
+@dataclass
+class EliteEntry:
+    """An archived arrangement with its weight-independent scores"""
+    order: Tuple[str, ...]  # Student ids in seat order (row-major)
+    objective_scores: Dict[str, float]
+    penalty: float
+
+    def adjusted(self) -> np.ndarray:
+        """Objective vector with the constraint penalty subtracted (as in pareto mode)"""
+        return np.maximum(0.0, np.array([self.objective_scores[name] for name in OBJECTIVE_NAMES]) - self.penalty)
+
+
+def _nondominated_layers(vectors: np.ndarray) -> List[np.ndarray]:
+    """Indices of successive non-dominated fronts (maximization)"""
+    remaining = np.arange(len(vectors))
+    layers = []
+    while len(remaining):
+        values = vectors[remaining]
+        dominated = (
+            (values[None, :, :] >= values[:, None, :]).all(axis=-1)
+            & (values[None, :, :] > values[:, None, :]).any(axis=-1)
+        ).any(axis=1)
+        layers.append(remaining[~dominated])
+        remaining = remaining[dominated]
+    return layers
+
+
+class EliteArchive:
+    """
+    Bounded archive of elite arrangements per roster fingerprint.
+
+    Scores are stored raw (per objective, plus penalty) so entries can be
+    re-ranked under any objective weights. Each roster keeps at most
+    `per_roster` entries, chosen by non-dominated layers so arrangements
+    that are best under other weightings survive; rosters are evicted LRU.
+    """
+
+    def __init__(self, max_rosters: int, per_roster: int):
+        self.max_rosters = max_rosters
+        self.per_roster = per_roster
+        self._rosters: "OrderedDict[str, Dict[Tuple[str, ...], EliteEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, fingerprint: str, entries: Sequence[EliteEntry], objectives: OptimizationObjectives = None):
+        """Merge a run's elites into the roster's archive"""
+        objectives = objectives or OptimizationObjectives()
+        with self._lock:
+            archive = dict(self._rosters.get(fingerprint, {}))
+            for entry in entries:
+                archive[entry.order] = entry
+            self._rosters[fingerprint] = self._trim(archive, objectives)
+            self._rosters.move_to_end(fingerprint)
+            while len(self._rosters) > self.max_rosters:
+                self._rosters.popitem(last=False)
+
+    def seeds(self, fingerprint: str, objectives: OptimizationObjectives, k: int) -> List[List[str]]:
+        """Up to k archived arrangements, best first under the given weights"""
+        with self._lock:
+            archive = self._rosters.get(fingerprint)
+            if not archive:
+                self.misses += 1
+                return []
+            self._rosters.move_to_end(fingerprint)
+            self.hits += 1
+            entries = list(archive.values())
+
+        entries.sort(key=lambda entry: objectives.score(entry.objective_scores, penalty=entry.penalty), reverse=True)
+        return [list(entry.order) for entry in entries[:k]]
+
+    def _trim(
+        self,
+        archive: Dict[Tuple[str, ...], EliteEntry],
+        objectives: OptimizationObjectives
+    ) -> Dict[Tuple[str, ...], EliteEntry]:
+        """Keep whole non-dominated layers; break the last one by the current weights"""
+        if len(archive) <= self.per_roster:
+            return archive
+
+        entries = list(archive.values())
+        kept: List[EliteEntry] = []
+        for layer in _nondominated_layers(np.stack([entry.adjusted() for entry in entries])):
+            layer_entries = [entries[i] for i in layer]
+            room = self.per_roster - len(kept)
+            if len(layer_entries) > room:
+                layer_entries.sort(
+                    key=lambda entry: objectives.score(entry.objective_scores, penalty=entry.penalty),
+                    reverse=True
+                )
+                layer_entries = layer_entries[:room]
+            kept.extend(layer_entries)
+            if len(kept) >= self.per_roster:
+                break
+
+        return {entry.order: entry for entry in kept}
+
+    def get_stats(self) -> Dict:
+        """Get archive statistics"""
+        with self._lock:
+            return {
+                "rosters": len(self._rosters),
+                "max_rosters": self.max_rosters,
+                "per_roster": self.per_roster,
+                "entries": sum(len(archive) for archive in self._rosters.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+elite_archive = EliteArchive(
+    max_rosters=settings.ELITE_ARCHIVE_ROSTERS,
+    per_roster=settings.ELITE_ARCHIVE_SIZE
+)
@@ -0,0 +1,315 @@
+"""
+Feasibility Preflight
+Fast counting and conflict-graph checks run before spending GA time
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models.student import Student
+from app.models.classroom import SeatingConstraints
+
+# Randomized restarts of the greedy construction, and their time budget
+GREEDY_ATTEMPTS = 20
+GREEDY_TIME_BUDGET = 0.05
+
+
+@dataclass
+class FeasibilityReport:
+    """
+    Outcome of a preflight analysis.
+
+    `errors` are proven: no arrangement the optimizer can produce satisfies
+    them. `warnings` are softer diagnoses (suspicious input, or constraints
+    the fast checks could neither prove nor certify).
+    """
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    certified: bool = False  # A constraint-satisfying arrangement was constructed
+    elapsed_ms: float = 0.0
+
+    @property
+    def feasible(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> Dict:
+        """Compact form for SeatingArrangement.diagnostics"""
+        return {
+            "feasible": self.feasible,
+            "certified": self.certified,
+            "errors": len(self.errors),
+            "warnings": len(self.warnings),
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+
+class _Layout:
+    """
+    Seats the optimizer can actually use.
+
+    Individuals fill the first `n` seats in row-major order, so occupied
+    seats form one segment per row (the last row possibly partial) and a
+    student's neighbors are the seats directly left and right of it.
+    """
+
+    def __init__(self, num_students: int, rows: int, cols: int):
+        self.num_students = num_students
+        self.cols = cols
+        self.rows = rows
+        self.quiet_from_row = rows // 2
+        self.segments = [
+            min(cols, num_students - start) for start in range(0, num_students, cols)
+        ]
+
+    @property
+    def front_seats(self) -> int:
+        return self.segments[0] if self.segments else 0
+
+    @property
+    def quiet_seats(self) -> int:
+        return sum(self.segments[self.quiet_from_row:])
+
+    @property
+    def segment_ends(self) -> int:
+        """Seats with at most one neighbor"""
+        return sum(min(length, 2) for length in self.segments)
+
+    @property
+    def isolated_seats(self) -> int:
+        """Seats with no neighbor"""
+        return sum(1 for length in self.segments if length == 1)
+
+
+def _conflict_graph(
+    students: List[Student],
+    constraints: SeatingConstraints,
+    report: FeasibilityReport
+) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """
+    Undirected 'must not sit next to each other' graphs: proven conflicts
+    (separate pairs and mutual incompatibilities), and those plus one-sided
+    incompatibilities
+
+    A one-sided incompatibility only scores the pair low with the listing
+    student on the left, so the optimizer can seat the two side by side
+    the other way round; it can't prove anything unsatisfiable.
+    """
+    ids = {s.id for s in students}
+    conflicts: Dict[str, Set[str]] = {s.id: set() for s in students}
+    listed: Dict[str, Set[str]] = {s.id: set() for s in students}
+
+    def add(first: str, second: str, source: str, graph: Dict[str, Set[str]]):
+        if first == second:
+            report.warnings.append(f"Student '{first}' is listed as {source} with themself; ignored")
+            return
+        missing = [student_id for student_id in (first, second) if student_id not in ids]
+        if missing:
+            report.warnings.append(
+                f"{source.capitalize()} entry ({first}, {second}) references unknown student(s) "
+                f"{', '.join(repr(m) for m in missing)}; ignored"
+            )
+            return
+        graph[first].add(second)
+        if graph is conflicts:
+            graph[second].add(first)
+
+    for student in students:
+        for other_id in student.incompatible_ids:
+            add(student.id, other_id, "incompatible", listed)
+    for student_id, others in listed.items():
+        for other_id in others:
+            if student_id in listed[other_id]:
+                conflicts[student_id].add(other_id)
+
+    for pair in constraints.separate_student_pairs:
+        if len(pair) != 2:
+            report.warnings.append(f"Separate pair {pair} does not have exactly two students; ignored")
+            continue
+        add(pair[0], pair[1], "separate pair", conflicts)
+
+    with_one_sided = {student_id: set(others) for student_id, others in conflicts.items()}
+    for student_id, others in listed.items():
+        for other_id in others:
+            with_one_sided[student_id].add(other_id)
+            with_one_sided[other_id].add(student_id)
+    return conflicts, with_one_sided
+
+
+def _degree_bounds(conflicts: Dict[str, Set[str]], layout: _Layout) -> List[str]:
+    """Students who can't get compatible neighbors: an interior seat has two, a row end one"""
+    n = layout.num_students
+    compatible = {student_id: n - 1 - len(others) for student_id, others in conflicts.items()}
+    failures = []
+
+    loners = sorted(student_id for student_id, count in compatible.items() if count == 0)
+    if len(loners) > layout.isolated_seats:
+        failures.append(
+            f"{len(loners)} student(s) conflict with every classmate and need a seat without "
+            f"neighbors, but the layout has {layout.isolated_seats}: {', '.join(loners[:10])}"
+        )
+
+    edge_bound = sorted(student_id for student_id, count in compatible.items() if count < 2)
+    if len(edge_bound) > layout.segment_ends and n > 2:
+        failures.append(
+            f"{len(edge_bound)} students have fewer than two compatible classmates and must sit "
+            f"at a row end, but there are only {layout.segment_ends} row ends: {', '.join(edge_bound[:10])}"
+        )
+    return failures
+
+
+def _greedy_arrangement(
+    students: List[Student],
+    layout: _Layout,
+    conflicts: Dict[str, Set[str]],
+    front: Set[str],
+    quiet: Set[str],
+    rng: random.Random
+) -> Optional[List[str]]:
+    """
+    Fill seats in row-major order, most constrained student first
+
+    Each seat takes a student that is allowed in its row and doesn't
+    conflict with the left neighbor. Front-row students are placed first
+    in row 0 and quiet-area students are kept for the back rows.
+
+    Returns:
+        Student ids in seat order, or None if the attempt got stuck
+    """
+    remaining = {s.id for s in students}
+    # Conflicts of each student with still unplaced students
+    open_conflicts = {student_id: len(others) for student_id, others in conflicts.items()}
+    order: List[str] = []
+    quiet_left = layout.quiet_seats
+
+    for row, length in enumerate(layout.segments):
+        in_quiet = row >= layout.quiet_from_row
+        for col in range(length):
+            left = order[-1] if col > 0 else None
+            seats_left_in_front = length - col if row == 0 else 0
+
+            candidates = [
+                student_id for student_id in remaining
+                if (row == 0 or student_id not in front)
+                and (in_quiet or student_id not in quiet)
+                and (left is None or student_id not in conflicts[left])
+            ]
+            if not candidates:
+                return None
+
+            pending_front = len(front & remaining)
+            pending_quiet = len(quiet & remaining)
+
+            def priority(student_id: str):
+                must_place = (
+                    (row == 0 and student_id in front and pending_front >= seats_left_in_front)
+                    or (in_quiet and student_id in quiet and pending_quiet >= quiet_left)
+                )
+                preferred = (row == 0 and student_id in front) or (in_quiet and student_id in quiet)
+                return (must_place, preferred, open_conflicts[student_id], rng.random())
+
+            choice = max(candidates, key=priority)
+            order.append(choice)
+            remaining.discard(choice)
+            for other in conflicts[choice]:
+                open_conflicts[other] -= 1
+            if in_quiet:
+                quiet_left -= 1
+
+    return order
+
+
+def analyze_feasibility(
+    students: List[Student],
+    rows: int,
+    cols: int,
+    constraints: SeatingConstraints = None,
+    seed: int = 0
+) -> FeasibilityReport:
+    """
+    Check a seating request for constraints no arrangement can satisfy
+
+    Counting bounds cover front-row and quiet-area capacity; degree bounds
+    on the conflict graph (mutual incompatibilities and separate pairs)
+    cover students who can't have two compatible neighbors. Bounds that
+    only fail once one-sided incompatibilities are counted are warnings.
+    If no bound fails, a randomized greedy construction tries to certify
+    the request feasible, keeping one-sided incompatibilities apart too
+    when it can.
+    """
+    start = time.perf_counter()
+    constraints = constraints or SeatingConstraints()
+    report = FeasibilityReport()
+    n = len(students)
+    layout = _Layout(n, rows, cols)
+    ids = {s.id for s in students}
+
+    if n > rows * cols:
+        report.errors.append(f"{n} students do not fit in {rows * cols} seats")
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    # Front row: students are seated from the front, so it holds min(cols, n) students
+    front = {s.id for s in students if s.requires_front_row}
+    for student_id in constraints.front_row_student_ids:
+        if student_id in ids:
+            front.add(student_id)
+        else:
+            report.warnings.append(f"Front-row constraint references unknown student '{student_id}'; ignored")
+    if len(front) > layout.front_seats:
+        report.errors.append(
+            f"{len(front)} students require the front row but it has only {layout.front_seats} seats"
+        )
+
+    # Quiet area: rows from rows // 2 backwards that actually receive students
+    quiet = {s.id for s in students if s.requires_quiet_area}
+    both = front & quiet
+    if both and layout.quiet_from_row > 0:
+        report.errors.append(
+            f"{len(both)} student(s) require both the front row and the quiet (back) area: "
+            f"{', '.join(sorted(both))}"
+        )
+    if len(quiet) > layout.quiet_seats:
+        report.errors.append(
+            f"{len(quiet)} students require a quiet area but only {layout.quiet_seats} seats "
+            f"in rows {layout.quiet_from_row}+ are occupied"
+        )
+    if layout.quiet_from_row == 0 and len(front | quiet) > layout.front_seats:
+        report.errors.append(
+            f"{len(front | quiet)} students need the single row ({layout.front_seats} seats) "
+            f"as front-row or quiet seats"
+        )
+
+    # Conflict graph degree bounds
+    conflicts, with_one_sided = _conflict_graph(students, constraints, report)
+    report.errors.extend(_degree_bounds(conflicts, layout))
+    if with_one_sided != conflicts and report.feasible:
+        report.warnings.extend(
+            f"Counting one-sided incompatibilities (which only apply with the listing student on the left): {failure}"
+            for failure in _degree_bounds(with_one_sided, layout)
+        )
+
+    if report.feasible:
+        rng = random.Random(seed)
+        deadline = time.perf_counter() + GREEDY_TIME_BUDGET
+        graphs = [with_one_sided, conflicts] if with_one_sided != conflicts else [conflicts]
+        for graph in graphs:
+            for _ in range(GREEDY_ATTEMPTS):
+                if _greedy_arrangement(students, layout, graph, front, quiet, rng) is not None:
+                    report.certified = True
+                    break
+                if time.perf_counter() > deadline:
+                    break
+            if report.certified:
+                break
+        if not report.certified:
+            num_conflicts = sum(len(others) for others in conflicts.values()) // 2
+            report.warnings.append(
+                f"Could not quickly construct an arrangement that keeps all {num_conflicts} "
+                f"conflicting pairs apart and meets every front-row/quiet-area need; "
+                f"some constraints may be unsatisfiable"
+            )
+
+    report.elapsed_ms = (time.perf_counter() - start) * 1000
+    return report
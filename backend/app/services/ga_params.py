@@ -0,0 +1,121 @@
+"""
+GA Parameters
+Per-run population size, generations and operator rates, from settings or
+picked automatically from problem size with an offline tuning table
+"""
+
+import bisect
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.models.classroom import OptimizationMode, ParameterMode, SeatingConstraints
+from app.models.student import Student
+
+logger = logging.getLogger(__name__)
+
+# Generated by scripts/tune_parameters.py
+TUNING_TABLE_PATH = os.path.join(os.path.dirname(__file__), "ga_tuning.json")
+
+
+@dataclass(frozen=True)
+class GAParameters:
+    """Genetic algorithm parameters of one run"""
+    population_size: int
+    generations: int
+    crossover_rate: float
+    mutation_rate: float
+    mutation_indpb: float
+    source: str = "settings"  # "settings" or "auto"
+
+    @classmethod
+    def from_settings(cls) -> "GAParameters":
+        return cls(
+            population_size=settings.GA_POPULATION_SIZE,
+            generations=settings.GA_GENERATIONS,
+            crossover_rate=settings.GA_CROSSOVER_RATE,
+            mutation_rate=settings.GA_MUTATION_RATE,
+            mutation_indpb=settings.GA_MUTATION_INDPB,
+        )
+
+    def summary(self) -> Dict:
+        """Parameters for response diagnostics"""
+        return asdict(self)
+
+
+def constraint_density(students: List[Student], constraints: Optional[SeatingConstraints] = None) -> float:
+    """
+    Scored constraints per student: separation pairs, incompatibilities
+    and front-row / quiet-area needs
+    """
+    if not students:
+        return 0.0
+    count = sum(len(s.incompatible_ids) + s.requires_front_row + s.requires_quiet_area for s in students)
+    if constraints is not None:
+        count += len(constraints.separate_student_pairs)
+    return count / len(students)
+
+
+@lru_cache(maxsize=None)
+def load_tuning_table(path: str = TUNING_TABLE_PATH) -> Optional[Dict]:
+    """The tuning table, or None if it is missing or unreadable"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+        table["entries"] = sorted(table["entries"], key=lambda entry: entry["max_students"])
+        return table
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"GA tuning table unavailable ({e}); using GA_* settings")
+        return None
+
+
+def auto_parameters(
+    num_students: int,
+    density: float,
+    mode: OptimizationMode = OptimizationMode.WEIGHTED
+) -> GAParameters:
+    """
+    Parameters from the tuning table for a roster of this size and
+    constraint density
+
+    Rows of the table cover rosters up to max_students in one density
+    level; larger rosters use the largest row. Seat count is not a key:
+    students fill seats in order, so empty seats don't enlarge the search.
+    """
+    table = load_tuning_table()
+    if table is None:
+        return GAParameters.from_settings()
+
+    level = bisect.bisect_right(table["density_levels"], density)
+    entries = [entry for entry in table["entries"] if entry["density_level"] == level] or table["entries"]
+    entry = next((entry for entry in entries if entry["max_students"] >= num_students), entries[-1])
+
+    params = GAParameters(
+        population_size=entry["population_size"],
+        generations=entry["generations"],
+        crossover_rate=entry["crossover_rate"],
+        mutation_rate=entry["mutation_rate"],
+        mutation_indpb=entry["mutation_indpb"],
+        source="auto",
+    )
+    if mode == OptimizationMode.PARETO:
+        # Tuned on weighted fitness; keep room for a full front
+        params = replace(params, population_size=max(params.population_size, 2 * settings.PARETO_MAX_FRONT_SIZE))
+    return params
+
+
+def resolve_parameters(
+    parameter_mode: Optional[ParameterMode],
+    num_students: int,
+    density: float,
+    mode: OptimizationMode = OptimizationMode.WEIGHTED
+) -> GAParameters:
+    """Parameters of a run in the requested mode (default: GA_PARAMETER_MODE)"""
+    parameter_mode = parameter_mode or ParameterMode(settings.GA_PARAMETER_MODE)
+    if parameter_mode == ParameterMode.AUTO:
+        return auto_parameters(num_students, density, mode)
+    return GAParameters.from_settings()
@@ -5,8 +5,9 @@ Uses DEAP (Distributed Evolutionary Algorithms in Python)
 
 import random
 import time
-from typing import List, Dict, Tuple
-from deap import base, creator, tools, algorithms
+from collections import OrderedDict
+from typing import Callable, List, Dict, Tuple, Optional
+from deap import base, tools
 import numpy as np
 
 from app.models.student import Student
@@ -16,14 +17,46 @@ from app.models.classroom import (
     Seat,
     SeatPosition,
     OptimizationObjectives,
+    OptimizationMode,
+    ParetoSolution,
     SeatingConstraints,
     LayoutType
 )
 from app.core.config import settings
+from app.core.tracing import span
+from app.services.adaptive import AdaptiveController, population_diversity
+from app.services.bounds import fitness_upper_bound, objective_upper_bounds, optimality_gap
+from app.services.cancellation import CancellationToken
+from app.services.elite_archive import EliteEntry
+from app.services.ga_params import GAParameters
+from app.services.memory import MB, MemoryProbe, estimate_run_bytes
+from app.services.operators import (
+    Individual,
+    IndividualMulti,
+    cx_ordered,
+    mut_shuffle_indexes,
+    sel_tournament,
+    var_and,
+    var_or
+)
+from app.services.problem import CompiledProblem, OBJECTIVE_NAMES, weighted_fitness
+from app.services.symmetry import ArrangementHasher
 
+# Fitness cache entries kept per individual of the population
+FITNESS_CACHE_FACTOR = 10
+# Mutations tried to turn a duplicate offspring into a new arrangement
+# before falling back to a random one
+DUPLICATE_MUTATION_ATTEMPTS = 3
 
 class ClassroomOptimizer:
-    """Genetic Algorithm-based classroom seating optimizer"""
+    """
+    Genetic Algorithm-based classroom seating optimizer
+
+    Every instance owns its random generator and DEAP toolbox and no
+    operator touches the global `random` module, so independent
+    optimizers can run concurrently in threads and a given seed always
+    reproduces the same run.
+    """
 
     def __init__(
         self,
@@ -32,7 +65,10 @@ class ClassroomOptimizer:
         rows: int,
         cols: int,
         objectives: OptimizationObjectives,
-        constraints: SeatingConstraints = None
+        constraints: SeatingConstraints = None,
+        mode: OptimizationMode = OptimizationMode.WEIGHTED,
+        seed: Optional[int] = None,
+        params: Optional[GAParameters] = None
     ):
         self.students = students
         self.layout_type = layout_type
@@ -41,38 +77,161 @@ class ClassroomOptimizer:
         self.total_seats = rows * cols
         self.objectives = objectives
         self.constraints = constraints or SeatingConstraints()
+        self.mode = mode
+        self.params = params or GAParameters.from_settings()
+        self.evaluation_count = 0
+        self._cancel_token: Optional[CancellationToken] = None
+        self._on_generation = None
+        self._seed_arrangements: List[List[str]] = []
+        self._initial_population: List[List[int]] = []
+        self.population: List[List[int]] = []
+
+        # Random seed is reported in diagnostics so any run can be reproduced
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
 
         # Create student ID to index mapping
         self.student_ids = [s.id for s in students]
         self.student_map = {s.id: s for s in students}
 
+        # Compile roster, geometry and constraints to arrays for fast scoring
+        self.problem = CompiledProblem.compile(students, rows, cols, self.constraints)
+        self._score_batch = self.problem.score_batch
+
+        # Bounds on what any arrangement can score, for optimality gaps
+        self.objective_bounds = objective_upper_bounds(self.problem)
+        self.upper_bound = fitness_upper_bound(self.objective_bounds, objectives)
+        self._target_gap: Optional[float] = None
+        self._stop_fitness: Optional[float] = None
+
+        # Arrangements equal up to layout symmetries are scored once
+        self.hasher = ArrangementHasher(self.problem)
+        self._deduplicate = settings.GA_DEDUPLICATE
+        self._fitness_cache: OrderedDict = OrderedDict()
+        self._fitness_cache_size = FITNESS_CACHE_FACTOR * self.params.population_size
+        self.evaluations_skipped = 0
+        self.duplicates_replaced = 0
+
+        # Repeat-neighbor penalty of rotation planning (see app.services.rotation):
+        # history[i, j] counts earlier periods in which i and j sat side by side.
+        # Students fill seats row-major, so the order positions k and k + 1 are
+        # neighbors unless k ends a row
+        self.neighbor_history: Optional[np.ndarray] = None
+        self.repeat_penalty = 0.0
+        positions = np.arange(len(students) - 1)
+        self.neighbor_positions = positions[positions % cols != cols - 1]
+
         # Initialize DEAP
         self._setup_deap()
 
     def _setup_deap(self):
         """Set up DEAP genetic algorithm framework"""
-        # Create fitness class (maximize)
-        if not hasattr(creator, "FitnessMax"):
-            creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-
-        # Create individual class
-        if not hasattr(creator, "Individual"):
-            creator.create("Individual", list, fitness=creator.FitnessMax)
-
+        # Individual types live in app.services.operators rather than on
+        # DEAP's global `creator`, and every random operator draws from self.rng
         self.toolbox = base.Toolbox()
 
         # Register functions
         # Create a function that returns a random permutation of student indices
         num_students = len(self.students)
-        self.toolbox.register("indices", lambda: random.sample(range(num_students), num_students))
-        self.toolbox.register("individual", tools.initIterate, creator.Individual, self.toolbox.indices)
+        individual_cls = IndividualMulti if self.mode == OptimizationMode.PARETO else Individual
+        self.toolbox.register("indices", lambda: self.rng.sample(range(num_students), num_students))
+        self.toolbox.register("individual", tools.initIterate, individual_cls, self.toolbox.indices)
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
 
         # Genetic operators
-        self.toolbox.register("evaluate", self._evaluate_fitness)
-        self.toolbox.register("mate", tools.cxOrdered)
-        self.toolbox.register("mutate", tools.mutShuffleIndexes, indpb=0.2)
-        self.toolbox.register("select", tools.selTournament, tournsize=3)
+        self.toolbox.register("mate", cx_ordered, rng=self.rng)
+        self.toolbox.register("mutate", mut_shuffle_indexes, indpb=self.params.mutation_indpb, rng=self.rng)
+
+        if self.mode == OptimizationMode.PARETO:
+            self.toolbox.register("evaluate", self._evaluate_objectives)
+            self.toolbox.register("select", tools.selNSGA2)
+        else:
+            self.toolbox.register("evaluate", self._evaluate_fitness)
+            self.toolbox.register("select", sel_tournament, tournsize=3, rng=self.rng)
+
+        # DEAP evaluates through toolbox.map(toolbox.evaluate, individuals);
+        # route that to a single vectorized pass over the whole batch
+        self.toolbox.register("map", self._map)
+
+    def _map(self, func, iterable):
+        """toolbox.map that scores batches of individuals together"""
+        if func is self.toolbox.evaluate:
+            return self._evaluate_population(list(iterable))
+        return list(map(func, iterable))
+
+    def _evaluate_population(self, individuals: List[List[int]]) -> List[Tuple[float, ...]]:
+        """
+        Evaluate many individuals in one vectorized pass
+
+        When deduplicating, arrangements whose symmetry class is cached or
+        repeated within the batch are not scored again. The cache holds
+        fitness without the repeat-neighbor penalty, so it stays valid
+        across rotation periods.
+        """
+        if not individuals:
+            return []
+        orders = np.asarray(individuals)
+        if not self._deduplicate:
+            self.evaluation_count += len(orders)
+            return self._with_repeat_penalty(orders, self._score_orders(orders))
+
+        fitnesses = [None] * len(orders)
+        pending: Dict[int, List[int]] = {}
+        for i, key in enumerate(self.hasher.hash_batch(orders).tolist()):
+            cached = self._fitness_cache.get(key)
+            if cached is None:
+                pending.setdefault(key, []).append(i)
+            else:
+                fitnesses[i] = cached
+        self.evaluations_skipped += len(orders) - len(pending)
+
+        if pending:
+            self.evaluation_count += len(pending)
+            scored = self._score_orders(orders[[positions[0] for positions in pending.values()]])
+            for (key, positions), fitness in zip(pending.items(), scored):
+                self._fitness_cache[key] = fitness
+                for i in positions:
+                    fitnesses[i] = fitness
+            while len(self._fitness_cache) > self._fitness_cache_size:
+                self._fitness_cache.popitem(last=False)
+
+        return self._with_repeat_penalty(orders, fitnesses)
+
+    def repeated_neighbors(self, orders: np.ndarray) -> np.ndarray:
+        """
+        Earlier-period neighbor counts of (N, num_students) student orders
+
+        Returns:
+            (N, neighbor pairs) history count of every pair of adjacent students
+        """
+        orders = np.asarray(orders)
+        return self.neighbor_history[
+            orders[:, self.neighbor_positions], orders[:, self.neighbor_positions + 1]
+        ]
+
+    def _with_repeat_penalty(
+        self,
+        orders: np.ndarray,
+        fitnesses: List[Tuple[float, ...]]
+    ) -> List[Tuple[float, ...]]:
+        """Subtract the repeat-neighbor penalty from weighted fitnesses"""
+        if self.neighbor_history is None:
+            return fitnesses
+        penalties = self.repeat_penalty * self.repeated_neighbors(orders).sum(axis=-1)
+        return [(max(0.0, fitness[0] - penalty),) for fitness, penalty in zip(fitnesses, penalties.tolist())]
+
+    def _score_orders(self, orders: np.ndarray) -> List[Tuple[float, ...]]:
+        """Fitness tuples of (N, num_students) student orders"""
+        seats = np.full((len(orders), self.total_seats), -1, dtype=np.int64)
+        seats[:, :len(self.students)] = orders
+        scores = self._score_batch(seats)
+
+        if self.mode == OptimizationMode.PARETO:
+            values = np.stack([scores[name] for name in OBJECTIVE_NAMES], axis=-1)
+            values = np.maximum(0.0, values - scores["penalty"][:, None])
+            return [tuple(row) for row in values.tolist()]
+
+        return [(fitness,) for fitness in weighted_fitness(scores, self.objectives).tolist()]
 
     def _create_layout(self, arrangement: List[int]) -> ClassroomLayout:
         """Create classroom layout from arrangement"""
@@ -118,215 +277,515 @@ class ClassroomOptimizer:
         Evaluate fitness of a seating arrangement
         Returns a tuple (score,) for DEAP
         """
-        layout = self._create_layout(individual)
-
-        # Calculate individual objective scores
-        academic_score = self._calculate_academic_balance(layout)
-        behavioral_score = self._calculate_behavioral_balance(layout)
-        diversity_score = self._calculate_diversity(layout)
-        special_needs_score = self._calculate_special_needs_compliance(layout)
-
-        # Weighted combination
-        total_score = (
-            self.objectives.academic_balance * academic_score +
-            self.objectives.behavioral_balance * behavioral_score +
-            self.objectives.diversity * diversity_score +
-            self.objectives.special_needs * special_needs_score
-        )
+        self.evaluation_count += 1
+        state = self.problem.score(self.problem.seats_from_order(individual))
 
-        # Apply penalties for constraint violations
-        penalty = self._calculate_constraint_penalties(layout)
-        total_score = max(0.0, total_score - penalty)
-
-        return (total_score,)
-
-    def _calculate_academic_balance(self, layout: ClassroomLayout) -> float:
-        """Calculate how well academic abilities are balanced"""
-        scores = []
-
-        # Check balance within rows
-        for row_num in range(self.rows):
-            row_seats = [s for s in layout.seats if s.position.row == row_num and not s.is_empty]
-            if row_seats:
-                academic_scores = [
-                    self.student_map[s.student_id].academic_score
-                    for s in row_seats
-                ]
-                # Lower variance = better balance
-                variance = np.var(academic_scores) if len(academic_scores) > 1 else 0
-                row_score = 1.0 / (1.0 + variance / 100.0)  # Normalize
-                scores.append(row_score)
-
-        return np.mean(scores) if scores else 0.5
-
-    def _calculate_behavioral_balance(self, layout: ClassroomLayout) -> float:
-        """Calculate behavioral balance and compatibility"""
-        scores = []
-
-        for row_num in range(self.rows):
-            row_seats = [s for s in layout.seats if s.position.row == row_num and not s.is_empty]
-
-            # Check adjacent students
-            for i in range(len(row_seats) - 1):
-                student1 = self.student_map[row_seats[i].student_id]
-                student2 = self.student_map[row_seats[i + 1].student_id]
-
-                # Check if they're incompatible
-                if student2.id in student1.incompatible_ids:
-                    scores.append(0.0)  # Bad pairing
-                elif student2.id in student1.friends_ids:
-                    scores.append(0.7)  # Friends - good but not perfect (might distract)
-                else:
-                    # Balance behavior scores
-                    avg_behavior = (student1.behavior_score + student2.behavior_score) / 2
-                    scores.append(avg_behavior / 100.0)
+        # Weighted combination, with penalties for constraint violations
+        total_score = self.objectives.score(state.objective_scores, penalty=state.penalty)
 
-        return np.mean(scores) if scores else 0.5
+        return self._with_repeat_penalty(np.asarray(individual)[None, :], [(total_score,)])[0]
 
-    def _calculate_diversity(self, layout: ClassroomLayout) -> float:
-        """Calculate diversity (gender, language, culture)"""
-        scores = []
+    def _evaluate_objectives(self, individual: List[int]) -> Tuple[float, ...]:
+        """
+        Evaluate each objective of a seating arrangement separately
+        Returns a tuple in OBJECTIVE_NAMES order for NSGA-II
 
-        for row_num in range(self.rows):
-            row_seats = [s for s in layout.seats if s.position.row == row_num and not s.is_empty]
-            if len(row_seats) < 2:
-                continue
+        The constraint penalty is subtracted from every objective so that
+        arrangements violating constraints are dominated by those that don't.
+        """
+        self.evaluation_count += 1
+        state = self.problem.score(self.problem.seats_from_order(individual))
+
+        return tuple(max(0.0, state.objective_scores[name] - state.penalty) for name in OBJECTIVE_NAMES)
 
-            # Gender diversity
-            genders = [self.student_map[s.student_id].gender for s in row_seats]
-            unique_genders = len(set(genders))
-            gender_diversity = min(unique_genders / 2.0, 1.0)
+    def optimize(
+        self,
+        max_generations: int = None,
+        adaptive: bool = False,
+        workers: int = None,
+        cancel_token: Optional[CancellationToken] = None,
+        on_generation: Optional[Callable[[int, List[List[int]]], None]] = None,
+        seed_arrangements: Optional[List[List[str]]] = None,
+        initial_population: Optional[List[List[int]]] = None,
+        target_gap: Optional[float] = None
+    ) -> SeatingArrangement:
+        """
+        Run genetic algorithm optimization
+        Returns the best seating arrangement found
+
+        Args:
+            max_generations: Number of generations (defaults to params.generations)
+            adaptive: Adapt operator rates and choice during the run
+                (weighted mode only)
+            workers: Fitness evaluation processes (defaults to GA_WORKERS);
+                more than 1 evaluates populations in parallel on a
+                shared-memory copy of the compiled problem (see
+                parallel_workers for how many are actually used)
+            cancel_token: Checked between generations; once cancelled the
+                run stops and returns the best arrangement found so far
+            on_generation: Called as on_generation(generation, population)
+                after every completed generation
+            seed_arrangements: Known good arrangements (student ids in seat
+                order) placed in the initial population, up to
+                ELITE_SEED_FRACTION of it
+            initial_population: Student index orders (e.g. an earlier run's
+                final population) that start the run in place of random
+                individuals; seed arrangements still go first
+            target_gap: Stop once the best fitness is within this share of
+                upper_bound (weighted mode only)
+
+        The estimated and measured peak memory of the run are reported in
+        diagnostics["memory"]; the upper bound and optimality gap in
+        upper_bound, optimality_gap and diagnostics["bounds"].
+        """
+        self._cancel_token = cancel_token
+        self._on_generation = on_generation
+        self._seed_arrangements = seed_arrangements or []
+        self._initial_population = initial_population or []
+        self._target_gap = target_gap if self.mode == OptimizationMode.WEIGHTED else None
+        self._stop_fitness = (1.0 - target_gap) * self.upper_bound if self._target_gap is not None else None
+
+        workers = self.parallel_workers(workers or settings.GA_WORKERS)
+        with MemoryProbe() as memory:
+            if workers <= 1:
+                result = self._optimize(max_generations, adaptive)
+            else:
+                from app.services.shared_problem import ParallelEvaluator
+
+                with ParallelEvaluator(self.problem, workers, self.params.population_size) as evaluator:
+                    self._score_batch = evaluator.score_batch
+                    try:
+                        result = self._optimize(max_generations, adaptive)
+                    finally:
+                        self._score_batch = self.problem.score_batch
+
+        result.diagnostics["memory"] = {
+            "estimated_mb": round(self.estimate_memory(workers) / MB, 2),
+            **memory.summary(),
+        }
+        return result
+
+    def parallel_workers(self, workers: int) -> int:
+        """
+        Evaluation processes a run with `workers` actually uses: 1 when its
+        population is too small for any batch to be split across processes
+        """
+        from app.services.shared_problem import parallel_workers
 
-            # Language diversity
-            languages = [
-                self.student_map[s.student_id].primary_language
-                for s in row_seats
-                if self.student_map[s.student_id].primary_language
-            ]
-            lang_diversity = len(set(languages)) / max(len(languages), 1) if languages else 0.5
+        return parallel_workers(self.params.population_size, workers)
 
-            row_diversity = (gender_diversity + lang_diversity) / 2
-            scores.append(row_diversity)
+    def estimate_memory(self, workers: int = 1) -> int:
+        """Estimated peak memory of a run in bytes (see app.services.memory)"""
+        return estimate_run_bytes(
+            len(self.students), self.total_seats, self.params.population_size, self.mode,
+            self.parallel_workers(workers)
+        )
 
-        return np.mean(scores) if scores else 0.5
+    def _optimize(self, max_generations: int, adaptive: bool) -> SeatingArrangement:
+        """Run the genetic algorithm (see optimize)"""
+        start_time = time.time()
 
-    def _calculate_special_needs_compliance(self, layout: ClassroomLayout) -> float:
-        """Check if special needs are accommodated"""
-        compliance_scores = []
+        # Get parameters
+        pop_size = self.params.population_size
+        n_gen = max_generations or self.params.generations
+        cx_prob = self.params.crossover_rate
+        mut_prob = self.params.mutation_rate
 
-        for student in self.students:
-            if not student.special_needs and not student.requires_front_row:
-                continue  # No special needs
+        # The cache outlives a run: scores depend only on the compiled problem
+        self._fitness_cache_size = FITNESS_CACHE_FACTOR * pop_size
+        self.evaluations_skipped = 0
+        self.duplicates_replaced = 0
 
-            # Find student's seat
-            student_seat = next(
-                (s for s in layout.seats if s.student_id == student.id),
-                None
+        # Create initial population
+        with span("ga.init_population", size=pop_size):
+            population = self.toolbox.population(n=pop_size)
+            for individual, order in zip(population, self._initial_population):
+                individual[:] = order
+            seeded = self._seed_population(population)
+        diagnostics = {"seeded": seeded} if seeded else {}
+        warnings = []
+        evolve_span = span("ga.evolve", max_generations=n_gen)
+
+        if self.mode == OptimizationMode.PARETO:
+            # NSGA-II: (mu + lambda) evolution with non-dominated sorting selection
+            with evolve_span:
+                population, generations = self._evolve_mu_plus_lambda(population, n_gen, cx_prob, mut_prob)
+            with span("ga.pareto_front"):
+                pareto_front = self._extract_pareto_front(population)
+            best_solution = pareto_front[0]
+            best_individual = best_solution[0]
+            best_fitness = best_solution[1].fitness_score
+        elif adaptive:
+            controller = AdaptiveController(
+                crossover_rate=cx_prob,
+                mutation_rate=mut_prob,
+                indpb=self.params.mutation_indpb,
+                num_genes=len(self.students),
+                rng=self.rng
+            )
+            with evolve_span:
+                population, generations = self._evolve_adaptive(population, n_gen, controller)
+            diagnostics["adaptive"] = controller.summary()
+
+            pareto_front = None
+            best_individual = tools.selBest(population, k=1)[0]
+            best_fitness = best_individual.fitness.values[0]
+        else:
+            with evolve_span:
+                population, generations = self._evolve_simple(population, n_gen, cx_prob, mut_prob)
+
+            # Get best individual
+            pareto_front = None
+            best_individual = tools.selBest(population, k=1)[0]
+            best_fitness = best_individual.fitness.values[0]
+
+        self.population = population
+        evolve_span.set("generations", generations)
+        evolve_span.set("evaluations", self.evaluation_count)
+
+        if self._cancelled():
+            diagnostics["cancelled"] = self._cancel_token.reason
+            warnings.append(
+                f"Optimization cancelled after {generations} of {n_gen} generations "
+                f"({self._cancel_token.reason}); this is the best arrangement found so far"
             )
 
-            if not student_seat:
-                compliance_scores.append(0.0)
+        with span("ga.build_result"):
+            # Create final layout
+            final_layout = self._create_layout(best_individual)
+
+            # Calculate individual objective scores for the best solution
+            objective_scores = self.problem.score(self.problem.seats_from_order(best_individual)).objective_scores
+
+            # Create student-to-seat mapping
+            student_seats = self._student_seats(final_layout)
+
+        computation_time = time.time() - start_time
+        diagnostics["evaluations"] = self.evaluation_count
+        diagnostics["seed"] = self.seed
+        diagnostics["parameters"] = {**self.params.summary(), "generations": n_gen}
+        if self._deduplicate:
+            diagnostics["deduplication"] = {
+                "evaluations_skipped": self.evaluations_skipped,
+                "duplicates_replaced": self.duplicates_replaced,
+                "row_classes": len(self.hasher.row_classes),
+                "row_reversal": self.hasher.row_reversal,
+            }
+        diagnostics["bounds"] = {
+            "objectives": self.objective_bounds,
+            "target_gap": self._target_gap,
+            "target_reached": self._target_reached(population),
+        }
+
+        return SeatingArrangement(
+            layout=final_layout,
+            student_seats=student_seats,
+            fitness_score=best_fitness,
+            objective_scores=objective_scores,
+            generation_count=generations,
+            computation_time=computation_time,
+            warnings=warnings,
+            diagnostics=diagnostics,
+            upper_bound=self.upper_bound,
+            optimality_gap=optimality_gap(best_fitness, self.upper_bound),
+            pareto_front=[solution for _, solution in pareto_front] if pareto_front is not None else None
+        )
+
+    def _seed_population(self, population: List[List[int]]) -> int:
+        """Overwrite the head of a fresh population with seed arrangements"""
+        limit = int(len(population) * settings.ELITE_SEED_FRACTION)
+        roster = set(self.student_ids)
+        seeded = 0
+        for order in self._seed_arrangements:
+            if seeded >= limit:
+                break
+            if len(order) != len(self.student_ids) or set(order) != roster:
                 continue
+            population[seeded][:] = [self.problem.index[student_id] for student_id in order]
+            seeded += 1
+        return seeded
+
+    def elite_arrangements(self) -> List[EliteEntry]:
+        """Distinct arrangements of the last run's final population with raw scores"""
+        orders = [tuple(individual) for individual in self._distinct(self.population)]
+        if not orders:
+            return []
+
+        seats = np.full((len(orders), self.total_seats), -1, dtype=np.int64)
+        seats[:, :len(self.students)] = np.asarray(orders)
+        scores = self.problem.score_batch(seats)
+
+        return [
+            EliteEntry(
+                order=tuple(self.student_ids[i] for i in order),
+                objective_scores={name: float(scores[name][k]) for name in OBJECTIVE_NAMES},
+                penalty=float(scores["penalty"][k])
+            )
+            for k, order in enumerate(orders)
+        ]
+
+    def _distinct(self, individuals: List[List[int]]) -> List[List[int]]:
+        """First of each distinct arrangement (symmetry class when deduplicating), in order"""
+        if not individuals:
+            return []
+        if self._deduplicate:
+            keys = self.hasher.hash_batch(np.asarray(individuals)).tolist()
+        else:
+            keys = [tuple(individual) for individual in individuals]
+        unique = {}
+        for key, individual in zip(keys, individuals):
+            unique.setdefault(key, individual)
+        return list(unique.values())
+
+    def _replace_duplicates(
+        self,
+        offspring: List[List[int]],
+        others: List[List[int]] = (),
+        keep_copies: bool = False
+    ) -> List[int]:
+        """
+        Replace offspring equivalent to an earlier offspring or to one of
+        `others` with a new arrangement, in place
 
-            score = 1.0
+        Duplicates carry no new information and crowd out diversity. Each is
+        replaced by a mutant of itself, or a random individual if mutations
+        keep landing on known arrangements.
 
-            # Check front row requirement
-            if student.requires_front_row and not student_seat.position.is_front_row:
-                score -= 0.5
+        With keep_copies, only varied (unevaluated) offspring are replaced:
+        generational loops without elitism rely on selection's copies of
+        good parents to keep them.
 
-            # Check quiet area requirement
-            if student.requires_quiet_area:
-                # Students in back or corners are quieter
-                if student_seat.position.row < self.rows // 2:
-                    score -= 0.3
+        Returns:
+            Indices of the replaced offspring
+        """
+        if not self._deduplicate or not offspring:
+            return []
+
+        seen = set(self.hasher.hash_batch(np.asarray(others)).tolist()) if len(others) else set()
+        duplicates = []
+        for i, key in enumerate(self.hasher.hash_batch(np.asarray(offspring)).tolist()):
+            if key in seen and not (keep_copies and offspring[i].fitness.valid):
+                duplicates.append(i)
+            seen.add(key)
+
+        # Mutate all remaining duplicates per attempt and hash them together
+        pending = duplicates
+        for attempt in range(DUPLICATE_MUTATION_ATTEMPTS + 1):
+            if not pending:
+                break
+            variants = []
+            for i in pending:
+                if attempt < DUPLICATE_MUTATION_ATTEMPTS:
+                    # A fresh instance: copies the genes, not the fitness
+                    variant, = self.toolbox.mutate(type(offspring[i])(offspring[i]))
+                else:
+                    variant = self.toolbox.individual()
+                variants.append(variant)
 
-            compliance_scores.append(max(0.0, score))
+            retry = []
+            for i, variant, key in zip(pending, variants, self.hasher.hash_batch(np.asarray(variants)).tolist()):
+                if key in seen and attempt < DUPLICATE_MUTATION_ATTEMPTS:
+                    retry.append(i)
+                else:
+                    offspring[i] = variant
+                    seen.add(key)
+            pending = retry
 
-        return np.mean(compliance_scores) if compliance_scores else 1.0
+        self.duplicates_replaced += len(duplicates)
+        return duplicates
 
-    def _calculate_constraint_penalties(self, layout: ClassroomLayout) -> float:
-        """Calculate penalty for violating constraints"""
-        penalty = 0.0
+    def _cancelled(self) -> bool:
+        """Whether the caller has cancelled the current run"""
+        return self._cancel_token is not None and self._cancel_token.cancelled
 
-        # Check separation constraints
-        for pair in self.constraints.separate_student_pairs:
-            if len(pair) != 2:
-                continue
-            student1_seat = next((s for s in layout.seats if s.student_id == pair[0]), None)
-            student2_seat = next((s for s in layout.seats if s.student_id == pair[1]), None)
+    def _target_reached(self, population: List[List[int]]) -> bool:
+        """Whether the best individual is within the requested gap of the upper bound"""
+        return self._stop_fitness is not None and max(ind.fitness.values[0] for ind in population) >= self._stop_fitness
 
-            if student1_seat and student2_seat:
-                # Check if they're adjacent (same row, adjacent columns)
-                if (student1_seat.position.row == student2_seat.position.row and
-                    abs(student1_seat.position.col - student2_seat.position.col) == 1):
-                    penalty += 0.3  # Heavy penalty for sitting next to each other
+    def _generation_done(self, generation: int, population: List[List[int]]):
+        """Report a completed generation to the on_generation callback"""
+        if self._on_generation is not None:
+            self._on_generation(generation, population)
 
-        return penalty
+    def _evaluate_invalid(self, individuals: List[List[int]]):
+        """Evaluate the individuals whose fitness is not yet known"""
+        invalid = [ind for ind in individuals if not ind.fitness.valid]
+        for individual, fitness in zip(invalid, self.toolbox.map(self.toolbox.evaluate, invalid)):
+            individual.fitness.values = fitness
 
-    def optimize(self, max_generations: int = None) -> SeatingArrangement:
+    def _evolve_simple(
+        self,
+        population: List[List[int]],
+        n_gen: int,
+        cx_prob: float,
+        mut_prob: float
+    ) -> Tuple[List[List[int]], int]:
         """
-        Run genetic algorithm optimization
-        Returns the best seating arrangement found
+        Generational loop equivalent to DEAP's eaSimple, stopping early
+        when cancelled or within the target gap (and, with GA_DEDUPLICATE,
+        replacing varied offspring that duplicate another)
+
+        Returns:
+            Tuple of (final population, generations completed)
         """
-        start_time = time.time()
+        with span("ga.evaluate_initial"):
+            self._evaluate_invalid(population)
 
-        # Get settings
-        pop_size = settings.GA_POPULATION_SIZE
-        n_gen = max_generations or settings.GA_GENERATIONS
-        cx_prob = settings.GA_CROSSOVER_RATE
-        mut_prob = settings.GA_MUTATION_RATE
+        generation = 0
+        while generation < n_gen and not self._cancelled() and not self._target_reached(population):
+            offspring = self.toolbox.select(population, len(population))
+            offspring = var_and(offspring, self.toolbox, cx_prob, mut_prob, self.rng)
+            self._replace_duplicates(offspring, keep_copies=True)
+            self._evaluate_invalid(offspring)
+            population[:] = offspring
 
-        # Create initial population
-        population = self.toolbox.population(n=pop_size)
-
-        # Statistics
-        stats = tools.Statistics(lambda ind: ind.fitness.values)
-        stats.register("avg", np.mean)
-        stats.register("max", np.max)
-
-        # Run evolution
-        population, logbook = algorithms.eaSimple(
-            population,
-            self.toolbox,
-            cxpb=cx_prob,
-            mutpb=mut_prob,
-            ngen=n_gen,
-            stats=stats,
-            verbose=False
-        )
+            generation += 1
+            self._generation_done(generation, population)
 
-        # Get best individual
-        best_individual = tools.selBest(population, k=1)[0]
-        best_fitness = best_individual.fitness.values[0]
+        return population, generation
 
-        # Create final layout
-        final_layout = self._create_layout(best_individual)
+    def _evolve_mu_plus_lambda(
+        self,
+        population: List[List[int]],
+        n_gen: int,
+        cx_prob: float,
+        mut_prob: float
+    ) -> Tuple[List[List[int]], int]:
+        """
+        (mu + lambda) loop equivalent to DEAP's eaMuPlusLambda with
+        mu = lambda = population size, stopping early when cancelled (and,
+        with GA_DEDUPLICATE, replacing offspring that duplicate a parent or
+        each other)
 
-        # Calculate individual objective scores for the best solution
-        academic_score = self._calculate_academic_balance(final_layout)
-        behavioral_score = self._calculate_behavioral_balance(final_layout)
-        diversity_score = self._calculate_diversity(final_layout)
-        special_needs_score = self._calculate_special_needs_compliance(final_layout)
+        Returns:
+            Tuple of (final population, generations completed)
+        """
+        with span("ga.evaluate_initial"):
+            self._evaluate_invalid(population)
+        mu = len(population)
 
-        # Create student-to-seat mapping
-        student_seats = {}
-        for seat in final_layout.seats:
-            if not seat.is_empty:
-                student_seats[seat.student_id] = seat.position
+        generation = 0
+        while generation < n_gen and not self._cancelled():
+            offspring = var_or(population, self.toolbox, mu, cx_prob, mut_prob, self.rng)
+            self._replace_duplicates(offspring, population)
+            self._evaluate_invalid(offspring)
+            population[:] = self.toolbox.select(population + offspring, mu)
 
-        computation_time = time.time() - start_time
+            generation += 1
+            self._generation_done(generation, population)
 
-        return SeatingArrangement(
-            layout=final_layout,
-            student_seats=student_seats,
-            fitness_score=best_fitness,
-            objective_scores={
-                "academic_balance": academic_score,
-                "behavioral_balance": behavioral_score,
-                "diversity": diversity_score,
-                "special_needs": special_needs_score
-            },
-            generation_count=n_gen,
-            computation_time=computation_time,
-            warnings=[]
-        )
+        return population, generation
+
+    def _evolve_adaptive(
+        self,
+        population: List[List[int]],
+        n_gen: int,
+        controller: AdaptiveController
+    ) -> Tuple[List[List[int]], int]:
+        """
+        Generational loop with self-adaptive operator control
+
+        Mirrors eaSimple (tournament selection, crossover, mutation) but asks
+        the controller which operator to apply and with which probability,
+        credits each operator with whether its child beat the parent, and
+        keeps the best individual (elitism) so adaptation can't lose it.
+
+        Returns:
+            Tuple of (final population, generations completed)
+        """
+        with span("ga.evaluate_initial"):
+            self._evaluate_invalid(population)
+
+        best = tools.selBest(population, k=1)[0]
+
+        generation = 0
+        while generation < n_gen and not self._cancelled() and not self._target_reached(population):
+            offspring = [self.toolbox.clone(ind) for ind in self.toolbox.select(population, len(population))]
+
+            # Per child: parent reference fitness and the operators applied to it
+            parent_fitness = [ind.fitness.values[0] for ind in offspring]
+            applied = [[] for _ in offspring]
+
+            for i in range(1, len(offspring), 2):
+                if self.rng.random() < controller.crossover_rate:
+                    name, operator = controller.choose("crossover")
+                    reference = max(parent_fitness[i - 1], parent_fitness[i])
+                    operator(offspring[i - 1], offspring[i], self.rng)
+                    for j in (i - 1, i):
+                        parent_fitness[j] = reference
+                        applied[j].append(("crossover", name))
+                        del offspring[j].fitness.values
+
+            for i, child in enumerate(offspring):
+                if self.rng.random() < controller.mutation_rate:
+                    name, operator = controller.choose("mutation")
+                    operator(child, controller.indpb, self.rng)
+                    applied[i].append(("mutation", name))
+                    del child.fitness.values
+
+            # Replacements are no operator's doing: don't credit them
+            for i in self._replace_duplicates(offspring):
+                applied[i] = []
+
+            invalid = [i for i, child in enumerate(offspring) if not child.fitness.valid]
+            fitnesses = self.toolbox.map(self.toolbox.evaluate, [offspring[i] for i in invalid])
+            for i, fitness in zip(invalid, fitnesses):
+                offspring[i].fitness.values = fitness
+                success = fitness[0] > parent_fitness[i]
+                for kind, name in applied[i]:
+                    controller.record(kind, name, success)
+
+            # Elitism: carry over the best individual found so far
+            worst = min(range(len(offspring)), key=lambda k: offspring[k].fitness.values[0])
+            if offspring[worst].fitness.values[0] < best.fitness.values[0]:
+                offspring[worst] = self.toolbox.clone(best)
+
+            population[:] = offspring
+
+            generation_best = tools.selBest(population, k=1)[0]
+            improved = generation_best.fitness.values[0] > best.fitness.values[0]
+            if improved:
+                best = self.toolbox.clone(generation_best)
+
+            controller.update(population_diversity(population), improved)
+
+            generation += 1
+            self._generation_done(generation, population)
+
+        return population, generation
+
+    def _student_seats(self, layout: ClassroomLayout) -> Dict[str, SeatPosition]:
+        """Create student-to-seat mapping from a layout"""
+        return {
+            seat.student_id: seat.position
+            for seat in layout.seats
+            if not seat.is_empty
+        }
+
+    def _extract_pareto_front(self, population: List[List[int]]) -> List[Tuple[List[int], ParetoSolution]]:
+        """
+        Extract the distinct non-dominated arrangements from a population
+
+        The front is capped at PARETO_MAX_FRONT_SIZE (thinned by NSGA-II crowding
+        distance) and sorted by fitness under the request objectives, best first.
+        """
+        first_front = tools.sortNondominated(population, len(population), first_front_only=True)[0]
+
+        # Drop duplicate arrangements
+        front = self._distinct(first_front)
+
+        if len(front) > settings.PARETO_MAX_FRONT_SIZE:
+            front = tools.selNSGA2(front, settings.PARETO_MAX_FRONT_SIZE)
+
+        solutions = []
+        for individual in front:
+            state = self.problem.score(self.problem.seats_from_order(individual))
+            solutions.append((individual, ParetoSolution(
+                student_seats=self._student_seats(self._create_layout(individual)),
+                objective_scores=state.objective_scores,
+                constraint_penalty=state.penalty,
+                fitness_score=self.objectives.score(state.objective_scores, penalty=state.penalty)
+            )))
+
+        solutions.sort(key=lambda item: item[1].fitness_score, reverse=True)
+        return solutions
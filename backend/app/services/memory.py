@@ -0,0 +1,207 @@
+"""
+Memory Accounting
+Pre-run memory estimates and per-run peak measurement
+"""
+
+import threading
+import tracemalloc
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.models.classroom import OptimizationMode
+
+try:
+    import resource
+    _PAGE_SIZE = resource.getpagesize()
+except ImportError:  # Windows
+    _PAGE_SIZE = 4096
+
+MB = 1024 * 1024
+
+# Cost model, calibrated with tracemalloc on ClassroomOptimizer runs
+# (20-400 students, population 50-200, all modes)
+BASE_BYTES = 256 * 1024
+PAIR_BYTES = 10  # Per student pair: compiled pair-score matrices
+INDIVIDUAL_SEAT_BYTES = 100  # Per seat per individual: populations, clones, scoring batches
+FRONT_STUDENT_BYTES = 450  # Per student per Pareto solution: seat maps of the returned front
+WORKER_PROCESS_BYTES = 64 * MB  # Interpreter with NumPy/DEAP loaded, per worker process
+
+
+def estimate_run_bytes(
+    num_students: int,
+    total_seats: int,
+    population_size: int,
+    mode: OptimizationMode = OptimizationMode.WEIGHTED,
+    workers: int = 1
+) -> int:
+    """
+    Estimated peak memory of one classroom optimization
+
+    Args:
+        num_students: Students in the roster
+        total_seats: rows x cols
+        population_size: GA population size
+        mode: Pareto runs also build a front of up to PARETO_MAX_FRONT_SIZE solutions
+        workers: Fitness evaluation processes (each extra one is a new interpreter)
+
+    Returns:
+        Estimated bytes
+    """
+    estimate = BASE_BYTES + PAIR_BYTES * num_students ** 2 + INDIVIDUAL_SEAT_BYTES * total_seats * population_size
+    if mode == OptimizationMode.PARETO:
+        estimate += FRONT_STUDENT_BYTES * num_students * settings.PARETO_MAX_FRONT_SIZE
+    if workers > 1:
+        estimate += WORKER_PROCESS_BYTES * workers
+    return estimate
+
+
+def estimate_school_bytes(
+    num_students: int,
+    num_classrooms: int,
+    total_seats: int,
+    population_size: int,
+    workers: int
+) -> int:
+    """
+    Estimated peak memory of a school-wide optimization
+
+    Classrooms are seated `workers` at a time, each in its own process
+    when workers > 1.
+    """
+    class_size = min(total_seats, -(-num_students // num_classrooms))
+    per_classroom = estimate_run_bytes(class_size, total_seats, population_size)
+    parallel = max(1, min(workers, num_classrooms))
+    estimate = BASE_BYTES + PAIR_BYTES * num_students ** 2 + per_classroom * parallel
+    if parallel > 1:
+        estimate += WORKER_PROCESS_BYTES * parallel
+    return estimate
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_probe_lock = threading.Lock()
+_active_probes: set = set()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+class MemoryProbe:
+    """
+    Measures the peak memory of one run (MEMORY_PROFILER)
+
+    - "rss": samples the process RSS every MEMORY_SAMPLE_INTERVAL on a
+      background thread; cheap, and what an OOM killer sees, but freed
+      memory the allocator keeps can hide a run's growth.
+    - "tracemalloc": exact Python and NumPy allocations, but every
+      allocation in the process is several times slower while any
+      probe is active; meant for profiling, not production.
+
+    Both are process-wide: when runs overlap, `shared` is set and the peak
+    includes the other runs' memory. Worker processes are not included.
+
+    Usage:
+        with MemoryProbe() as probe:
+            ...
+        diagnostics["memory"] = probe.summary()
+    """
+
+    def __init__(self, method: str = None, interval: float = None):
+        self.method = method or settings.MEMORY_PROFILER
+        self.interval = interval or settings.MEMORY_SAMPLE_INTERVAL
+        self.shared = False
+        self._start = 0
+        self._peak = 0
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+        if self.method == "rss" and _current_rss() is None:
+            self.method = "off"
+
+    def __enter__(self) -> "MemoryProbe":
+        if self.method == "off":
+            return self
+
+        with _probe_lock:
+            if _active_probes:
+                self.shared = True
+                for probe in _active_probes:
+                    probe.shared = True
+            _active_probes.add(self)
+
+            if self.method == "tracemalloc":
+                self._start_tracemalloc()
+
+        if self.method == "rss":
+            self._start = self._peak = _current_rss()
+            self._sampler = threading.Thread(target=self._sample_rss, name="memory-probe", daemon=True)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.method == "off":
+            return
+
+        if self.method == "rss":
+            self._stop.set()
+            self._sampler.join()
+            self._peak = max(self._peak, _current_rss())
+
+        with _probe_lock:
+            if self.method == "tracemalloc":
+                self._peak = tracemalloc.get_traced_memory()[1]
+                self._stop_tracemalloc()
+            _active_probes.discard(self)
+
+    def _start_tracemalloc(self):
+        global _tracemalloc_users, _tracemalloc_owned
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+        if len(_active_probes) == 1:
+            # Only reset the peak when no other run is measuring it
+            tracemalloc.reset_peak()
+        self._start = tracemalloc.get_traced_memory()[0]
+
+    def _stop_tracemalloc(self):
+        global _tracemalloc_users, _tracemalloc_owned
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+    def _sample_rss(self):
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, _current_rss())
+
+    def summary(self) -> Dict:
+        """Measurement for response diagnostics"""
+        if self.method == "off":
+            return {"method": "off"}
+
+        summary = {
+            "method": self.method,
+            "peak_mb": round(max(0, self._peak - self._start) / MB, 2),
+            "shared": self.shared,
+        }
+        if self.method == "rss":
+            summary["rss_peak_mb"] = round(self._peak / MB, 2)
+        return summary
+
+
+class MemoryBudgetExceeded(Exception):
+    """A run's estimated memory exceeds the whole memory budget"""
+
+    def __init__(self, estimate: int, budget: int):
+        super().__init__(
+            f"Estimated memory {estimate / MB:.1f} MB exceeds the {budget / MB:.1f} MB budget"
+        )
+        self.estimate = estimate
+        self.budget = budget
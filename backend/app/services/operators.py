@@ -0,0 +1,171 @@
+"""
+Genetic Operators with Explicit Random Generators
+Permutation operators, selection and variation taking a per-run `random.Random`
+"""
+
+import random
+from operator import attrgetter
+from typing import List, Sequence, Tuple
+
+from deap import base
+
+from app.services.problem import OBJECTIVE_NAMES
+
+# Ports of DEAP's cxOrdered, cxPartialyMatched, mutShuffleIndexes,
+# selTournament, varAnd and varOr. DEAP's versions draw from the global
+# `random` module, which concurrent runs would share; these draw the same
+# numbers in the same order from the generator they are given, so a run
+# seeded with Random(s) matches a DEAP run after random.seed(s).
+
+
+class FitnessMax(base.Fitness):
+    """Single weighted fitness (maximize)"""
+    weights = (1.0,)
+
+
+class FitnessMulti(base.Fitness):
+    """One fitness per objective, all maximized (pareto mode)"""
+    weights = (1.0,) * len(OBJECTIVE_NAMES)
+
+
+class Individual(list):
+    """Permutation of student indices with a weighted fitness"""
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.fitness = FitnessMax()
+
+
+class IndividualMulti(list):
+    """Permutation of student indices with per-objective fitness"""
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.fitness = FitnessMulti()
+
+
+def cx_ordered(ind1: List[int], ind2: List[int], rng: random.Random) -> Tuple[List[int], List[int]]:
+    """Ordered crossover (OX) of two permutations, in place"""
+    size = min(len(ind1), len(ind2))
+    a, b = rng.sample(range(size), 2)
+    if a > b:
+        a, b = b, a
+
+    holes1, holes2 = [True] * size, [True] * size
+    for i in range(size):
+        if i < a or i > b:
+            holes1[ind2[i]] = False
+            holes2[ind1[i]] = False
+
+    # Compact the values outside the holes, starting after the segment
+    temp1, temp2 = ind1, ind2
+    k1, k2 = b + 1, b + 1
+    for i in range(size):
+        if not holes1[temp1[(i + b + 1) % size]]:
+            ind1[k1 % size] = temp1[(i + b + 1) % size]
+            k1 += 1
+
+        if not holes2[temp2[(i + b + 1) % size]]:
+            ind2[k2 % size] = temp2[(i + b + 1) % size]
+            k2 += 1
+
+    # Swap the segment [a, b]
+    for i in range(a, b + 1):
+        ind1[i], ind2[i] = ind2[i], ind1[i]
+
+    return ind1, ind2
+
+
+def cx_partially_matched(ind1: List[int], ind2: List[int], rng: random.Random) -> Tuple[List[int], List[int]]:
+    """Partially matched crossover (PMX) of two permutations, in place"""
+    size = min(len(ind1), len(ind2))
+    p1, p2 = [0] * size, [0] * size
+
+    # Position of each value in each parent
+    for i in range(size):
+        p1[ind1[i]] = i
+        p2[ind2[i]] = i
+
+    cxpoint1 = rng.randint(0, size)
+    cxpoint2 = rng.randint(0, size - 1)
+    if cxpoint2 >= cxpoint1:
+        cxpoint2 += 1
+    else:
+        cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+
+    for i in range(cxpoint1, cxpoint2):
+        temp1 = ind1[i]
+        temp2 = ind2[i]
+        ind1[i], ind1[p1[temp2]] = temp2, temp1
+        ind2[i], ind2[p2[temp1]] = temp1, temp2
+        p1[temp1], p1[temp2] = p1[temp2], p1[temp1]
+        p2[temp1], p2[temp2] = p2[temp2], p2[temp1]
+
+    return ind1, ind2
+
+
+def mut_shuffle_indexes(individual: List[int], indpb: float, rng: random.Random) -> Tuple[List[int]]:
+    """Swap each position with a random other position with probability indpb"""
+    size = len(individual)
+    for i in range(size):
+        if rng.random() < indpb:
+            swap_index = rng.randint(0, size - 2)
+            if swap_index >= i:
+                swap_index += 1
+            individual[i], individual[swap_index] = individual[swap_index], individual[i]
+
+    return (individual,)
+
+
+def sel_tournament(individuals: Sequence, k: int, tournsize: int, rng: random.Random) -> List:
+    """Select k individuals, each the fittest of tournsize drawn with replacement"""
+    chosen = []
+    for _ in range(k):
+        aspirants = [rng.choice(individuals) for _ in range(tournsize)]
+        chosen.append(max(aspirants, key=attrgetter("fitness")))
+    return chosen
+
+
+def var_and(population: Sequence, toolbox: base.Toolbox, cxpb: float, mutpb: float, rng: random.Random) -> List:
+    """Clone the population, mate consecutive pairs with cxpb, then mutate each with mutpb"""
+    offspring = [toolbox.clone(ind) for ind in population]
+
+    for i in range(1, len(offspring), 2):
+        if rng.random() < cxpb:
+            offspring[i - 1], offspring[i] = toolbox.mate(offspring[i - 1], offspring[i])
+            del offspring[i - 1].fitness.values, offspring[i].fitness.values
+
+    for i in range(len(offspring)):
+        if rng.random() < mutpb:
+            offspring[i], = toolbox.mutate(offspring[i])
+            del offspring[i].fitness.values
+
+    return offspring
+
+
+def var_or(
+    population: Sequence,
+    toolbox: base.Toolbox,
+    lambda_: int,
+    cxpb: float,
+    mutpb: float,
+    rng: random.Random
+) -> List:
+    """Produce lambda_ children, each by crossover, mutation or reproduction"""
+    offspring = []
+    for _ in range(lambda_):
+        op_choice = rng.random()
+        if op_choice < cxpb:
+            ind1, ind2 = [toolbox.clone(ind) for ind in rng.sample(population, 2)]
+            ind1, ind2 = toolbox.mate(ind1, ind2)
+            del ind1.fitness.values
+            offspring.append(ind1)
+        elif op_choice < cxpb + mutpb:
+            ind = toolbox.clone(rng.choice(population))
+            ind, = toolbox.mutate(ind)
+            del ind.fitness.values
+            offspring.append(ind)
+        else:
+            offspring.append(rng.choice(population))
+
+    return offspring
@@ -0,0 +1,326 @@
+"""
+Compiled Seating Problem
+Roster, layout and constraints compiled to NumPy arrays for fast scoring
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.models.student import Student, GenderType
+from app.models.classroom import SeatingConstraints
+
+# Objective order used for fitness tuples and score matrices
+OBJECTIVE_NAMES = ("academic_balance", "behavioral_balance", "diversity", "special_needs")
+
+GENDER_CODES = {gender: code for code, gender in enumerate(GenderType)}
+
+# Behavioral score of friends seated next to each other (good, but might distract)
+FRIEND_PAIR_SCORE = 0.7
+# Penalty for each separated pair seated next to each other
+SEPARATION_PENALTY = 0.3
+# Special needs deductions
+FRONT_ROW_DEDUCTION = 0.5
+QUIET_AREA_DEDUCTION = 0.3
+
+
+def weighted_fitness(scores: Dict[str, np.ndarray], objectives) -> np.ndarray:
+    """Vectorized OptimizationObjectives.score over batched objective scores"""
+    weights = np.array([getattr(objectives, name) for name in OBJECTIVE_NAMES])
+    weighted = np.stack([scores[name] for name in OBJECTIVE_NAMES], axis=-1) @ weights
+    return np.maximum(0.0, weighted - scores["penalty"])
+
+
+@dataclass
+class ScoreState:
+    """
+    Per-row, per-student and per-constraint scoring terms of one arrangement.
+
+    Kept so that a small edit (e.g. a swap) can be rescored by recomputing
+    only the affected rows.
+    """
+    seats: np.ndarray  # (total_seats,) student index per seat, -1 if empty
+    seat_of: np.ndarray  # (num_students,) seat index per student, -1 if unseated
+    row_terms: Dict[str, np.ndarray]  # each (rows,)
+    special_scores: np.ndarray  # (num_students,)
+    pair_penalties: np.ndarray  # (num_separate_pairs,)
+    objective_scores: Dict[str, float]
+    penalty: float
+
+
+class CompiledProblem:
+    """
+    Seating problem compiled to flat NumPy arrays.
+
+    An arrangement is a vector over seats (row-major) holding the index of
+    the seated student or -1 for an empty seat. All terms reproduce the
+    optimizer's objectives: academic balance (row score variance),
+    behavioral balance (adjacent pairs), diversity (gender and language per
+    row), special needs compliance and separation constraint penalties.
+    """
+
+    # Array attributes that make up the compiled problem
+    ARRAY_FIELDS = (
+        "academic", "behavior", "gender", "language",
+        "pair_score", "incompatible",
+        "special", "front_required", "quiet_required",
+        "separate_pairs",
+    )
+
+    def __init__(
+        self,
+        student_ids: List[str],
+        rows: int,
+        cols: int,
+        num_languages: int,
+        **arrays: np.ndarray
+    ):
+        self.student_ids = student_ids
+        self.index = {student_id: i for i, student_id in enumerate(student_ids)}
+        self.num_students = len(student_ids)
+        self.rows = rows
+        self.cols = cols
+        self.total_seats = rows * cols
+        self.num_languages = num_languages
+        for name in self.ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+
+        # Seat geometry
+        self.seat_row = np.arange(self.total_seats) // cols
+        self.seat_col = np.arange(self.total_seats) % cols
+        self.special_indices = np.flatnonzero(self.special)
+
+    @classmethod
+    def compile(
+        cls,
+        students: List[Student],
+        rows: int,
+        cols: int,
+        constraints: SeatingConstraints = None
+    ) -> "CompiledProblem":
+        """Compile a roster, layout and constraints"""
+        constraints = constraints or SeatingConstraints()
+        student_ids = [s.id for s in students]
+        index = {student_id: i for i, student_id in enumerate(student_ids)}
+        n = len(students)
+
+        languages = sorted({s.primary_language for s in students if s.primary_language})
+        language_codes = {language: code for code, language in enumerate(languages)}
+
+        behavior = np.array([s.behavior_score for s in students], dtype=np.float64)
+
+        # Behavioral score of student i seated directly left of student j
+        pair_score = (behavior[:, None] + behavior[None, :]) / 200.0
+        incompatible = np.zeros((n, n), dtype=bool)
+        for i, student in enumerate(students):
+            for friend_id in student.friends_ids:
+                if friend_id in index:
+                    pair_score[i, index[friend_id]] = FRIEND_PAIR_SCORE
+            for other_id in student.incompatible_ids:
+                if other_id in index:
+                    pair_score[i, index[other_id]] = 0.0
+                    incompatible[i, index[other_id]] = True
+
+        separate_pairs = [
+            (index[pair[0]], index[pair[1]])
+            for pair in constraints.separate_student_pairs
+            if len(pair) == 2 and pair[0] in index and pair[1] in index
+        ]
+
+        return cls(
+            student_ids=student_ids,
+            rows=rows,
+            cols=cols,
+            num_languages=len(languages),
+            academic=np.array([s.academic_score for s in students], dtype=np.float64),
+            behavior=behavior,
+            gender=np.array([GENDER_CODES[GenderType(s.gender)] for s in students], dtype=np.int64),
+            language=np.array(
+                [language_codes[s.primary_language] if s.primary_language else -1 for s in students],
+                dtype=np.int64
+            ),
+            pair_score=pair_score,
+            incompatible=incompatible,
+            special=np.array([bool(s.special_needs or s.requires_front_row) for s in students], dtype=bool),
+            front_required=np.array([s.requires_front_row for s in students], dtype=bool),
+            quiet_required=np.array([s.requires_quiet_area for s in students], dtype=bool),
+            separate_pairs=np.array(separate_pairs, dtype=np.int64).reshape(-1, 2),
+        )
+
+    def seats_from_order(self, order: Sequence[int]) -> np.ndarray:
+        """Seat vector for a GA individual (students fill seats in row-major order)"""
+        seats = np.full(self.total_seats, -1, dtype=np.int64)
+        seats[:len(order)] = order
+        return seats
+
+    def seat_of(self, seats: np.ndarray) -> np.ndarray:
+        """Seat index of every student (-1 if unseated); seats may be batched"""
+        seats = np.asarray(seats)
+        seat_of = np.full(seats.shape[:-1] + (self.num_students,), -1, dtype=np.int64)
+        filled = np.nonzero(seats >= 0)
+        seat_of[filled[:-1] + (seats[filled],)] = filled[-1]
+        return seat_of
+
+    def row_terms(self, grid: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Per-row scoring terms for a grid of shape (..., rows, cols)
+
+        Returns:
+            count, academic, behavior_sum, behavior_pairs and diversity per row
+        """
+        mask = grid >= 0
+        safe = np.where(mask, grid, 0)
+        count = mask.sum(axis=-1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Academic balance: lower variance = better balance
+            scores = np.where(mask, self.academic[safe], 0.0)
+            mean = scores.sum(axis=-1) / count
+            variance = np.where(mask, (scores - mean[..., None]) ** 2, 0.0).sum(axis=-1) / count
+            academic = np.where(count > 0, 1.0 / (1.0 + variance / 100.0), 0.0)
+
+            # Behavioral balance: adjacent occupied seats, skipping empty ones
+            order = np.argsort(~mask, axis=-1, kind="stable")
+            packed = np.take_along_axis(safe, order, axis=-1)
+            valid = np.take_along_axis(mask, order, axis=-1)[..., 1:]
+            pair_values = np.where(valid, self.pair_score[packed[..., :-1], packed[..., 1:]], 0.0)
+
+            # Diversity: distinct genders (2 = fully diverse) and distinct languages per speaker
+            genders = (self.gender[safe][..., None] == np.arange(len(GENDER_CODES))) & mask[..., None]
+            gender_diversity = np.minimum(genders.any(axis=-2).sum(axis=-1) / 2.0, 1.0)
+
+            language = np.where(mask, self.language[safe], -1)
+            speakers = (language >= 0).sum(axis=-1)
+            languages = (language[..., None] == np.arange(self.num_languages)).any(axis=-2).sum(axis=-1)
+            language_diversity = np.where(speakers > 0, languages / np.maximum(speakers, 1), 0.5)
+
+        return {
+            "count": count,
+            "academic": academic,
+            "behavior_sum": pair_values.sum(axis=-1),
+            "behavior_pairs": valid.sum(axis=-1),
+            "diversity": (gender_diversity + language_diversity) / 2.0,
+        }
+
+    def special_scores(self, seat_of: np.ndarray) -> np.ndarray:
+        """Special needs compliance of every student (only special students are scored)"""
+        seated = seat_of >= 0
+        row = np.where(seated, seat_of // self.cols, -1)
+        scores = (
+            1.0
+            - FRONT_ROW_DEDUCTION * (self.front_required & (row != 0))
+            - QUIET_AREA_DEDUCTION * (self.quiet_required & (row < self.rows // 2))
+        )
+        return np.where(seated, np.maximum(scores, 0.0), 0.0)
+
+    def pair_penalties(self, seat_of: np.ndarray) -> np.ndarray:
+        """Penalty of every separation pair (seated next to each other in a row)"""
+        first = seat_of[..., self.separate_pairs[:, 0]]
+        second = seat_of[..., self.separate_pairs[:, 1]]
+        adjacent = (
+            (first >= 0) & (second >= 0)
+            & (first // self.cols == second // self.cols)
+            & (np.abs(first % self.cols - second % self.cols) == 1)
+        )
+        return adjacent * SEPARATION_PENALTY
+
+    def aggregate(
+        self,
+        row_terms: Dict[str, np.ndarray],
+        special_scores: np.ndarray,
+        pair_penalties: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Combine row, student and pair terms into objective scores and penalty"""
+        count = row_terms["count"]
+        filled_rows = (count > 0).sum(axis=-1)
+        diverse_rows = (count >= 2).sum(axis=-1)
+        pairs = row_terms["behavior_pairs"].sum(axis=-1)
+        num_special = len(self.special_indices)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            academic = np.where(
+                filled_rows > 0,
+                np.where(count > 0, row_terms["academic"], 0.0).sum(axis=-1) / filled_rows,
+                0.5
+            )
+            behavioral = np.where(pairs > 0, row_terms["behavior_sum"].sum(axis=-1) / pairs, 0.5)
+            diversity = np.where(
+                diverse_rows > 0,
+                np.where(count >= 2, row_terms["diversity"], 0.0).sum(axis=-1) / diverse_rows,
+                0.5
+            )
+        special_needs = (
+            special_scores[..., self.special_indices].mean(axis=-1) if num_special
+            else np.ones(academic.shape)
+        )
+
+        return {
+            "academic_balance": academic,
+            "behavioral_balance": behavioral,
+            "diversity": diversity,
+            "special_needs": special_needs,
+            "penalty": pair_penalties.sum(axis=-1),
+        }
+
+    def score(self, seats: np.ndarray) -> ScoreState:
+        """Score a single arrangement"""
+        seats = np.asarray(seats, dtype=np.int64)
+        seat_of = self.seat_of(seats)
+        row_terms = self.row_terms(seats.reshape(self.rows, self.cols))
+        special_scores = self.special_scores(seat_of)
+        pair_penalties = self.pair_penalties(seat_of)
+        return self._state(seats, seat_of, row_terms, special_scores, pair_penalties)
+
+    def score_batch(self, seats: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score many arrangements in one vectorized pass
+
+        Args:
+            seats: (N, total_seats) matrix of student indices, -1 for empty seats
+
+        Returns:
+            Per-objective score arrays and the penalty array, each of shape (N,)
+        """
+        seats = np.asarray(seats, dtype=np.int64)
+        seat_of = self.seat_of(seats)
+        row_terms = self.row_terms(seats.reshape(-1, self.rows, self.cols))
+        return self.aggregate(row_terms, self.special_scores(seat_of), self.pair_penalties(seat_of))
+
+    def rescore(self, state: ScoreState, seats: np.ndarray) -> ScoreState:
+        """
+        Score an arrangement that differs from an already scored one
+
+        Only rows containing changed seats are recomputed; student and pair
+        terms are cheap and recomputed in full.
+        """
+        seats = np.asarray(seats, dtype=np.int64)
+        changed_rows = np.unique(self.seat_row[np.flatnonzero(seats != state.seats)])
+        if len(changed_rows) == 0:
+            return state
+
+        grid = seats.reshape(self.rows, self.cols)
+        updated = self.row_terms(grid[changed_rows])
+        row_terms = {}
+        for name, values in state.row_terms.items():
+            values = values.copy()
+            values[changed_rows] = updated[name]
+            row_terms[name] = values
+
+        seat_of = self.seat_of(seats)
+        return self._state(
+            seats, seat_of, row_terms, self.special_scores(seat_of), self.pair_penalties(seat_of)
+        )
+
+    def _state(self, seats, seat_of, row_terms, special_scores, pair_penalties) -> ScoreState:
+        totals = self.aggregate(row_terms, special_scores, pair_penalties)
+        penalty = float(totals.pop("penalty"))
+        return ScoreState(
+            seats=seats,
+            seat_of=seat_of,
+            row_terms=row_terms,
+            special_scores=special_scores,
+            pair_penalties=pair_penalties,
+            objective_scores={name: float(value) for name, value in totals.items()},
+            penalty=penalty,
+        )
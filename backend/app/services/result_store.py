@@ -0,0 +1,187 @@
+"""
+Durable Optimization Result Store
+Persists optimization responses in a local SQLite database
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredResult:
+    """A persisted optimization response"""
+    optimization_id: str
+    fingerprint: str
+    created_at: float
+    etag: str
+    payload: str
+
+
+class ResultStore:
+    """
+    SQLite-backed store of serialized optimization responses.
+
+    Results are keyed by optimization_id and indexed by roster fingerprint.
+    Disk use is bounded by age- and size-based compaction, which runs
+    every `compact_every` writes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        max_age_seconds: float,
+        compact_every: int = 50
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.compact_every = compact_every
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            # Must be set before the first table is created to take effect
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    optimization_id TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    etag TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_fingerprint ON results (fingerprint, created_at);
+                CREATE INDEX IF NOT EXISTS idx_results_created_at ON results (created_at);
+                """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_etag(payload: str) -> str:
+        """Strong ETag for a serialized payload"""
+        return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+    def put(self, optimization_id: str, fingerprint: str, payload: str) -> str:
+        """
+        Store a serialized response
+
+        Returns:
+            ETag of the stored payload
+        """
+        etag = self.make_etag(payload)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(optimization_id, fingerprint, created_at, etag, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (optimization_id, fingerprint, time.time(), etag, len(payload), payload)
+            )
+            self._conn.commit()
+            self._writes += 1
+            should_compact = self._writes % self.compact_every == 0
+
+        if should_compact:
+            self.compact()
+        return etag
+
+    def get(self, optimization_id: str) -> Optional[StoredResult]:
+        """Get a stored result by optimization ID"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT optimization_id, fingerprint, created_at, etag, payload "
+                "FROM results WHERE optimization_id = ?",
+                (optimization_id,)
+            ).fetchone()
+        return StoredResult(*row) if row else None
+
+    def latest_for_fingerprint(self, fingerprint: str) -> Optional[StoredResult]:
+        """Get the most recent stored result for a roster fingerprint"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT optimization_id, fingerprint, created_at, etag, payload "
+                "FROM results WHERE fingerprint = ? ORDER BY created_at DESC LIMIT 1",
+                (fingerprint,)
+            ).fetchone()
+        return StoredResult(*row) if row else None
+
+    def compact(self) -> int:
+        """
+        Delete expired results, then the oldest results until the stored
+        payloads fit in `max_bytes`
+
+        Returns:
+            Number of deleted results
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM results WHERE created_at < ?",
+                (time.time() - self.max_age_seconds,)
+            ).rowcount
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk from newest to oldest, keeping results while they fit
+                kept = 0
+                cutoff = None
+                for created_at, size in self._conn.execute(
+                    "SELECT created_at, size FROM results ORDER BY created_at DESC"
+                ):
+                    if kept + size > self.max_bytes:
+                        cutoff = created_at
+                        break
+                    kept += size
+                if cutoff is not None:
+                    deleted += self._conn.execute(
+                        "DELETE FROM results WHERE created_at <= ?", (cutoff,)
+                    ).rowcount
+
+            self._conn.commit()
+            if deleted:
+                self._conn.execute("PRAGMA incremental_vacuum")
+
+        if deleted:
+            logger.info(f"Result store compaction removed {deleted} results")
+        return deleted
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """Get the shared result store (None when disabled)"""
+    global _store
+    if not settings.RESULT_STORE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore(
+                path=settings.RESULT_STORE_PATH,
+                max_bytes=settings.RESULT_STORE_MAX_MB * 1024 * 1024,
+                max_age_seconds=settings.RESULT_STORE_MAX_AGE_DAYS * 86400
+            )
+    return _store
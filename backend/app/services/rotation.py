@@ -0,0 +1,106 @@
+"""
+Rotation Planning
+Consecutive seating charts of one roster that avoid repeating neighbors
+"""
+
+import math
+from typing import List, Optional
+
+import numpy as np
+from deap import tools
+
+from app.core.config import settings
+from app.models.classroom import OptimizationMode, SeatingArrangement
+from app.services.cancellation import CancellationToken
+from app.services.genetic_algorithm import ClassroomOptimizer
+
+
+def period_generations(generations: int, rotations: int) -> List[int]:
+    """Generations of every period of a plan whose first period runs `generations`"""
+    later = max(1, math.ceil(generations * settings.ROTATION_GENERATION_FRACTION))
+    return [generations] + [later] * (rotations - 1)
+
+
+def plan_rotations(
+    optimizer: ClassroomOptimizer,
+    rotations: int,
+    max_generations: Optional[int] = None,
+    adaptive: bool = False,
+    workers: Optional[int] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    seed_arrangements: Optional[List[List[str]]] = None,
+    target_gap: Optional[float] = None
+) -> List[SeatingArrangement]:
+    """
+    Optimize `rotations` consecutive periods of one roster with one optimizer
+
+    Period k is scored as usual minus ROTATION_REPEAT_PENALTY for every
+    earlier period in which each of its neighbor pairs already sat
+    together. All periods share the optimizer's compiled problem, geometry
+    and fitness cache (the cache holds unpenalized scores). Periods after
+    the first start from the previous final population, which already
+    scores well on the roster, and run ROTATION_GENERATION_FRACTION of the
+    generations.
+
+    Periods are planned in order, so earlier periods get first pick of
+    neighbors. A cancelled plan returns the periods finished so far, the
+    last one partial.
+
+    target_gap applies to every period's penalized fitness.
+
+    Each arrangement's diagnostics["rotation"] reports its period, its
+    repeated neighbor pairs and its fitness without the repeat penalty.
+    """
+    if optimizer.mode != OptimizationMode.WEIGHTED:
+        raise ValueError("Rotation planning is only supported in weighted mode")
+
+    n = len(optimizer.students)
+    history = np.zeros((n, n), dtype=np.int64)
+    generations = period_generations(max_generations or optimizer.params.generations, rotations)
+
+    arrangements = []
+    try:
+        for period in range(rotations):
+            if period == 0:
+                result = optimizer.optimize(
+                    max_generations=generations[period],
+                    adaptive=adaptive,
+                    workers=workers,
+                    cancel_token=cancel_token,
+                    seed_arrangements=seed_arrangements,
+                    target_gap=target_gap
+                )
+            else:
+                optimizer.neighbor_history = history.copy()
+                optimizer.repeat_penalty = settings.ROTATION_REPEAT_PENALTY
+                result = optimizer.optimize(
+                    max_generations=generations[period],
+                    adaptive=adaptive,
+                    workers=workers,
+                    cancel_token=cancel_token,
+                    initial_population=[list(individual) for individual in optimizer.population],
+                    target_gap=target_gap
+                )
+
+            best = np.asarray(tools.selBest(optimizer.population, k=1)[0])
+            left, right = best[optimizer.neighbor_positions], best[optimizer.neighbor_positions + 1]
+            repeats = history[left, right]
+            state = optimizer.problem.score(optimizer.problem.seats_from_order(best))
+            result.diagnostics["rotation"] = {
+                "period": period + 1,
+                "rotations": rotations,
+                "repeated_neighbors": int((repeats > 0).sum()),
+                "repeat_penalty": round(float(settings.ROTATION_REPEAT_PENALTY * repeats.sum()), 6),
+                "base_fitness": optimizer.objectives.score(state.objective_scores, penalty=state.penalty),
+            }
+            arrangements.append(result)
+
+            history[left, right] += 1
+            history[right, left] += 1
+            if cancel_token is not None and cancel_token.cancelled:
+                break
+    finally:
+        optimizer.neighbor_history = None
+        optimizer.repeat_penalty = 0.0
+
+    return arrangements
@@ -0,0 +1,379 @@
+"""
+Optimization Scheduler
+Weighted fair queueing of optimization work across tenants
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.tracing import span
+from app.services.memory import MB, MemoryBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+# Smoothing of the learned seconds-per-work-unit cost model
+COST_MODEL_ALPHA = 0.2
+# Largest factor a single job can move the cost model by
+COST_MODEL_MAX_STEP = 4.0
+# Initial cost model: seconds per (student x generation x individual)
+DEFAULT_SECONDS_PER_UNIT = 2.5e-6
+
+
+class TenantQueueFull(Exception):
+    """A tenant has too many optimizations queued"""
+
+    def __init__(self, tenant: str, retry_after: float):
+        super().__init__(f"Too many queued optimizations for {tenant}")
+        self.tenant = tenant
+        self.retry_after = retry_after
+
+
+class QueueAbandoned(Exception):
+    """The client disconnected while its job was queued"""
+
+
+@dataclass
+class Ticket:
+    """One optimization job's place in the scheduler"""
+    tenant: str
+    estimate: float  # Estimated cost in CPU seconds
+    sequence: int
+    memory: int = 0  # Estimated peak memory in bytes
+    workers: int = 1  # Processes the job runs on
+    slots: int = 1  # Concurrency slots held: workers, up to the scheduler's max_concurrent
+    start_tag: float = 0.0  # Virtual start time (start-time fair queueing)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None
+    queue_position: int = 0  # 1-based position on arrival, 0 if started at once
+    estimated_wait: float = 0.0  # Estimated seconds until start, on arrival
+    cpu_seconds: float = 0.0  # Charged cost: thread CPU time if measured, else wall time (x workers)
+    measured: bool = False
+    _future: Optional[asyncio.Future] = None
+
+    def measure(self, func: Callable) -> Callable:
+        """
+        Wrap a blocking job so its cost is charged to the tenant: the
+        thread's CPU time, or wall time x workers for a multi-process job
+        (whose worker CPU time the thread doesn't see)
+        """
+        def run(*args, **kwargs):
+            clock = time.thread_time if self.workers <= 1 else time.perf_counter
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.cpu_seconds += (clock() - start) * self.workers
+                self.measured = True
+        return run
+
+    def info(self) -> Dict:
+        """Scheduling details for API responses"""
+        started = self.started_at or time.perf_counter()
+        return {
+            "tenant": self.tenant,
+            "queue_position": self.queue_position,
+            "estimated_wait_seconds": round(self.estimated_wait, 3),
+            "queued_seconds": round(started - self.enqueued_at, 3),
+            "estimated_cpu_seconds": round(self.estimate, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "estimated_memory_mb": round(self.memory / MB, 2),
+        }
+
+
+@dataclass
+class TenantState:
+    weight: float = 1.0
+    last_finish_tag: float = 0.0
+    running: int = 0
+    queued: int = 0
+    jobs: int = 0
+    cpu_seconds: float = 0.0
+
+
+def parse_tenant_weights(spec: str) -> Dict[str, float]:
+    """Parse "tenant=weight,tenant=weight" (e.g. "origin:https://a.example=2")"""
+    weights = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        tenant, _, weight = item.rpartition("=")
+        try:
+            weights[tenant] = max(float(weight), 0.01)
+        except ValueError:
+            logger.warning(f"Ignoring invalid tenant weight '{item}'")
+    return weights
+
+
+class FairScheduler:
+    """
+    Admits optimization jobs under global and per-tenant concurrency caps
+    and a memory budget.
+
+    Waiting jobs are ordered by start-time fair queueing: each job gets a
+    virtual start tag max(virtual time, tenant's last finish tag) and
+    advances its tenant's finish tag by cost / weight, so a tenant that
+    submits a burst of jobs is interleaved with everyone else instead of
+    running them back to back. Tags are corrected by the measured CPU time
+    once a job finishes.
+
+    A job on several processes holds one slot per process (all slots if
+    it has more processes than max_concurrent). A job whose slots or
+    estimated memory don't fit next to the running ones holds back
+    everything behind it until they are released, so large jobs are
+    delayed but never starved by a stream of small ones.
+
+    Idle tenants are forgotten once they hold no virtual-time debt, so
+    tenant state stays bounded. Per-tenant caps assume tenant ids can't
+    be minted freely (trusted API keys): a client rotating X-API-Key
+    values gets a fresh tenant each time and is held only by the global
+    caps.
+
+    Runs on the event loop; no locking needed.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        tenant_max_concurrent: int,
+        tenant_max_queued: int,
+        weights: Dict[str, float] = None,
+        memory_budget: int = 0
+    ):
+        self.max_concurrent = max_concurrent
+        self.tenant_max_concurrent = tenant_max_concurrent
+        self.tenant_max_queued = tenant_max_queued
+        self.weights = weights or {}
+        self.memory_budget = memory_budget
+        self.memory_reserved = 0
+        self.tenants: Dict[str, TenantState] = {}
+        self.waiting: List[Ticket] = []
+        self.running: List[Ticket] = []
+        self.virtual_time = 0.0
+        self.seconds_per_unit = DEFAULT_SECONDS_PER_UNIT
+        self._sequence = itertools.count()
+
+    def estimate(self, work_units: float) -> float:
+        """Estimated CPU seconds of a job of the given size"""
+        return work_units * self.seconds_per_unit
+
+    def _tenant(self, tenant: str) -> TenantState:
+        if tenant not in self.tenants:
+            self.tenants[tenant] = TenantState(weight=self.weights.get(tenant, 1.0))
+        return self.tenants[tenant]
+
+    def _prune_idle(self):
+        """Forget tenants with no jobs whose fair-share tag has been caught up with"""
+        for tenant in [
+            tenant for tenant, state in self.tenants.items()
+            if state.running == 0 and state.queued == 0 and state.last_finish_tag <= self.virtual_time
+        ]:
+            del self.tenants[tenant]
+
+    def _eligible(self, ticket: Ticket) -> bool:
+        return self.tenants[ticket.tenant].running < self.tenant_max_concurrent
+
+    def _slots_in_use(self) -> int:
+        return sum(ticket.slots for ticket in self.running)
+
+    def _fits(self, ticket: Ticket) -> bool:
+        return (
+            self._slots_in_use() + ticket.slots <= self.max_concurrent
+            and (not self.memory_budget or self.memory_reserved + ticket.memory <= self.memory_budget)
+        )
+
+    def _ordered_waiting(self) -> List[Ticket]:
+        return sorted(self.waiting, key=lambda ticket: (ticket.start_tag, ticket.sequence))
+
+    def estimated_wait(self, ticket: Ticket) -> float:
+        """Seconds until a waiting job is expected to start"""
+        now = time.perf_counter()
+        backlog = sum(max(0.0, t.estimate - (now - t.started_at)) for t in self.running)
+        for other in self._ordered_waiting():
+            if other is ticket:
+                break
+            backlog += other.estimate
+        return backlog / self.max_concurrent
+
+    def _dispatch(self):
+        """Start waiting jobs while capacity allows, lowest start tag first"""
+        while self._slots_in_use() < self.max_concurrent:
+            ticket = next((t for t in self._ordered_waiting() if self._eligible(t)), None)
+            if ticket is None or not self._fits(ticket):
+                return
+            self._start(ticket)
+            ticket._future.set_result(None)
+
+    def _start(self, ticket: Ticket):
+        if ticket in self.waiting:
+            self.waiting.remove(ticket)
+            self.tenants[ticket.tenant].queued -= 1
+        self.virtual_time = max(self.virtual_time, ticket.start_tag)
+        ticket.started_at = time.perf_counter()
+        self.running.append(ticket)
+        self.tenants[ticket.tenant].running += 1
+        self.memory_reserved += ticket.memory
+
+    def _finish(self, ticket: Ticket):
+        state = self.tenants[ticket.tenant]
+        self.running.remove(ticket)
+        state.running -= 1
+        self.memory_reserved -= ticket.memory
+
+        if not ticket.measured:
+            ticket.cpu_seconds = (time.perf_counter() - ticket.started_at) * ticket.workers
+        cost = ticket.cpu_seconds
+        state.jobs += 1
+        state.cpu_seconds += cost
+        # Charge the actual rather than the estimated cost
+        state.last_finish_tag += (cost - ticket.estimate) / state.weight
+
+        if ticket.estimate > 0 and cost > 0:
+            # Bounded so one outlier (e.g. a tiny job dominated by overhead)
+            # can't throw off every estimate
+            ratio = min(max(cost / ticket.estimate, 1 / COST_MODEL_MAX_STEP), COST_MODEL_MAX_STEP)
+            self.seconds_per_unit += COST_MODEL_ALPHA * (ratio - 1) * self.seconds_per_unit
+
+        if not self.running and not self.waiting:
+            # Idle: the next busy period starts after every tag served so far
+            self.virtual_time = max([self.virtual_time] + [s.last_finish_tag for s in self.tenants.values()])
+        self._prune_idle()
+
+    def _abandon(self, ticket: Ticket):
+        if ticket in self.waiting:
+            self.waiting.remove(ticket)
+            state = self.tenants[ticket.tenant]
+            state.queued -= 1
+            # Give back the virtual time the job reserved
+            state.last_finish_tag -= ticket.estimate / state.weight
+            self._prune_idle()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        tenant: str,
+        work_units: float,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        memory: int = 0,
+        workers: int = 1
+    ):
+        """
+        Wait for a turn to run a job, then hold its slot
+
+        Args:
+            tenant: Tenant id (see app.utils.tenant.get_tenant_id)
+            work_units: Job size (students x generations x population)
+            is_disconnected: Polled while queued; a disconnected client
+                gives up its place
+            memory: Estimated peak memory in bytes (see app.services.memory)
+            workers: Processes the job keeps busy; it holds that many slots
+
+        Raises:
+            MemoryBudgetExceeded: If the job alone exceeds the memory budget
+            TenantQueueFull: If the tenant already has too many jobs queued
+            QueueAbandoned: If the client disconnected while queued
+        """
+        if self.memory_budget and memory > self.memory_budget:
+            raise MemoryBudgetExceeded(memory, self.memory_budget)
+
+        state = self._tenant(tenant)
+        estimate = self.estimate(work_units)
+        workers = max(1, workers)
+        ticket = Ticket(
+            tenant=tenant,
+            estimate=estimate,
+            sequence=next(self._sequence),
+            memory=memory,
+            workers=workers,
+            slots=min(workers, self.max_concurrent)
+        )
+        ticket.start_tag = max(self.virtual_time, state.last_finish_tag)
+
+        can_start = (
+            state.running < self.tenant_max_concurrent
+            and self._fits(ticket)
+            and not any(self._eligible(t) for t in self.waiting)
+        )
+        if not can_start and state.queued >= self.tenant_max_queued:
+            raise TenantQueueFull(tenant, self.estimated_wait(ticket) + estimate)
+
+        state.last_finish_tag = ticket.start_tag + estimate / state.weight
+
+        if can_start:
+            self._start(ticket)
+        else:
+            ticket._future = asyncio.get_running_loop().create_future()
+            self.waiting.append(ticket)
+            state.queued += 1
+            ticket.queue_position = self._ordered_waiting().index(ticket) + 1
+            ticket.estimated_wait = self.estimated_wait(ticket)
+            try:
+                with span("scheduler.queue", position=ticket.queue_position):
+                    while True:
+                        done, _ = await asyncio.wait({ticket._future}, timeout=settings.CANCEL_POLL_INTERVAL)
+                        if done:
+                            break
+                        if is_disconnected is not None and await is_disconnected():
+                            self._abandon(ticket)
+                            raise QueueAbandoned()
+            except asyncio.CancelledError:
+                if ticket._future.done():
+                    # Started just as the request was cancelled: release the slot
+                    self._finish(ticket)
+                    self._dispatch()
+                else:
+                    self._abandon(ticket)
+                raise
+
+        try:
+            yield ticket
+        finally:
+            self._finish(ticket)
+            self._dispatch()
+
+    def tenant_status(self, tenant: str) -> Dict:
+        """Queue and accounting view of one tenant"""
+        state = self.tenants.get(tenant, TenantState(weight=self.weights.get(tenant, 1.0)))
+        ordered = self._ordered_waiting()
+        return {
+            "tenant": tenant,
+            "weight": state.weight,
+            "running": state.running,
+            "queued": [
+                {
+                    "queue_position": position,
+                    "estimated_wait_seconds": round(self.estimated_wait(ticket), 3),
+                    "estimated_cpu_seconds": round(ticket.estimate, 3),
+                }
+                for position, ticket in enumerate(ordered, start=1)
+                if ticket.tenant == tenant
+            ],
+            "completed_jobs": state.jobs,
+            "cpu_seconds": round(state.cpu_seconds, 3),
+        }
+
+    def get_stats(self) -> Dict:
+        """Global scheduler statistics"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "tenant_max_concurrent": self.tenant_max_concurrent,
+            "running": len(self.running),
+            "slots_in_use": self._slots_in_use(),
+            "queued": len(self.waiting),
+            "tenants": len(self.tenants),
+            "seconds_per_unit": self.seconds_per_unit,
+            "memory_budget_mb": round(self.memory_budget / MB, 2),
+            "memory_reserved_mb": round(self.memory_reserved / MB, 2),
+        }
+
+
+scheduler = FairScheduler(
+    max_concurrent=settings.SCHEDULER_MAX_CONCURRENT,
+    tenant_max_concurrent=settings.SCHEDULER_TENANT_MAX_CONCURRENT,
+    tenant_max_queued=settings.SCHEDULER_TENANT_MAX_QUEUED,
+    weights=parse_tenant_weights(settings.SCHEDULER_TENANT_WEIGHTS),
+    memory_budget=settings.MEMORY_BUDGET_MB * MB
+)
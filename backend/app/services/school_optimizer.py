@@ -0,0 +1,434 @@
+"""
+School-Wide Classroom Assignment
+Two-level optimization: partition a grade into classrooms, then seat each one
+"""
+
+import itertools
+import logging
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.student import Student, GenderType
+from app.models.classroom import (
+    LayoutType,
+    OptimizationObjectives,
+    SeatingArrangement,
+    SeatingConstraints
+)
+from app.core.config import settings
+from app.services.ga_params import GAParameters
+from app.services.memory import estimate_school_bytes
+from app.services.problem import GENDER_CODES
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of keeping conflicting students (incompatible or
+# separate pairs) in different classrooms, per pair placed together
+CONFLICT_WEIGHT = 2.0
+# Reward per friend pair placed in the same classroom
+FRIEND_WEIGHT = 0.05
+
+# Seating pool shared by every school-wide request, created on first use
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class ClassroomPartitioner:
+    """
+    Partitions students into equally sized classrooms.
+
+    Works on cluster-level aggregates (size, score sums, gender/language
+    counts, special needs counts) so a swap of two students between
+    classrooms is scored in O(degree) time instead of re-scoring the
+    classrooms. The terms mirror the seating objectives:
+
+    - academic/behavioral balance: classroom means close to the grade mean
+    - diversity: gender and language shares close to the grade's shares
+    - special needs: front-row students within each room's front-row
+      capacity and spread evenly
+    - relationships: incompatible and separate pairs in different rooms,
+      friends together where possible
+    """
+
+    def __init__(
+        self,
+        students: List[Student],
+        num_classrooms: int,
+        front_row_capacity: int,
+        objectives: OptimizationObjectives,
+        constraints: SeatingConstraints = None,
+        seed: Optional[int] = None
+    ):
+        self.students = students
+        self.num_classrooms = num_classrooms
+        self.front_row_capacity = front_row_capacity
+        self.objectives = objectives
+        self.rng = random.Random(seed)
+
+        n = len(students)
+        index = {s.id: i for i, s in enumerate(students)}
+
+        self.academic = np.array([s.academic_score for s in students])
+        self.behavior = np.array([s.behavior_score for s in students])
+        self.gender = np.array([GENDER_CODES[GenderType(s.gender)] for s in students])
+        languages = sorted({s.primary_language for s in students if s.primary_language})
+        language_codes = {language: code for code, language in enumerate(languages)}
+        self.language = np.array([language_codes.get(s.primary_language, -1) for s in students])
+        self.front = np.array([s.requires_front_row for s in students], dtype=np.int64)
+        self.special = np.array([bool(s.special_needs) or s.requires_front_row for s in students], dtype=np.int64)
+
+        # Grade-level targets and scales
+        self.academic_mean = self.academic.mean()
+        self.academic_scale = max(self.academic.std(), 1.0)
+        self.behavior_mean = self.behavior.mean()
+        self.behavior_scale = max(self.behavior.std(), 1.0)
+        self.gender_share = np.bincount(self.gender, minlength=len(GENDER_CODES)) / n
+        speakers = self.language >= 0
+        self.language_share = (
+            np.bincount(self.language[speakers], minlength=len(languages)) / n if len(languages) else np.zeros(0)
+        )
+        self.special_share = self.special.sum() / num_classrooms
+
+        # Relationship graph: conflicts (incompatible or separate pairs) and friendships
+        self.conflicts: List[List[int]] = [[] for _ in range(n)]
+        self.friends: List[List[int]] = [[] for _ in range(n)]
+        pairs = [(i, index[other]) for i, s in enumerate(students) for other in s.incompatible_ids if other in index]
+        pairs += [
+            (index[pair[0]], index[pair[1]])
+            for pair in (constraints or SeatingConstraints()).separate_student_pairs
+            if len(pair) == 2 and pair[0] in index and pair[1] in index
+        ]
+        for i, j in set(pairs):
+            if i != j:
+                self.conflicts[i].append(j)
+                self.conflicts[j].append(i)
+        for i, s in enumerate(students):
+            for other in s.friends_ids:
+                j = index.get(other)
+                if j is not None and j != i:
+                    self.friends[i].append(j)
+
+    def _initial_assignment(self) -> np.ndarray:
+        """Snake draft by academic score: balances sizes and academic means"""
+        order = np.argsort(-self.academic, kind="stable")
+        assignment = np.empty(len(order), dtype=np.int64)
+        k = self.num_classrooms
+        for position, student in enumerate(order):
+            lap, offset = divmod(position, k)
+            assignment[student] = offset if lap % 2 == 0 else k - 1 - offset
+        return assignment
+
+    def _init_aggregates(self, assignment: np.ndarray):
+        """Per-classroom aggregates, kept as Python scalars for fast updates"""
+        k = self.num_classrooms
+        self.size = np.bincount(assignment, minlength=k).astype(np.float64).tolist()
+        self.academic_sum = np.bincount(assignment, weights=self.academic, minlength=k).tolist()
+        self.behavior_sum = np.bincount(assignment, weights=self.behavior, minlength=k).tolist()
+        gender_count = np.zeros((k, len(GENDER_CODES)))
+        np.add.at(gender_count, (assignment, self.gender), 1)
+        self.gender_count = gender_count.tolist()
+        language_count = np.zeros((k, len(self.language_share)))
+        speakers = self.language >= 0
+        np.add.at(language_count, (assignment[speakers], self.language[speakers]), 1)
+        self.language_count = language_count.tolist()
+        self.front_count = np.bincount(assignment, weights=self.front, minlength=k).tolist()
+        self.special_count = np.bincount(assignment, weights=self.special, minlength=k).tolist()
+
+        # Scalar copies of per-student attributes for the swap loop
+        self._student_attrs = list(zip(
+            self.academic.tolist(), self.behavior.tolist(), self.gender.tolist(),
+            self.language.tolist(), self.front.tolist(), self.special.tolist()
+        ))
+        self._gender_share = self.gender_share.tolist()
+        self._language_share = self.language_share.tolist()
+
+    def _class_cost(self, c: int) -> float:
+        """Separable cost of one classroom from its aggregates"""
+        size = self.size[c]
+        academic = ((self.academic_sum[c] / size - self.academic_mean) / self.academic_scale) ** 2
+        behavior = ((self.behavior_sum[c] / size - self.behavior_mean) / self.behavior_scale) ** 2
+        diversity = sum((count / size - share) ** 2 for count, share in zip(self.gender_count[c], self._gender_share))
+        diversity += sum(
+            (count / size - share) ** 2 for count, share in zip(self.language_count[c], self._language_share)
+        )
+        special = (
+            max(0.0, self.front_count[c] - self.front_row_capacity) ** 2
+            + 0.1 * (self.special_count[c] - self.special_share) ** 2
+        )
+        return (
+            self.objectives.academic_balance * academic
+            + self.objectives.behavioral_balance * behavior
+            + self.objectives.diversity * diversity
+            + self.objectives.special_needs * special
+        )
+
+    def _move(self, student: int, source: int, target: int):
+        """Update aggregates for moving one student between classrooms"""
+        academic, behavior, gender, language, front, special = self._student_attrs[student]
+        for c, sign in ((source, -1), (target, 1)):
+            self.size[c] += sign
+            self.academic_sum[c] += sign * academic
+            self.behavior_sum[c] += sign * behavior
+            self.gender_count[c][gender] += sign
+            if language >= 0:
+                self.language_count[c][language] += sign
+            self.front_count[c] += sign * front
+            self.special_count[c] += sign * special
+
+    def _relationship_delta(self, assignment: List[int], i: int, j: int) -> float:
+        """Cost change of the relationship terms when i and j swap classrooms"""
+        a, b = assignment[i], assignment[j]
+        delta = 0.0
+        for student, source, target, partner in ((i, a, b, j), (j, b, a, i)):
+            for other in self.conflicts[student]:
+                if other != partner:
+                    delta += CONFLICT_WEIGHT * ((assignment[other] == target) - (assignment[other] == source))
+            for other in self.friends[student]:
+                if other != partner:
+                    delta -= FRIEND_WEIGHT * ((assignment[other] == target) - (assignment[other] == source))
+        return delta
+
+    def relationship_cost(self, assignment: np.ndarray) -> Tuple[int, int]:
+        """Number of conflict pairs and friend pairs placed together"""
+        conflicts = sum(
+            1 for i, others in enumerate(self.conflicts) for j in others if j > i and assignment[i] == assignment[j]
+        )
+        friends = sum(1 for i, others in enumerate(self.friends) for j in others if assignment[i] == assignment[j])
+        return conflicts, friends
+
+    def partition(self, max_iterations: int = None) -> List[List[int]]:
+        """
+        Partition students into classrooms
+
+        Starts from a snake draft and improves it with swap local search
+        (swaps keep classroom sizes balanced).
+
+        Returns:
+            Student indices per classroom
+        """
+        n = len(self.students)
+        k = self.num_classrooms
+        assignment = self._initial_assignment()
+        self._init_aggregates(assignment)
+        assignment = assignment.tolist()
+        if k == 1:
+            max_iterations = 0
+        elif max_iterations is None:
+            max_iterations = settings.SCHOOL_PARTITION_ITERATIONS_PER_STUDENT * n
+
+        for _ in range(max_iterations):
+            i = self.rng.randrange(n)
+            j = self.rng.randrange(n)
+            a, b = assignment[i], assignment[j]
+            if a == b:
+                continue
+
+            before = self._class_cost(a) + self._class_cost(b)
+            self._move(i, a, b)
+            self._move(j, b, a)
+            after = self._class_cost(a) + self._class_cost(b)
+            delta = after - before + self._relationship_delta(assignment, i, j)
+
+            if delta < 0:
+                assignment[i], assignment[j] = b, a
+            else:
+                # Revert
+                self._move(i, b, a)
+                self._move(j, a, b)
+
+        self.assignment = np.array(assignment)
+        return [np.flatnonzero(self.assignment == c).tolist() for c in range(k)]
+
+    def summary(self) -> Dict[str, float]:
+        """Partition quality metrics across classrooms"""
+        size = np.array(self.size)
+        academic_means = np.array(self.academic_sum) / size
+        behavior_means = np.array(self.behavior_sum) / size
+        conflicts, friends = self.relationship_cost(self.assignment)
+        return {
+            "academic_mean_spread": float(academic_means.max() - academic_means.min()),
+            "behavior_mean_spread": float(behavior_means.max() - behavior_means.min()),
+            "max_gender_share_deviation": float(
+                np.abs(np.array(self.gender_count) / size[:, None] - self.gender_share).max()
+            ),
+            "conflict_pairs_together": float(conflicts),
+            "friend_pairs_together": float(friends),
+            "max_front_row_overflow": float(max(0.0, max(self.front_count) - self.front_row_capacity)),
+        }
+
+
+def _classroom_constraints(constraints: SeatingConstraints, student_ids: set) -> SeatingConstraints:
+    """Restrict constraints to the students of one classroom"""
+    def within(pairs):
+        return [pair for pair in pairs if all(student_id in student_ids for student_id in pair)]
+
+    return constraints.model_copy(update={
+        "separate_student_pairs": within(constraints.separate_student_pairs),
+        "keep_student_pairs_together": within(constraints.keep_student_pairs_together),
+        "front_row_student_ids": [s for s in constraints.front_row_student_ids if s in student_ids],
+        "back_row_student_ids": [s for s in constraints.back_row_student_ids if s in student_ids],
+    })
+
+
+def pool_size() -> int:
+    """Processes of the shared seating pool: SCHOOL_MAX_WORKERS, or all CPUs but one"""
+    return settings.SCHOOL_MAX_WORKERS or max(1, (os.cpu_count() or 1) - 1)
+
+
+def seating_workers(max_workers: Optional[int], num_classrooms: int) -> int:
+    """Processes used to seat classrooms in parallel (at most the pool's)"""
+    return min(max_workers or pool_size(), pool_size(), num_classrooms)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """The shared seating pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=pool_size())
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next request starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _seat_in_pool(tasks: List[Tuple], workers: int) -> List[SeatingArrangement]:
+    """
+    Seat classrooms on the shared pool, keeping at most `workers` of this
+    request's classrooms in flight so concurrent requests share the pool
+    """
+    pool = _get_pool()
+    arrangements: List[Optional[SeatingArrangement]] = [None] * len(tasks)
+    queue = iter(enumerate(tasks))
+    pending = {}
+    try:
+        for index, task in itertools.islice(queue, workers):
+            pending[pool.submit(_seat_classroom, task)] = index
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                arrangements[pending.pop(future)] = future.result()
+                following = next(queue, None)
+                if following is not None:
+                    pending[pool.submit(_seat_classroom, following[1])] = following[0]
+    except BrokenProcessPool:
+        logger.warning("Seating pool broke (worker killed?); seating the remaining classrooms in-process")
+        _discard_pool(pool)
+        arrangements = [
+            arrangement if arrangement is not None else _seat_classroom(task)
+            for arrangement, task in zip(arrangements, tasks)
+        ]
+    return arrangements
+
+
+def estimate_memory(
+    num_students: int,
+    num_classrooms: int,
+    rows: int,
+    cols: int,
+    max_workers: int = None,
+    population_size: int = None
+) -> int:
+    """Estimated peak memory of optimize_school in bytes (see app.services.memory)"""
+    return estimate_school_bytes(
+        num_students,
+        num_classrooms,
+        rows * cols,
+        population_size or settings.GA_POPULATION_SIZE,
+        seating_workers(max_workers, num_classrooms)
+    )
+
+
+def _seat_classroom(args) -> SeatingArrangement:
+    """Process pool worker: seat one classroom"""
+    from app.services.genetic_algorithm import ClassroomOptimizer
+
+    students, layout_type, rows, cols, objectives, constraints, max_generations, params = args
+    optimizer = ClassroomOptimizer(
+        students=students,
+        layout_type=layout_type,
+        rows=rows,
+        cols=cols,
+        objectives=objectives,
+        constraints=constraints,
+        params=params
+    )
+    # Classrooms are already spread over processes; evaluate in-process
+    return optimizer.optimize(max_generations=max_generations, workers=1)
+
+
+def optimize_school(
+    students: List[Student],
+    num_classrooms: int,
+    layout_type: LayoutType,
+    rows: int,
+    cols: int,
+    objectives: OptimizationObjectives = None,
+    constraints: SeatingConstraints = None,
+    max_generations: int = None,
+    max_workers: int = None,
+    params: Optional[GAParameters] = None
+) -> Tuple[List[List[Student]], List[SeatingArrangement], Dict[str, float]]:
+    """
+    Split a grade into classrooms and seat every classroom
+
+    Level 1 partitions students with ClassroomPartitioner; level 2 runs the
+    seating optimizer for all classrooms in parallel on a process pool
+    shared by all requests (see pool_size).
+
+    Returns:
+        Tuple of (students per classroom, arrangement per classroom,
+        partition metrics including timings)
+
+    Raises:
+        ValueError: If the classrooms can't fit the students
+    """
+    objectives = objectives or OptimizationObjectives()
+    constraints = constraints or SeatingConstraints()
+
+    class_size = math.ceil(len(students) / num_classrooms)
+    if class_size > rows * cols:
+        raise ValueError(
+            f"{len(students)} students in {num_classrooms} classrooms need {class_size} seats per room, "
+            f"but the layout has {rows * cols}"
+        )
+    if len(students) < 2 * num_classrooms:
+        raise ValueError("Every classroom needs at least 2 students")
+
+    start_time = time.perf_counter()
+    partitioner = ClassroomPartitioner(
+        students, num_classrooms, front_row_capacity=cols, objectives=objectives, constraints=constraints
+    )
+    groups = [[students[i] for i in group] for group in partitioner.partition()]
+    metrics = partitioner.summary()
+    metrics["partition_time"] = time.perf_counter() - start_time
+
+    tasks = [
+        (group, layout_type, rows, cols, objectives,
+         _classroom_constraints(constraints, {s.id for s in group}), max_generations, params)
+        for group in groups
+    ]
+
+    seating_started = time.perf_counter()
+    max_workers = seating_workers(max_workers, len(tasks))
+    if max_workers <= 1:
+        arrangements = [_seat_classroom(task) for task in tasks]
+    else:
+        arrangements = _seat_in_pool(tasks, max_workers)
+    metrics["seating_time"] = time.perf_counter() - seating_started
+
+    return groups, arrangements, metrics
@@ -0,0 +1,318 @@
+"""
+Arrangement Scoring Service
+Scores explicit seating arrangements with the optimizer's fitness terms
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.models.student import Student
+from app.models.classroom import (
+    ConstraintViolation,
+    LayoutType,
+    OptimizationObjectives,
+    SeatPosition,
+    SeatingConstraints
+)
+from app.core.config import settings
+from app.services.problem import CompiledProblem, ScoreState, OBJECTIVE_NAMES, weighted_fitness
+from app.utils.fingerprint import roster_fingerprint
+
+
+class ProblemCache:
+    """
+    LRU cache of compiled problems per roster fingerprint.
+
+    Also keeps the last scored arrangement of each roster so that a
+    follow-up edit (a drag-and-drop swap) is rescored incrementally.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[CompiledProblem, Optional[ScoreState]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(
+        self,
+        fingerprint: str,
+        students: List[Student],
+        rows: int,
+        cols: int,
+        constraints: SeatingConstraints
+    ) -> Tuple[CompiledProblem, Optional[ScoreState]]:
+        """Get the compiled problem and last score state for a roster"""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                self._entries.move_to_end(fingerprint)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        problem = CompiledProblem.compile(students, rows, cols, constraints)
+        self.store_state(fingerprint, problem, None)
+        return problem, None
+
+    def store_state(self, fingerprint: str, problem: CompiledProblem, state: Optional[ScoreState]):
+        """Remember the last scored arrangement of a roster"""
+        with self._lock:
+            self._entries[fingerprint] = (problem, state)
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+problem_cache = ProblemCache(max_size=settings.SCORING_CACHE_SIZE)
+
+
+def seats_from_positions(problem: CompiledProblem, student_seats: Dict[str, SeatPosition]) -> np.ndarray:
+    """
+    Convert a student_id -> seat position mapping to a seat vector
+
+    Raises:
+        ValueError: If a student is unknown, a seat is outside the layout
+            or two students share a seat
+    """
+    seats = np.full(problem.total_seats, -1, dtype=np.int64)
+    for student_id, position in student_seats.items():
+        if student_id not in problem.index:
+            raise ValueError(f"Unknown student '{student_id}' in arrangement")
+        if position.row >= problem.rows or position.col >= problem.cols:
+            raise ValueError(
+                f"Seat ({position.row}, {position.col}) of student '{student_id}' is outside "
+                f"the {problem.rows}x{problem.cols} layout"
+            )
+        seat = position.row * problem.cols + position.col
+        if seats[seat] >= 0:
+            raise ValueError(
+                f"Students '{problem.student_ids[seats[seat]]}' and '{student_id}' "
+                f"share seat ({position.row}, {position.col})"
+            )
+        seats[seat] = problem.index[student_id]
+    return seats
+
+
+def find_violations(problem: CompiledProblem, state: ScoreState) -> List[ConstraintViolation]:
+    """List the constraints and needs an arrangement violates"""
+    ids = problem.student_ids
+    violations = []
+
+    for i in np.flatnonzero(state.seat_of < 0):
+        violations.append(ConstraintViolation(
+            type="unseated",
+            student_ids=[ids[i]],
+            message=f"Student '{ids[i]}' has no seat"
+        ))
+
+    for k in np.flatnonzero(state.pair_penalties > 0):
+        first, second = problem.separate_pairs[k]
+        violations.append(ConstraintViolation(
+            type="separate_pair",
+            student_ids=[ids[first], ids[second]],
+            message=f"Students '{ids[first]}' and '{ids[second]}' should be separated but sit next to each other"
+        ))
+
+    # Incompatible students in adjacent occupied seats (left to right within a row)
+    grid = state.seats.reshape(problem.rows, problem.cols)
+    for row in grid:
+        occupied = row[row >= 0]
+        for left, right in zip(occupied[:-1], occupied[1:]):
+            if problem.incompatible[left, right]:
+                violations.append(ConstraintViolation(
+                    type="incompatible_neighbors",
+                    student_ids=[ids[left], ids[right]],
+                    message=f"Student '{ids[left]}' is incompatible with neighbor '{ids[right]}'"
+                ))
+
+    for i in problem.special_indices:
+        seat = state.seat_of[i]
+        if seat < 0:
+            continue
+        row = seat // problem.cols
+        if problem.front_required[i] and row != 0:
+            violations.append(ConstraintViolation(
+                type="front_row",
+                student_ids=[ids[i]],
+                message=f"Student '{ids[i]}' requires the front row but sits in row {row}"
+            ))
+        if problem.quiet_required[i] and row < problem.rows // 2:
+            violations.append(ConstraintViolation(
+                type="quiet_area",
+                student_ids=[ids[i]],
+                message=f"Student '{ids[i]}' requires a quiet area but sits in row {row}"
+            ))
+
+    return violations
+
+
+def score_arrangement(
+    students: List[Student],
+    layout_type: LayoutType,
+    rows: int,
+    cols: int,
+    student_seats: Dict[str, SeatPosition],
+    objectives: OptimizationObjectives = None,
+    constraints: SeatingConstraints = None
+) -> Tuple[float, ScoreState, List[ConstraintViolation]]:
+    """
+    Score an explicit arrangement
+
+    The compiled problem is cached per roster; if the roster's previous
+    arrangement differs in a few seats only, just the affected rows are
+    rescored.
+
+    Returns:
+        Tuple of (fitness_score, score state, violated constraints)
+    """
+    objectives = objectives or OptimizationObjectives()
+    constraints = constraints or SeatingConstraints()
+
+    fingerprint = roster_fingerprint(students, layout_type, rows, cols, constraints)
+    problem, previous = problem_cache.get_or_compile(fingerprint, students, rows, cols, constraints)
+
+    seats = seats_from_positions(problem, student_seats)
+    if previous is not None and np.count_nonzero(seats != previous.seats) <= settings.SCORING_INCREMENTAL_MAX_CHANGES:
+        state = problem.rescore(previous, seats)
+    else:
+        state = problem.score(seats)
+    problem_cache.store_state(fingerprint, problem, state)
+
+    fitness = objectives.score(state.objective_scores, penalty=state.penalty)
+    return fitness, state, find_violations(problem, state)
+
+
+def compile_roster(
+    students: List[Student],
+    layout_type: LayoutType,
+    rows: int,
+    cols: int,
+    constraints: SeatingConstraints = None
+) -> CompiledProblem:
+    """Get the (cached) compiled problem for a roster"""
+    constraints = constraints or SeatingConstraints()
+    fingerprint = roster_fingerprint(students, layout_type, rows, cols, constraints)
+    problem, _ = problem_cache.get_or_compile(fingerprint, students, rows, cols, constraints)
+    return problem
+
+
+def seat_matrix_from_indices(
+    problem: CompiledProblem,
+    students: List[Student],
+    matrix: Union[np.ndarray, Sequence[Sequence[int]]]
+) -> np.ndarray:
+    """
+    Validate an integer arrangement matrix and map it onto a compiled problem
+
+    Each row lists, per seat in row-major order, the index of the seated
+    student in `students` or -1 for an empty seat. Rows shorter than the
+    number of seats are padded with empty seats, so a GA permutation of
+    student indices is a valid row.
+
+    Raises:
+        ValueError: If the matrix has the wrong shape, unknown student
+            indices or a student seated twice
+    """
+    matrix = np.asarray(matrix, dtype=np.int64)
+    if matrix.ndim != 2:
+        raise ValueError("Arrangement matrix must be two-dimensional")
+    if matrix.shape[1] > problem.total_seats:
+        raise ValueError(
+            f"Arrangement rows have {matrix.shape[1]} seats but the layout has {problem.total_seats}"
+        )
+    if matrix.size and (matrix.min() < -1 or matrix.max() >= len(students)):
+        raise ValueError(f"Student indices must be between -1 and {len(students) - 1}")
+
+    ordered = np.sort(matrix, axis=1)
+    duplicate = (ordered[:, 1:] == ordered[:, :-1]) & (ordered[:, 1:] >= 0)
+    if duplicate.any():
+        row = int(np.flatnonzero(duplicate.any(axis=1))[0])
+        raise ValueError(f"Arrangement {row} seats a student more than once")
+
+    # Map request student order onto the (cached) compiled student order
+    remap = np.array([problem.index[s.id] for s in students] + [-1], dtype=np.int64)
+    seats = np.full((matrix.shape[0], problem.total_seats), -1, dtype=np.int64)
+    seats[:, :matrix.shape[1]] = remap[matrix]
+    return seats
+
+
+def seat_matrix_from_positions(
+    problem: CompiledProblem,
+    arrangements: Sequence[Dict[str, SeatPosition]]
+) -> np.ndarray:
+    """Convert student_id -> seat position mappings to a seat matrix"""
+    seats = np.full((len(arrangements), problem.total_seats), -1, dtype=np.int64)
+    for k, student_seats in enumerate(arrangements):
+        try:
+            seats[k] = seats_from_positions(problem, student_seats)
+        except ValueError as e:
+            raise ValueError(f"Arrangement {k}: {e}")
+    return seats
+
+
+def iter_bulk_scores(
+    problem: CompiledProblem,
+    seats: np.ndarray,
+    objectives: OptimizationObjectives = None,
+    chunk_size: int = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Score a seat matrix chunk by chunk
+
+    Chunking bounds the memory of the vectorized pass for very large N.
+
+    Yields:
+        Per-chunk arrays: per-objective scores, penalty and fitness_score
+    """
+    objectives = objectives or OptimizationObjectives()
+    chunk_size = chunk_size or settings.BULK_SCORING_CHUNK_SIZE
+
+    for start in range(0, len(seats), chunk_size):
+        scores = problem.score_batch(seats[start:start + chunk_size])
+        scores["fitness_score"] = weighted_fitness(scores, objectives)
+        yield scores
+
+
+def score_arrangements(
+    students: List[Student],
+    layout_type: LayoutType,
+    rows: int,
+    cols: int,
+    arrangements: Union[np.ndarray, Sequence[Sequence[int]], Sequence[Dict[str, SeatPosition]]],
+    objectives: OptimizationObjectives = None,
+    constraints: SeatingConstraints = None
+) -> Dict[str, np.ndarray]:
+    """
+    Score many arrangements of one roster
+
+    Args:
+        arrangements: Integer matrix (see seat_matrix_from_indices) or a
+            list of student_id -> seat position mappings
+
+    Returns:
+        Arrays of shape (N,): one per objective, plus penalty and fitness_score
+    """
+    problem = compile_roster(students, layout_type, rows, cols, constraints)
+
+    if len(arrangements) and isinstance(arrangements[0], dict):
+        seats = seat_matrix_from_positions(problem, arrangements)
+    else:
+        seats = seat_matrix_from_indices(problem, students, arrangements)
+
+    chunks = list(iter_bulk_scores(problem, seats, objectives))
+    if not chunks:
+        return {name: np.empty(0) for name in OBJECTIVE_NAMES + ("penalty", "fitness_score")}
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
@@ -0,0 +1,183 @@
+"""
+Shared-Memory Parallel Fitness Evaluation
+Places compiled problem arrays in shared memory for evaluation worker processes
+"""
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.problem import CompiledProblem
+
+logger = logging.getLogger(__name__)
+
+# Worker process state: attached problems by shared block name, least recently used first
+_worker_problems: "OrderedDict[str, Tuple[shared_memory.SharedMemory, CompiledProblem]]" = OrderedDict()
+
+# Problems a worker keeps attached (one per concurrent run it serves)
+WORKER_CACHED_PROBLEMS = 8
+
+# Byte alignment of each array inside the shared block
+ALIGNMENT = 64
+
+# Evaluation pool shared by every run, created on first use
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _pack_layout(problem: CompiledProblem) -> Tuple[List[Tuple[str, str, tuple, int]], int]:
+    """Offsets of every problem array inside one shared block"""
+    layout = []
+    offset = 0
+    for name in CompiledProblem.ARRAY_FIELDS:
+        array = getattr(problem, name)
+        layout.append((name, array.dtype.str, array.shape, offset))
+        offset += math.ceil(max(array.nbytes, 1) / ALIGNMENT) * ALIGNMENT
+    return layout, offset
+
+
+def _attach(shm_name: str, layout: List[Tuple[str, str, tuple, int]], meta: Dict) -> CompiledProblem:
+    """
+    The compiled problem of a shared block, rebuilt on zero-copy,
+    read-only views of it the first time this worker sees the block
+    """
+    if shm_name in _worker_problems:
+        _worker_problems.move_to_end(shm_name)
+        return _worker_problems[shm_name][1]
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = {}
+    for name, dtype, shape, offset in layout:
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        array.flags.writeable = False
+        arrays[name] = array
+    problem = CompiledProblem(**meta, **arrays)
+
+    _worker_problems[shm_name] = (shm, problem)
+    while len(_worker_problems) > WORKER_CACHED_PROBLEMS:
+        # The run owning the block has unlinked it; closing releases the mapping
+        _, (stale, _) = _worker_problems.popitem(last=False)
+        stale.close()
+    return problem
+
+
+def _score_chunk(task) -> Dict[str, np.ndarray]:
+    """Worker task: score a chunk of seat vectors of one run's problem"""
+    shm_name, layout, meta, seats = task
+    return _attach(shm_name, layout, meta).score_batch(seats)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared evaluation pool, grown to at least `workers` processes"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                # Runs still using the old pool finish their pending chunks
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next run starts a fresh one"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_workers = None, 0
+    pool.shutdown(wait=False)
+
+
+def min_chunk_size(population_size: int, workers: int) -> int:
+    """
+    Smallest batch share sent to a worker: half a population's share, so
+    a generation's offspring (most of a population, less cached
+    duplicates) still spread over the workers, but never below
+    GA_PARALLEL_MIN_CHUNK so IPC stays below evaluation time
+    """
+    return max(settings.GA_PARALLEL_MIN_CHUNK, math.ceil(population_size / (2 * workers)))
+
+
+def parallel_workers(population_size: int, workers: int) -> int:
+    """
+    Worker processes a run can keep busy: its largest batch (the initial
+    population) split into chunks of at least min_chunk_size; 1 means
+    every batch stays in-process
+    """
+    if workers <= 1:
+        return 1
+    chunks = population_size // min_chunk_size(population_size, workers)
+    return min(workers, chunks) if chunks >= 2 else 1
+
+
+class ParallelEvaluator:
+    """
+    Scores batches of arrangements across worker processes.
+
+    The compiled problem (student attributes, relation matrix, seat
+    geometry) is copied once into `multiprocessing.shared_memory`; workers
+    attach to it on their first chunk of the run, so only seat index
+    arrays and score arrays cross process boundaries. Worker processes
+    live in one pool shared by all runs, so a run doesn't pay their
+    start-up. Batches are split into at most one chunk per worker, and
+    batches too small to amortize IPC are scored in-process.
+
+    Use as a context manager so the shared block is released.
+    """
+
+    def __init__(self, problem: CompiledProblem, workers: int, population_size: int):
+        self.problem = problem
+        self.workers = workers
+        self.min_chunk_size = min_chunk_size(population_size, workers)
+
+        layout, size = _pack_layout(problem)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name, dtype, shape, offset in layout:
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)
+            view[...] = getattr(problem, name)
+
+        meta = {
+            "student_ids": problem.student_ids,
+            "rows": problem.rows,
+            "cols": problem.cols,
+            "num_languages": problem.num_languages,
+        }
+        self._task = (self._shm.name, layout, meta)
+
+    def score_batch(self, seats: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score a (N, total_seats) matrix, in parallel when N is large enough"""
+        n = len(seats)
+        if n < 2 * self.min_chunk_size:
+            return self.problem.score_batch(seats)
+
+        chunk_size = max(self.min_chunk_size, math.ceil(n / self.workers))
+        chunks = [(*self._task, seats[start:start + chunk_size]) for start in range(0, n, chunk_size)]
+        pool = _get_pool(self.workers)
+        try:
+            results = list(pool.map(_score_chunk, chunks))
+        except BrokenProcessPool:
+            logger.warning("Evaluation pool broke (worker killed?); scoring this batch in-process")
+            _discard_pool(pool)
+            return self.problem.score_batch(seats)
+        return {name: np.concatenate([result[name] for result in results]) for name in results[0]}
+
+    def close(self):
+        """Release the shared block (the pool stays up for later runs)"""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "ParallelEvaluator":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
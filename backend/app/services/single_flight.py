@@ -0,0 +1,120 @@
+"""
+Single-Flight Coalescing
+Concurrent identical requests share one running execution
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Checks whether a waiting client has gone away
+DisconnectCheck = Callable[[], Awaitable[bool]]
+
+
+class IdempotencyKeyReused(Exception):
+    """A key in flight was sent again with a different request"""
+
+    def __init__(self, key: str):
+        super().__init__(f"Key {key} is in flight for a different request")
+        self.key = key
+
+
+@dataclass
+class Flight:
+    """One running execution and the clients waiting for it"""
+    fingerprint: str  # Hash of the request the flight runs
+    waiters: List[DisconnectCheck] = field(default_factory=list)
+    task: Optional[asyncio.Future] = None
+
+    async def all_disconnected(self) -> bool:
+        """Whether every waiting client has gone away"""
+        for is_disconnected in list(self.waiters):
+            if not await is_disconnected():
+                return False
+        return True
+
+
+class SingleFlight:
+    """
+    Runs at most one execution per key at a time; callers arriving while
+    it runs wait for it and receive the same result (or exception).
+
+    The execution runs as its own task, so it outlives the request that
+    started it. It is given a disconnect check that only reports True once
+    every waiting client is gone, and it is cancelled when the last waiter
+    is. Nothing is kept once it finishes: later callers start a new one.
+    """
+
+    def __init__(self, cost: Optional[Callable[[Any], float]] = None):
+        """
+        Args:
+            cost: CPU seconds of a finished execution's result; each
+                coalesced caller is counted as saving that much
+        """
+        self.cost = cost
+        self._flights: Dict[str, Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.conflicts = 0
+        self.cpu_seconds_saved = 0.0
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        func: Callable[[DisconnectCheck], Awaitable[Any]],
+        is_disconnected: DisconnectCheck
+    ) -> Any:
+        """
+        Result of func(all_disconnected) for `key`, joining a running execution if any
+
+        Raises:
+            IdempotencyKeyReused: If `key` is running for a different fingerprint
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            if flight.fingerprint != fingerprint:
+                self.conflicts += 1
+                raise IdempotencyKeyReused(key)
+            self.coalesced += 1
+            logger.info(f"Coalesced request onto running execution ({len(flight.waiters)} already waiting)")
+        else:
+            flight = Flight(fingerprint=fingerprint)
+            flight.task = asyncio.ensure_future(func(flight.all_disconnected))
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self._flights[key] = flight
+            self.executions += 1
+
+        flight.waiters.append(is_disconnected)
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters.remove(is_disconnected)
+            if not flight.waiters and not flight.task.done():
+                # Later callers start afresh rather than join a dying flight
+                self._finish(key, flight)
+                flight.task.cancel()
+            raise
+
+        if shared and self.cost is not None:
+            self.cpu_seconds_saved += self.cost(result)
+        return result
+
+    def _finish(self, key: str, flight: Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def get_stats(self) -> Dict:
+        """Coalescing statistics"""
+        return {
+            "in_flight": len(self._flights),
+            "waiting": sum(len(flight.waiters) for flight in self._flights.values()),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "key_conflicts": self.conflicts,
+            "cpu_seconds_saved": round(self.cpu_seconds_saved, 3),
+        }
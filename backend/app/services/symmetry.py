@@ -0,0 +1,101 @@
+"""
+Arrangement Symmetries
+Canonical hashing of GA individuals under the fitness-preserving symmetries of a layout
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from app.services.problem import CompiledProblem
+
+# Fixed so hashes are stable across runs and processes
+_TABLE_SEED = 0x5EA7
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (uint64 arithmetic wraps)"""
+    values = values + _GOLDEN
+    values = (values ^ (values >> np.uint64(30))) * _MIX1
+    values = (values ^ (values >> np.uint64(27))) * _MIX2
+    return values ^ (values >> np.uint64(31))
+
+
+class ArrangementHasher:
+    """
+    Hashes GA individuals (student order, filled row-major) so that
+    arrangements with provably equal fitness get equal hashes.
+
+    Symmetries of CompiledProblem scoring:
+    - Rows with the same occupancy and the same special-needs standing
+      (front row if anyone needs it, quiet half if anyone needs it) can be
+      exchanged: every objective is an average over rows, special needs
+      only look at the row index, and separation pairs only at
+      neighbors within a row.
+    - Reversing the occupied seats of a row keeps its neighbors, so it is
+      a symmetry when pair scores are symmetric (no one-sided friend or
+      incompatibility links).
+
+    Swapping two students within a row is not a symmetry: it changes who
+    sits next to whom. Hashes are 64-bit, so distinct classes collide
+    with negligible probability.
+    """
+
+    def __init__(self, problem: CompiledProblem):
+        self.num_students = problem.num_students
+        self.rows = problem.rows
+        self.cols = problem.cols
+        self.total_seats = problem.total_seats
+        self.row_reversal = bool(np.array_equal(problem.pair_score, problem.pair_score.T))
+
+        # Row occupancy is fixed by the row-major fill
+        counts = np.clip(problem.num_students - np.arange(problem.rows) * problem.cols, 0, problem.cols)
+        rows = np.arange(problem.rows)
+        front = (rows == 0) & bool(problem.front_required.any())
+        quiet = (rows >= problem.rows // 2) & bool(problem.quiet_required.any())
+        classes: Dict[tuple, list] = {}
+        for row in rows:
+            classes.setdefault((int(counts[row]), bool(front[row]), bool(quiet[row])), []).append(row)
+        self.row_classes = [np.array(members) for members in classes.values()]
+
+        # Zobrist table per column; index num_students marks an empty seat
+        rng = np.random.default_rng(_TABLE_SEED)
+        self._table = rng.integers(0, 2 ** 64, size=(problem.cols, problem.num_students + 1), dtype=np.uint64)
+        self._forward = np.broadcast_to(np.arange(problem.cols), (problem.rows, problem.cols))
+        cols = np.arange(problem.cols)
+        self._reversed = np.where(cols < counts[:, None], counts[:, None] - 1 - cols, cols)
+        self._class_salts = rng.integers(0, 2 ** 64, size=len(self.row_classes), dtype=np.uint64)
+
+    def hash_batch(self, orders: np.ndarray) -> np.ndarray:
+        """
+        Canonical hashes of many individuals
+
+        Args:
+            orders: (N, num_students) student indices in seat order
+
+        Returns:
+            (N,) uint64 hashes
+        """
+        orders = np.asarray(orders, dtype=np.int64)
+        seats = np.full((len(orders), self.total_seats), self.num_students, dtype=np.int64)
+        seats[:, :self.num_students] = orders
+        grid = seats.reshape(-1, self.rows, self.cols)
+
+        row_hashes = np.bitwise_xor.reduce(self._table[self._forward, grid], axis=-1)
+        if self.row_reversal:
+            reversed_hashes = np.bitwise_xor.reduce(self._table[self._reversed, grid], axis=-1)
+            row_hashes = np.minimum(row_hashes, reversed_hashes)
+
+        # Rows of a class form a multiset: sum their mixed hashes
+        mixed = _mix64(row_hashes)
+        result = np.zeros(len(orders), dtype=np.uint64)
+        for members, salt in zip(self.row_classes, self._class_salts):
+            result ^= _mix64(mixed[:, members].sum(axis=-1, dtype=np.uint64) + salt)
+        return result
+
+    def hash_one(self, order: Sequence[int]) -> int:
+        """Canonical hash of one individual"""
+        return int(self.hash_batch(np.asarray(order)[None, :])[0])
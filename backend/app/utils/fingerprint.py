@@ -0,0 +1,38 @@
+"""
+Roster Fingerprinting
+Stable content hashes for rosters and classroom layouts
+"""
+
+import hashlib
+import json
+from typing import List, Optional
+
+from app.models.student import Student
+from app.models.classroom import LayoutType, SeatingConstraints
+
+
+def roster_fingerprint(
+    students: List[Student],
+    layout_type: LayoutType,
+    rows: int,
+    cols: int,
+    constraints: Optional[SeatingConstraints] = None
+) -> str:
+    """
+    Hash a roster together with its layout and constraints
+
+    Independent of student order and of objective weights, so the same class
+    in the same room maps to the same fingerprint across requests.
+    """
+    payload = {
+        "students": sorted(
+            (student.model_dump(mode="json") for student in students),
+            key=lambda student: student["id"]
+        ),
+        "layout_type": LayoutType(layout_type).value,
+        "rows": rows,
+        "cols": cols,
+        "constraints": (constraints or SeatingConstraints()).model_dump(mode="json"),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
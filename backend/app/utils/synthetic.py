@@ -0,0 +1,99 @@
+"""
+Synthetic Roster Generator
+Deterministic fake classes for load tests, benchmarks and tuning
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from app.models.student import Student, GenderType, AcademicLevel, BehaviorLevel, SpecialNeed
+
+LANGUAGES = ["Hebrew", "Arabic", "Russian", "English", "Amharic"]
+
+FIRST_NAMES = ["Noa", "Yosef", "Maya", "Omar", "Lior", "Dana", "Adam", "Lina", "Eitan", "Sara", "Ami", "Rana"]
+LAST_NAMES = ["Cohen", "Levi", "Haddad", "Mizrahi", "Khoury", "Peretz", "Biton", "Saleh", "Friedman", "Azulay"]
+
+
+def _academic_level(score: float) -> AcademicLevel:
+    if score >= 85:
+        return AcademicLevel.ADVANCED
+    if score >= 70:
+        return AcademicLevel.PROFICIENT
+    if score >= 55:
+        return AcademicLevel.BASIC
+    return AcademicLevel.BELOW_BASIC
+
+
+def _behavior_level(score: float) -> BehaviorLevel:
+    if score >= 85:
+        return BehaviorLevel.EXCELLENT
+    if score >= 70:
+        return BehaviorLevel.GOOD
+    if score >= 55:
+        return BehaviorLevel.AVERAGE
+    return BehaviorLevel.CHALLENGING
+
+
+def generate_roster_dicts(
+    num_students: int,
+    seed: Optional[int] = None,
+    front_row_share: float = 0.08,
+    special_needs_share: float = 0.1,
+    friends_per_student: float = 1.5,
+    incompatible_share: float = 0.1,
+    id_prefix: str = "S"
+) -> List[Dict]:
+    """
+    Generate a synthetic roster as JSON-ready dicts (request payload format)
+
+    Same seed, same roster.
+    """
+    rng = random.Random(seed)
+    ids = [f"{id_prefix}{i:04d}" for i in range(num_students)]
+    roster = []
+
+    for i, student_id in enumerate(ids):
+        academic = min(100.0, max(0.0, rng.gauss(72, 14)))
+        behavior = min(100.0, max(0.0, rng.gauss(75, 12)))
+        others = ids[:i] + ids[i + 1:]
+
+        num_friends = min(len(others), int(rng.expovariate(1 / friends_per_student))) if friends_per_student else 0
+        incompatible = rng.sample(others, 1) if others and rng.random() < incompatible_share else []
+        needs_support = rng.random() < special_needs_share
+
+        roster.append({
+            "id": student_id,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "gender": rng.choice([GenderType.MALE.value, GenderType.FEMALE.value]),
+            "age": rng.randint(8, 16),
+            "academic_level": _academic_level(academic).value,
+            "academic_score": round(academic, 1),
+            "behavior_level": _behavior_level(behavior).value,
+            "behavior_score": round(behavior, 1),
+            "friends_ids": rng.sample(others, num_friends),
+            "incompatible_ids": incompatible,
+            "special_needs": (
+                [SpecialNeed(type=rng.choice(["adhd", "dyslexia", "hearing"])).model_dump()]
+                if needs_support else []
+            ),
+            "requires_front_row": rng.random() < front_row_share,
+            "requires_quiet_area": needs_support and rng.random() < 0.5,
+            "primary_language": rng.choice(LANGUAGES[:3]) if rng.random() < 0.9 else rng.choice(LANGUAGES),
+        })
+
+    return roster
+
+
+def generate_roster(num_students: int, seed: Optional[int] = None, **kwargs) -> List[Student]:
+    """Generate a synthetic roster of Student models (see generate_roster_dicts)"""
+    return [Student(**student) for student in generate_roster_dicts(num_students, seed=seed, **kwargs)]
+
+
+def layout_for(num_students: int, cols: int = 6) -> Dict[str, int]:
+    """Smallest rows x cols layout (at most 20x20) that fits the students"""
+    cols = min(max(cols, 1), 20)
+    rows = max(1, -(-num_students // cols))
+    if rows > 20:
+        cols = min(20, -(-num_students // 20))
+        rows = max(1, -(-num_students // cols))
+    return {"rows": rows, "cols": cols}
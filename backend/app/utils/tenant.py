@@ -0,0 +1,53 @@
+"""
+Client and Tenant Identification
+Shared by the rate limiter and the optimization scheduler
+"""
+
+import hashlib
+
+from starlette.requests import HTTPConnection
+
+
+def get_client_ip(request: HTTPConnection) -> str:
+    """
+    Get client IP address from request.
+
+    Handles proxy headers (X-Forwarded-For, X-Real-IP)
+    """
+    # Check for forwarded IP (behind proxy/load balancer)
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        # Take the first IP (original client)
+        return forwarded_for.split(",")[0].strip()
+
+    # Check for real IP header
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return real_ip
+
+    # Fall back to direct connection IP
+    if request.client:
+        return request.client.host
+
+    return "unknown"
+
+
+def get_tenant_id(request: HTTPConnection) -> str:
+    """
+    Identify the tenant (school or deployment) a request belongs to
+
+    Uses the X-API-Key header (hashed, never stored raw), then the Origin
+    header, then the client IP.
+
+    Returns:
+        Tenant id such as "key:1f2e3d4c5b6a7988", "origin:https://school.example" or "ip:10.0.0.7"
+    """
+    api_key = request.headers.get("X-API-Key")
+    if api_key:
+        return f"key:{hashlib.sha256(api_key.encode()).hexdigest()[:16]}"
+
+    origin = request.headers.get("Origin")
+    if origin and origin != "null":
+        return f"origin:{origin.rstrip('/').lower()}"
+
+    return f"ip:{get_client_ip(request)}"
@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # Render Build Script for Python Backend
-# This script ensures numpy and scipy are installed from binary wheels
+# This script ensures numpy is installed from binary wheels
 
 set -e  # Exit on error
 
@@ -0,0 +1,444 @@
+"""
+Solution Quality vs. CPU Time Benchmark
+Runs ClassroomOptimizer over a fixed roster corpus under many seeds and
+solver configurations, records the best fitness over time (anytime
+curves) and reports which configurations reach good seatings cheapest.
+
+Usage (from the backend directory):
+    python scripts/benchmark_quality.py --out bench/quality
+
+    # Sweep population size, generations and operators over 10 seeds
+    python scripts/benchmark_quality.py --populations 50,100,200 --generations 50,100,200 \
+        --operators ordered/swap,pmx/swap,ordered/inversion,adaptive --seeds 10
+
+    # Add real rosters (request-body JSON files, anonymized on load)
+    python scripts/benchmark_quality.py --rosters data/rosters --no-synthetic
+
+Quality is the fitness reached divided by the best fitness any run found
+for the same roster, so rosters of different difficulty can be averaged.
+Curves use per-run CPU time, which stays comparable with --jobs > 1;
+wall-clock times are recorded alongside. Plots are written when
+matplotlib is installed.
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.utils.synthetic import generate_roster_dicts, layout_for  # noqa: E402
+
+# Fixed synthetic corpus: (name, students, generator options, roster seed)
+SYNTHETIC_CORPUS = [
+    ("small", 18, {}, 101),
+    ("typical", 30, {}, 102),
+    ("constrained", 30, {"front_row_share": 0.15, "special_needs_share": 0.25, "incompatible_share": 0.3}, 103),
+    ("large", 45, {}, 104),
+    ("social", 36, {"friends_per_student": 3.0, "incompatible_share": 0.2}, 105),
+]
+
+# Share of the best known fitness counted as "reached"
+REACH_THRESHOLD = 0.99
+# Quality loss accepted when recommending the cheapest configuration
+RECOMMEND_TOLERANCE = 0.005
+CURVE_POINTS = 16
+
+
+@dataclass(frozen=True)
+class SolverConfig:
+    """One point of the parameter sweep"""
+    population: int
+    generations: int
+    crossover: str = "ordered"
+    mutation: str = "swap"
+    adaptive: bool = False
+
+    @property
+    def label(self) -> str:
+        operators = "adaptive" if self.adaptive else f"{self.crossover}/{self.mutation}"
+        return f"p{self.population}-g{self.generations}-{operators}"
+
+
+@dataclass
+class Roster:
+    """A benchmark roster in request-body form"""
+    name: str
+    students: List[Dict]
+    rows: int
+    cols: int
+    constraints: Optional[Dict] = None
+    objectives: Optional[Dict] = None
+
+
+def synthetic_corpus() -> List[Roster]:
+    return [
+        Roster(name=name, students=generate_roster_dicts(n, seed=seed, **options), **layout_for(n))
+        for name, n, options, seed in SYNTHETIC_CORPUS
+    ]
+
+
+def anonymize(students: List[Dict], constraints: Optional[Dict]) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    Replace ids and names and drop free text, keeping everything the
+    optimizer scores on
+    """
+    ids = {student["id"]: f"R{k:04d}" for k, student in enumerate(students)}
+
+    def remap(values):
+        return [ids[value] for value in values if value in ids]
+
+    anonymized = []
+    for k, student in enumerate(students):
+        student = dict(student)
+        student["id"] = ids[student["id"]]
+        student["name"] = f"Student {k}"
+        student["friends_ids"] = remap(student.get("friends_ids", []))
+        student["incompatible_ids"] = remap(student.get("incompatible_ids", []))
+        student["special_needs"] = [
+            {**need, "description": None} for need in student.get("special_needs", [])
+        ]
+        for field in ("notes", "cultural_background"):
+            student.pop(field, None)
+        anonymized.append(student)
+
+    if constraints:
+        constraints = dict(constraints)
+        for field in ("separate_student_pairs", "keep_student_pairs_together"):
+            constraints[field] = [remap(pair) for pair in constraints.get(field, [])]
+        for field in ("front_row_student_ids", "back_row_student_ids"):
+            constraints[field] = remap(constraints.get(field, []))
+
+    return anonymized, constraints
+
+
+def load_rosters(directory: str) -> List[Roster]:
+    """Load *.json request bodies ({"students", "rows", "cols", ...}) from a directory"""
+    rosters = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            body = json.load(f)
+        students, constraints = anonymize(body["students"], body.get("constraints"))
+        layout = layout_for(len(students))
+        rosters.append(Roster(
+            # Hashed so file names (often class or teacher names) don't leak into results
+            name="file-" + hashlib.sha1(os.path.basename(path).encode()).hexdigest()[:8],
+            students=students,
+            rows=body.get("rows", layout["rows"]),
+            cols=body.get("cols", layout["cols"]),
+            constraints=constraints,
+            objectives=body.get("objectives"),
+        ))
+    return rosters
+
+
+def run_one(task: Tuple[Roster, SolverConfig, int]) -> Dict:
+    """Run one (roster, configuration, seed) and record its anytime curve"""
+    from app.models.classroom import LayoutType, OptimizationObjectives, SeatingConstraints
+    from app.models.student import Student
+    from app.services.adaptive import CROSSOVER_OPERATORS, MUTATION_OPERATORS
+    from app.services.genetic_algorithm import ClassroomOptimizer
+
+    roster, config, seed = task
+    settings.GA_POPULATION_SIZE = config.population
+    settings.MEMORY_PROFILER = "off"
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    optimizer = ClassroomOptimizer(
+        students=[Student(**student) for student in roster.students],
+        layout_type=LayoutType.ROWS,
+        rows=roster.rows,
+        cols=roster.cols,
+        objectives=OptimizationObjectives(**(roster.objectives or {})),
+        constraints=SeatingConstraints(**(roster.constraints or {})),
+        seed=seed
+    )
+    if not config.adaptive:
+        optimizer.toolbox.register("mate", CROSSOVER_OPERATORS[config.crossover], rng=optimizer.rng)
+        optimizer.toolbox.register(
+            "mutate", MUTATION_OPERATORS[config.mutation], indpb=settings.GA_MUTATION_INDPB, rng=optimizer.rng
+        )
+
+    curve = []
+    best = -math.inf
+
+    def on_generation(generation: int, population):
+        nonlocal best
+        best = max(best, max(individual.fitness.values[0] for individual in population))
+        curve.append([
+            generation,
+            round(time.process_time() - cpu_start, 5),
+            round(time.perf_counter() - wall_start, 5),
+            best,
+        ])
+
+    result = optimizer.optimize(
+        max_generations=config.generations,
+        adaptive=config.adaptive,
+        workers=1,
+        on_generation=on_generation
+    )
+
+    return {
+        "roster": roster.name,
+        "students": len(roster.students),
+        "config": config.label,
+        "params": asdict(config),
+        "seed": seed,
+        "fitness": result.fitness_score,
+        "cpu_seconds": round(time.process_time() - cpu_start, 5),
+        "wall_seconds": round(time.perf_counter() - wall_start, 5),
+        "evaluations": result.diagnostics["evaluations"],
+        "curve": curve,  # [generation, cpu seconds, wall seconds, best fitness so far]
+    }
+
+
+def quality_at(run: Dict, best_known: float, cpu_seconds: float) -> float:
+    """Best-so-far quality of a run at a CPU time (0 before its first generation)"""
+    quality = 0.0
+    for _, cpu, _, best in run["curve"]:
+        if cpu > cpu_seconds:
+            break
+        quality = best / best_known
+    return quality
+
+
+def time_to_reach(run: Dict, target: float) -> Optional[float]:
+    """CPU seconds until the run's best fitness reached target (None if never)"""
+    for _, cpu, _, best in run["curve"]:
+        if best >= target:
+            return cpu
+    return None
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    """Per-configuration quality/cost table and averaged anytime curves"""
+    best_known = {}
+    for run in runs:
+        best_known[run["roster"]] = max(best_known.get(run["roster"], 0.0), run["fitness"])
+
+    max_cpu = max(run["cpu_seconds"] for run in runs)
+    min_cpu = min(run["curve"][0][1] for run in runs if run["curve"]) or 1e-3
+    grid = [
+        min_cpu * (max_cpu / min_cpu) ** (k / (CURVE_POINTS - 1))
+        for k in range(CURVE_POINTS)
+    ]
+
+    by_config: Dict[str, List[Dict]] = {}
+    for run in runs:
+        by_config.setdefault(run["config"], []).append(run)
+
+    table = []
+    curves = {}
+    for label, config_runs in by_config.items():
+        qualities = sorted(run["fitness"] / best_known[run["roster"]] for run in config_runs)
+        reach_times = [
+            time_to_reach(run, REACH_THRESHOLD * best_known[run["roster"]]) for run in config_runs
+        ]
+        reached = [t for t in reach_times if t is not None]
+        table.append({
+            "config": label,
+            **config_runs[0]["params"],
+            "runs": len(config_runs),
+            "mean_fitness": round(statistics.mean(run["fitness"] for run in config_runs), 5),
+            "mean_quality": round(statistics.mean(qualities), 5),
+            "p10_quality": round(qualities[int(0.1 * (len(qualities) - 1))], 5),
+            "median_cpu_seconds": round(statistics.median(run["cpu_seconds"] for run in config_runs), 4),
+            "median_wall_seconds": round(statistics.median(run["wall_seconds"] for run in config_runs), 4),
+            "mean_evaluations": round(statistics.mean(run["evaluations"] for run in config_runs)),
+            "reached_share": round(len(reached) / len(config_runs), 3),
+            "median_cpu_to_reach": round(statistics.median(reached), 4) if reached else None,
+        })
+        curves[label] = [
+            round(statistics.mean(quality_at(run, best_known[run["roster"]], t) for run in config_runs), 5)
+            for t in grid
+        ]
+
+    table.sort(key=lambda row: row["median_cpu_seconds"])
+
+    # Configurations no other one beats on both quality and CPU time
+    efficient = [
+        row["config"] for row in table
+        if not any(
+            other["mean_quality"] >= row["mean_quality"]
+            and other["median_cpu_seconds"] <= row["median_cpu_seconds"]
+            and (other["mean_quality"], other["median_cpu_seconds"]) != (row["mean_quality"], row["median_cpu_seconds"])
+            for other in table
+        )
+    ]
+    top_quality = max(row["mean_quality"] for row in table)
+    recommended = min(
+        (row for row in table if row["mean_quality"] >= top_quality - RECOMMEND_TOLERANCE),
+        key=lambda row: row["median_cpu_seconds"]
+    )
+
+    return {
+        "best_known": best_known,
+        "table": table,
+        "efficient": efficient,
+        "recommended": recommended,
+        "curve_cpu_seconds": [round(t, 5) for t in grid],
+        "curves": curves,
+    }
+
+
+def print_summary(summary: Dict):
+    print(f"{'config':<30} {'runs':>5} {'quality':>8} {'p10':>7} {'cpu s':>8} "
+          f"{'reach %':>8} {'cpu@99%':>8} {'evals':>8}")
+    for row in summary["table"]:
+        reach = f"{row['median_cpu_to_reach']:>8.3f}" if row["median_cpu_to_reach"] is not None else f"{'-':>8}"
+        marker = " *" if row["config"] in summary["efficient"] else ""
+        print(f"{row['config']:<30} {row['runs']:>5} {row['mean_quality']:>8.4f} {row['p10_quality']:>7.4f} "
+              f"{row['median_cpu_seconds']:>8.3f} {100 * row['reached_share']:>8.1f} {reach} "
+              f"{row['mean_evaluations']:>8}{marker}")
+    print("\n* not beaten on both quality and CPU time by another configuration")
+
+    best = summary["recommended"]
+    print(f"\nCheapest configuration within {RECOMMEND_TOLERANCE:.1%} of the best mean quality: {best['config']}")
+    if not best["adaptive"]:
+        print(f"  GA_POPULATION_SIZE={best['population']}  GA_GENERATIONS={best['generations']}")
+
+
+def write_outputs(out_dir: str, runs: List[Dict], summary: Dict, meta: Dict):
+    os.makedirs(out_dir, exist_ok=True)
+
+    with open(os.path.join(out_dir, "runs.jsonl"), "w", encoding="utf-8") as f:
+        for run in runs:
+            f.write(json.dumps(run) + "\n")
+
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, **summary}, f, indent=2)
+
+    with open(os.path.join(out_dir, "summary.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(summary["table"][0]))
+        writer.writeheader()
+        writer.writerows(summary["table"])
+
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print(f"\nWrote {out_dir}/runs.jsonl, summary.json, summary.csv (install matplotlib for plots)")
+        return
+
+    fig, ax = plt.subplots(figsize=(9, 5.5))
+    for label, curve in summary["curves"].items():
+        ax.plot(summary["curve_cpu_seconds"], curve, label=label)
+    ax.set_xscale("log")
+    ax.set_xlabel("CPU seconds")
+    ax.set_ylabel("Mean best fitness / best known")
+    ax.set_title("Anytime quality")
+    ax.grid(True, alpha=0.3)
+    ax.legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(os.path.join(out_dir, "anytime.png"), dpi=120)
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    for row in summary["table"]:
+        ax.scatter(row["median_cpu_seconds"], row["mean_quality"],
+                   marker="o" if row["config"] in summary["efficient"] else "x")
+        ax.annotate(row["config"], (row["median_cpu_seconds"], row["mean_quality"]), fontsize=7)
+    ax.set_xscale("log")
+    ax.set_xlabel("Median CPU seconds per run")
+    ax.set_ylabel("Mean final quality")
+    ax.set_title("Quality vs. cost")
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(os.path.join(out_dir, "quality_vs_cpu.png"), dpi=120)
+
+    print(f"\nWrote {out_dir}/runs.jsonl, summary.json, summary.csv, anytime.png, quality_vs_cpu.png")
+
+
+def parse_operators(spec: str) -> List[Tuple[str, str, bool]]:
+    """"ordered/swap,pmx/inversion,adaptive" -> [(crossover, mutation, adaptive), ...]"""
+    operators = []
+    for item in spec.split(","):
+        if item == "adaptive":
+            operators.append(("ordered", "swap", True))
+        else:
+            crossover, mutation = item.split("/")
+            operators.append((crossover, mutation, False))
+    return operators
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark seating quality against CPU time")
+    parser.add_argument("--populations", default="50,100", help="Comma-separated population sizes")
+    parser.add_argument("--generations", default="50,100", help="Comma-separated generation counts")
+    parser.add_argument("--operators", default="ordered/swap",
+                        help="Comma-separated crossover/mutation pairs (ordered|pmx / swap|inversion) or 'adaptive'")
+    parser.add_argument("--seeds", type=int, default=3, help="Optimizer seeds per roster and configuration")
+    parser.add_argument("--rosters", help="Directory of roster JSON files (request bodies) to add")
+    parser.add_argument("--no-synthetic", action="store_true", help="Skip the built-in synthetic corpus")
+    parser.add_argument("--jobs", type=int, default=1, help="Runs in parallel (processes)")
+    parser.add_argument("--out", help="Directory for runs.jsonl, summary files and plots")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    rosters = [] if args.no_synthetic else synthetic_corpus()
+    if args.rosters:
+        rosters += load_rosters(args.rosters)
+    if not rosters:
+        parser.error("No rosters to benchmark")
+
+    configs = [
+        SolverConfig(population=int(p), generations=int(g), crossover=cx, mutation=mut, adaptive=adaptive)
+        for p in args.populations.split(",")
+        for g in args.generations.split(",")
+        for cx, mut, adaptive in parse_operators(args.operators)
+    ]
+    tasks = [(roster, config, seed) for config in configs for roster in rosters for seed in range(args.seeds)]
+    print(f"{len(tasks)} runs: {len(configs)} configurations x {len(rosters)} rosters x {args.seeds} seeds",
+          file=sys.stderr)
+
+    started = time.perf_counter()
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            runs = list(pool.map(run_one, tasks))
+    else:
+        runs = [run_one(task) for task in tasks]
+
+    summary = summarize(runs)
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jobs": args.jobs,
+        "seeds": args.seeds,
+        "rosters": {roster.name: len(roster.students) for roster in rosters},
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+        "settings": {
+            "GA_CROSSOVER_RATE": settings.GA_CROSSOVER_RATE,
+            "GA_MUTATION_RATE": settings.GA_MUTATION_RATE,
+            "GA_MUTATION_INDPB": settings.GA_MUTATION_INDPB,
+        },
+    }
+
+    if args.json:
+        print(json.dumps({"meta": meta, **summary}, indent=2))
+    else:
+        print_summary(summary)
+    if args.out:
+        write_outputs(args.out, runs, summary, meta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+HTTP Load Test Harness
+Drives /api/v1/optimize/classroom and /health with concurrent synthetic
+teachers and reports throughput, latency percentiles, 429 rates and
+event-loop lag.
+
+Usage (from the backend directory):
+    # In-process (ASGI transport, same event loop as the app)
+    python scripts/loadtest.py --concurrency 8 --requests 200
+
+    # Against a running server
+    python scripts/loadtest.py --url http://127.0.0.1:8000 --concurrency 16 --duration 60
+
+    # Mix of class sizes and generation counts, 50 distinct client IPs
+    python scripts/loadtest.py --students 12,30,60 --generations 20,50 --clients 50
+
+    # Repeat identical bodies to measure request coalescing
+    python scripts/loadtest.py --coalesce --concurrency 8
+
+Every optimize request carries its own seed unless --coalesce is given,
+so identical in-flight requests (which the server coalesces) don't
+inflate throughput. The server's coalescing counters over the run are
+reported next to the results.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.synthetic import generate_roster_dicts, layout_for  # noqa: E402
+
+OPTIMIZE_PATH = "/api/v1/optimize/classroom"
+QUEUE_PATH = "/api/v1/optimize/queue"
+HEALTH_PATH = "/health"
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag as the overshoot of a periodic sleep"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def build_payloads(student_counts: List[int], generations: List[int], seed: int) -> List[Dict]:
+    """One optimize payload per (roster size, generations) combination"""
+    payloads = []
+    for n in student_counts:
+        students = generate_roster_dicts(n, seed=seed + n)
+        for gens in generations:
+            payloads.append({
+                "label": f"{n} students / {gens} gens",
+                "body": {"students": students, "max_generations": gens, **layout_for(n)},
+            })
+    return payloads
+
+
+async def coalescing_stats(client: httpx.AsyncClient) -> Optional[Dict]:
+    """The server's request coalescing counters, or None if unavailable"""
+    try:
+        response = await client.get(QUEUE_PATH)
+        response.raise_for_status()
+        return response.json()["coalescing"]
+    except (httpx.HTTPError, ValueError, KeyError):
+        return None
+
+
+async def run_load(args) -> Dict:
+    payloads = build_payloads(args.students, args.generations, args.seed)
+    rng = random.Random(args.seed)
+    client_ips = [f"10.0.{i // 250}.{i % 250 + 1}" for i in range(args.clients)]
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+
+    results: Dict[str, List] = defaultdict(list)
+    sequence = itertools.count()
+    budget = {"remaining": args.requests}
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def next_request() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        if budget["remaining"] <= 0:
+            return False
+        budget["remaining"] -= 1
+        return True
+
+    async def worker():
+        while next_request():
+            headers = {"X-Forwarded-For": rng.choice(client_ips)}
+            if rng.random() < args.health_ratio:
+                label, method, path, body = "health", "GET", HEALTH_PATH, None
+            else:
+                payload = rng.choice(payloads)
+                label, method, path, body = payload["label"], "POST", OPTIMIZE_PATH, payload["body"]
+                if not args.coalesce:
+                    body = {**body, "seed": args.seed * 1_000_000 + next(sequence)}
+
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body, headers=headers)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            results[label].append((time.perf_counter() - started, status))
+
+    monitor = LoopLagMonitor()
+    async with client:
+        before = await coalescing_stats(client)
+        monitor.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        await monitor.stop()
+        after = await coalescing_stats(client)
+
+    coalescing = None
+    if before is not None and after is not None:
+        # Counters over this run only (a running server may have served others)
+        coalescing = {
+            key: round(after[key] - before[key], 3)
+            for key in ("executions", "coalesced", "key_conflicts", "cpu_seconds_saved")
+        }
+
+    report = {
+        "mode": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "clients": args.clients,
+        "coalesce": args.coalesce,
+        "elapsed_seconds": round(elapsed, 3),
+        "endpoints": {},
+        "event_loop_lag_ms": {
+            "p50": round((percentile(monitor.samples, 50) or 0) * 1000, 2),
+            "p99": round((percentile(monitor.samples, 99) or 0) * 1000, 2),
+            "max": round(max(monitor.samples, default=0) * 1000, 2),
+        },
+    }
+    total = 0
+    for label, samples in sorted(results.items()):
+        latencies = [latency for latency, status in samples if status == 200]
+        statuses = Counter(str(status) for _, status in samples)
+        total += len(samples)
+        report["endpoints"][label] = {
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+            "rate_limited_pct": round(100 * statuses.get("429", 0) / len(samples), 1),
+            "statuses": dict(statuses),
+        }
+    report["total_requests"] = total
+    report["throughput_rps"] = round(total / elapsed, 2)
+    report["coalescing"] = coalescing
+    return report
+
+
+def print_report(report: Dict):
+    print(f"Mode: {report['mode']}  concurrency={report['concurrency']}  clients={report['clients']}  "
+          f"bodies={'repeated' if report['coalesce'] else 'distinct seeds'}")
+    print(f"{report['total_requests']} requests in {report['elapsed_seconds']}s "
+          f"({report['throughput_rps']} req/s)\n")
+    print(f"{'endpoint':<26} {'reqs':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'429 %':>6}")
+    for label, stats in report["endpoints"].items():
+        def fmt(value):
+            return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+        print(f"{label:<26} {stats['requests']:>6} {stats['throughput_rps']:>8.2f} "
+              f"{fmt(stats['p50_ms'])} {fmt(stats['p95_ms'])} {fmt(stats['p99_ms'])} "
+              f"{stats['rate_limited_pct']:>6.1f}")
+    lag = report["event_loop_lag_ms"]
+    note = "" if report["mode"] == "in-process" else " (client loop)"
+    print(f"\nEvent-loop lag{note}: p50={lag['p50']} ms  p99={lag['p99']} ms  max={lag['max']} ms")
+    coalescing = report["coalescing"]
+    if coalescing is None:
+        print(f"Coalescing: counters unavailable ({QUEUE_PATH})")
+    else:
+        print(f"Coalescing: {coalescing['executions']} executions, {coalescing['coalesced']} coalesced, "
+              f"{coalescing['key_conflicts']} key conflicts, {coalescing['cpu_seconds_saved']} CPU seconds saved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the optimization API")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent simulated teachers")
+    parser.add_argument("--requests", type=int, default=100, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead")
+    parser.add_argument("--students", default="30", help="Comma-separated roster sizes")
+    parser.add_argument("--generations", default="50", help="Comma-separated GA generation counts")
+    parser.add_argument("--health-ratio", type=float, default=0.2, help="Share of requests hitting /health")
+    parser.add_argument("--clients", type=int, default=1, help="Distinct client IPs (X-Forwarded-For)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for rosters and request mix")
+    parser.add_argument(
+        "--coalesce", action="store_true", help="Send identical bodies (no per-request seed) to exercise coalescing"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep per-request app and httpx logs")
+    args = parser.parse_args()
+    args.students = [int(n) for n in args.students.split(",")]
+    args.generations = [int(g) for g in args.generations.split(",")]
+
+    if not args.verbose:
+        # Per-request INFO logs would dominate both the output and the measured loop lag
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        logging.getLogger("app").setLevel(logging.WARNING)
+
+    report = asyncio.run(run_load(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Startup Timing Report
+Summarizes `python -X importtime` for the app and measures time to the
+first healthy response of a freshly started uvicorn server.
+
+Usage (from the backend directory):
+    python scripts/startup_report.py
+    python scripts/startup_report.py --top 30 --skip-server
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_summary(module: str = "app.main") -> List[Dict]:
+    """
+    Run `python -X importtime -c "import <module>"` and parse the report
+
+    Returns:
+        One entry per imported module with self/cumulative time in ms
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return entries
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_health(timeout: float = 30.0) -> Dict:
+    """
+    Start uvicorn and poll /health until it answers
+
+    Returns:
+        Wall-clock time to the first healthy response and the server's own
+        startup phase report from /health/startup
+    """
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"Server did not become healthy within {timeout}s")
+            try:
+                with urllib.request.urlopen(f"{base_url}/health", timeout=1):
+                    break
+            except OSError:
+                time.sleep(0.01)
+        first_health = time.perf_counter() - started
+
+        # Give the background optimizer preload a chance to finish
+        deadline = time.perf_counter() + timeout
+        while True:
+            with urllib.request.urlopen(f"{base_url}/health/startup", timeout=1) as response:
+                phases = json.load(response)
+            if phases.get("optimizer_loaded") or time.perf_counter() > deadline:
+                break
+            time.sleep(0.05)
+
+        return {"time_to_first_health": round(first_health, 4), "server": phases}
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start timing report")
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest imports to list")
+    parser.add_argument("--skip-server", action="store_true", help="Only report import times")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    entries = import_time_summary()
+    top_level = [e for e in entries if e["depth"] == 0]
+    report = {
+        "import_total_ms": round(sum(e["cumulative_ms"] for e in top_level), 1),
+        "slowest_imports": sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:args.top],
+        "optimizer_stack_imported_at_startup": any(
+            e["module"] in ("deap", "numpy", "app.services.genetic_algorithm") for e in entries
+        ),
+    }
+    if not args.skip_server:
+        report["startup"] = time_to_first_health()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Import of app.main: {report['import_total_ms']:.1f} ms")
+    print(f"Optimizer stack imported at startup: {report['optimizer_stack_imported_at_startup']}")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for e in report["slowest_imports"]:
+        print(f"{e['cumulative_ms']:>14.1f} {e['self_ms']:>9.1f}  {'  ' * e['depth']}{e['module']}")
+
+    if "startup" in report:
+        startup = report["startup"]
+        print(f"\nTime to first healthy response: {startup['time_to_first_health'] * 1000:.0f} ms")
+        for phase in startup["server"]["phases"]:
+            duration = f" ({phase['duration'] * 1000:.0f} ms)" if "duration" in phase else ""
+            print(f"  {phase['at'] * 1000:>8.0f} ms  {phase['phase']}{duration}")
+
+
+if __name__ == "__main__":
+    main()
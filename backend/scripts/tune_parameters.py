@@ -0,0 +1,288 @@
+"""
+GA Parameter Tuner
+Generates app/services/ga_tuning.json, the table behind `parameters: auto`
+
+For every roster-size bucket and constraint-density level, runs the
+optimizer on synthetic rosters over a grid of population sizes and
+operator rates, recording each run's best fitness per generation. Every
+generation count up to a run's cap is then priced from one run. The
+table keeps, per bucket, the cheapest (population, generations, rates)
+whose mean quality (share of the best fitness any run found for the
+roster) is within QUALITY_TOLERANCE of the settings defaults' on the same
+rosters, at no more than --max-cost-ratio times their CPU time. Buckets
+where the defaults exceed --max-cpu-seconds take the cheapest
+configuration reaching QUALITY_TARGET within that budget.
+
+Usage (from the backend directory):
+    python scripts/tune_parameters.py --jobs 8
+
+    # Auto vs. defaults on fresh rosters (median latency and quality)
+    python scripts/tune_parameters.py --compare
+
+    # Quick look without replacing the shipped table
+    python scripts/tune_parameters.py --seeds 1 --out /tmp/ga_tuning.json
+
+Tuning uses weighted mode, default objectives and the current .env
+settings (GA_DEDUPLICATE in particular).
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.services.ga_params import TUNING_TABLE_PATH, GAParameters, constraint_density  # noqa: E402
+from app.utils.synthetic import generate_roster, layout_for  # noqa: E402
+
+# (max students of the bucket, roster size tuned on)
+SIZE_BUCKETS = [(8, 6), (12, 10), (20, 16), (30, 26), (45, 38), (70, 60), (120, 100), (200, 160), (400, 300)]
+# Density level boundaries (see constraint_density) and the generator
+# options of each level's rosters
+DENSITY_LEVELS = [0.4]
+DENSITY_ROSTERS = [
+    {},
+    {"front_row_share": 0.15, "special_needs_share": 0.25, "incompatible_share": 0.3},
+]
+POPULATIONS = [16, 32, 64, 100, 200]
+# (crossover rate, mutation rate, per-gene swap probability); the first is the settings default
+RATES = [(0.8, 0.1, 0.2), (0.9, 0.2, 0.1), (0.7, 0.3, 0.2)]
+GENERATION_POINTS = [10, 15, 25, 40, 60, 100, 150, 250, 400]
+# Mean quality a configuration may lose against the settings defaults
+QUALITY_TOLERANCE = 0.002
+# Share of the best known fitness a configuration must reach on average
+# where the defaults don't fit the CPU budget
+QUALITY_TARGET = 0.99
+# Settings defaults: (population, generations, rates)
+BASELINE = (100, 100, RATES[0])
+
+
+def run_curve(task: Tuple) -> Dict:
+    """Run one configuration to the last generation point (or the CPU budget), recording the curve"""
+    from app.models.classroom import LayoutType, OptimizationObjectives
+    from app.services.cancellation import CancellationToken
+    from app.services.genetic_algorithm import ClassroomOptimizer
+
+    bucket, level, roster_seed, population, rates, seed, max_cpu_seconds = task
+    settings.MEMORY_PROFILER = "off"
+    size = dict(SIZE_BUCKETS)[bucket]
+    students = generate_roster(size, seed=roster_seed, **DENSITY_ROSTERS[level])
+    crossover_rate, mutation_rate, indpb = rates
+
+    optimizer = ClassroomOptimizer(
+        students=students,
+        layout_type=LayoutType.ROWS,
+        objectives=OptimizationObjectives(),
+        seed=seed,
+        params=GAParameters(population, GENERATION_POINTS[-1], crossover_rate, mutation_rate, indpb),
+        **layout_for(size)
+    )
+    token = CancellationToken()
+    cpu_start = time.process_time()
+    curve = []  # [cpu seconds, best fitness so far] per generation
+    best = 0.0
+
+    def on_generation(generation: int, population_):
+        nonlocal best
+        best = max(best, max(individual.fitness.values[0] for individual in population_))
+        cpu = time.process_time() - cpu_start
+        curve.append([round(cpu, 5), best])
+        if cpu > max_cpu_seconds:
+            token.cancel("cpu budget")
+
+    optimizer.optimize(workers=1, cancel_token=token, on_generation=on_generation)
+    return {
+        "bucket": bucket,
+        "level": level,
+        "roster": roster_seed,
+        "population": population,
+        "rates": list(rates),
+        "seed": seed,
+        "density": round(constraint_density(students), 3),
+        "curve": curve,
+    }
+
+
+def select(runs: List[Dict], max_cpu_seconds: float, max_cost_ratio: float) -> Dict:
+    """
+    Cheapest configuration matching the defaults' quality within the cost
+    cap (else the defaults) for one bucket and level; without a baseline,
+    the cheapest reaching QUALITY_TARGET (else the best)
+    """
+    best_known: Dict[int, float] = {}
+    for run in runs:
+        best_known[run["roster"]] = max(best_known.get(run["roster"], 0.0), run["curve"][-1][1])
+
+    candidates = []
+    for population in POPULATIONS:
+        for rates in RATES:
+            config_runs = [run for run in runs if run["population"] == population and run["rates"] == list(rates)]
+            for generations in GENERATION_POINTS:
+                if not config_runs or any(len(run["curve"]) < generations for run in config_runs):
+                    break
+                points = [run["curve"][generations - 1] for run in config_runs]
+                cpu = statistics.mean(point[0] for point in points)
+                if cpu > max_cpu_seconds:
+                    break
+                candidates.append({
+                    "population_size": population,
+                    "generations": generations,
+                    "crossover_rate": rates[0],
+                    "mutation_rate": rates[1],
+                    "mutation_indpb": rates[2],
+                    "quality": round(statistics.mean(
+                        point[1] / best_known[run["roster"]] for point, run in zip(points, config_runs)
+                    ), 5),
+                    "cpu_seconds": round(cpu, 4),
+                })
+
+    # The settings defaults on the same runs
+    population, generations, rates = BASELINE
+    baseline = next((
+        c for c in candidates
+        if (c["population_size"], c["generations"], c["crossover_rate"], c["mutation_rate"], c["mutation_indpb"])
+        == (population, generations, *rates)
+    ), None)
+    if baseline is None:
+        reaching = [c for c in candidates if c["quality"] >= QUALITY_TARGET]
+        if reaching:
+            return min(reaching, key=lambda c: c["cpu_seconds"])
+        return max(candidates, key=lambda c: c["quality"])
+
+    reaching = [
+        c for c in candidates
+        if c["quality"] >= baseline["quality"] - QUALITY_TOLERANCE
+        and c["cpu_seconds"] <= baseline["cpu_seconds"] * max_cost_ratio
+    ]
+    choice = min(reaching, key=lambda c: c["cpu_seconds"]) if reaching else baseline
+    return {**choice, "baseline_quality": baseline["quality"], "baseline_cpu_seconds": baseline["cpu_seconds"]}
+
+
+def compare(args):
+    """Median wall time and quality of auto vs. settings parameters on rosters not tuned on"""
+    from app.models.classroom import LayoutType, OptimizationObjectives
+    from app.services.ga_params import auto_parameters
+    from app.services.genetic_algorithm import ClassroomOptimizer
+
+    settings.MEMORY_PROFILER = "off"
+    load = {bucket: size for bucket, size in SIZE_BUCKETS}
+    buckets = [bucket for bucket in load if args.max_students is None or bucket <= args.max_students]
+    ratios = []
+    for bucket in buckets:
+        for level, options in enumerate(DENSITY_ROSTERS):
+            times = {"auto": [], "settings": []}
+            quality = []
+            for r in range(args.rosters):
+                students = generate_roster(load[bucket], seed=500000 + 1000 * bucket + 10 * level + r, **options)
+                fitness = {}
+                for name, params in (
+                    ("settings", GAParameters.from_settings()),
+                    ("auto", auto_parameters(len(students), constraint_density(students))),
+                ):
+                    for seed in range(args.seeds):
+                        optimizer = ClassroomOptimizer(
+                            students=students,
+                            layout_type=LayoutType.ROWS,
+                            objectives=OptimizationObjectives(),
+                            seed=seed,
+                            params=params,
+                            **layout_for(load[bucket])
+                        )
+                        started = time.perf_counter()
+                        result = optimizer.optimize(workers=1)
+                        times[name].append(time.perf_counter() - started)
+                        fitness.setdefault(name, []).append(result.fitness_score)
+                quality.append(statistics.mean(fitness["auto"]) / statistics.mean(fitness["settings"]))
+            auto, default = statistics.median(times["auto"]), statistics.median(times["settings"])
+            ratios.append(auto / default)
+            print(f"<= {bucket:>3} students, level {level}: median {auto:.3f}s auto vs {default:.3f}s settings "
+                  f"({auto / default - 1:+.0%}), fitness ratio {statistics.mean(quality):.4f}")
+    print(f"Median latency change over all buckets: {statistics.median(ratios) - 1:+.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the GA tuning table for parameters=auto")
+    parser.add_argument("--seeds", type=int, default=3, help="Optimizer seeds per roster and configuration")
+    parser.add_argument("--rosters", type=int, default=4, help="Synthetic rosters per bucket and density level")
+    parser.add_argument("--max-cpu-seconds", type=float, default=5.0, help="CPU budget of one optimization")
+    parser.add_argument(
+        "--max-cost-ratio", type=float, default=1.0, help="CPU cap of a configuration relative to the defaults"
+    )
+    parser.add_argument("--compare", action="store_true", help="Compare the shipped table against the defaults")
+    parser.add_argument("--max-students", type=int, help="Only tune buckets up to this size")
+    parser.add_argument("--jobs", type=int, default=1, help="Runs in parallel (processes)")
+    parser.add_argument("--out", default=TUNING_TABLE_PATH, help="Output table (default: the shipped one)")
+    args = parser.parse_args()
+
+    logging.getLogger("app").setLevel(logging.WARNING)
+    if args.compare:
+        compare(args)
+        return
+
+    buckets = [bucket for bucket, _ in SIZE_BUCKETS if args.max_students is None or bucket <= args.max_students]
+    tasks = [
+        (bucket, level, 1000 * bucket + 10 * level + r, population, rates, seed, args.max_cpu_seconds)
+        for bucket in buckets
+        for level in range(len(DENSITY_ROSTERS))
+        for r in range(args.rosters)
+        for population in POPULATIONS
+        for rates in RATES
+        for seed in range(args.seeds)
+    ]
+    print(f"{len(tasks)} runs over {len(buckets)} size buckets x {len(DENSITY_ROSTERS)} density levels",
+          file=sys.stderr)
+
+    started = time.perf_counter()
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            runs = list(pool.map(run_curve, tasks))
+    else:
+        runs = [run_curve(task) for task in tasks]
+
+    entries = []
+    for bucket in buckets:
+        for level in range(len(DENSITY_ROSTERS)):
+            group = [run for run in runs if run["bucket"] == bucket and run["level"] == level]
+            densities = {run["density"] for run in group}
+            entry = {
+                "max_students": bucket,
+                "density_level": level,
+                **select(group, args.max_cpu_seconds, args.max_cost_ratio)
+            }
+            entries.append(entry)
+            baseline = (
+                f"  (defaults: quality {entry['baseline_quality']:.4f}, {entry['baseline_cpu_seconds']:.3f}s)"
+                if "baseline_quality" in entry else ""
+            )
+            print(f"<= {bucket:>3} students, level {level} (density {min(densities):.2f}-{max(densities):.2f}): "
+                  f"pop {entry['population_size']:>3} x {entry['generations']:>3} gen, "
+                  f"cx {entry['crossover_rate']} mut {entry['mutation_rate']}/{entry['mutation_indpb']}, "
+                  f"quality {entry['quality']:.4f}, {entry['cpu_seconds']:.3f}s{baseline}")
+
+    table = {
+        "generated_by": "scripts/tune_parameters.py",
+        "generated_at": time.strftime("%Y-%m-%d"),
+        "quality_tolerance": QUALITY_TOLERANCE,
+        "quality_target": QUALITY_TARGET,
+        "max_cpu_seconds": args.max_cpu_seconds,
+        "max_cost_ratio": args.max_cost_ratio,
+        "seeds": args.seeds,
+        "rosters": args.rosters,
+        "density_levels": DENSITY_LEVELS,
+        "entries": entries,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {args.out} in {time.perf_counter() - started:.0f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()